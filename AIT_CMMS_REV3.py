@@ -6258,7 +6258,9 @@ class AITCMMSSystem(QMainWindow):
         # This must happen before login dialog because login needs database access
         print("Starting AIT CMMS Application...")
         try:
-            db_pool.initialize(self.DB_CONFIG, min_conn=2, max_conn=20)
+            # Sized for the GUI thread plus its background workers
+            db_pool.configure(min_conn=2, max_conn=8)
+            db_pool.initialize(self.DB_CONFIG)
             print("Database connection pool initialized successfully")
         except Exception as e:
             QMessageBox.critical(self, "Database Error",
@@ -8756,6 +8758,19 @@ class AITCMMSSystem(QMainWindow):
                 ''')
             except Exception as e:
                 print(f"Note: Unable to update cm_parts_requests FK to ON DELETE CASCADE: {e}")
+
+            # Backfill the denormalized equipment number on older part requests so
+            # per-equipment history can filter cm_parts_requests without joining its CM
+            try:
+                cursor.execute('''
+                    UPDATE cm_parts_requests cpr
+                    SET bfm_equipment_no = cm.bfm_equipment_no
+                    FROM corrective_maintenance cm
+                    WHERE cpr.cm_number = cm.cm_number
+                    AND cpr.bfm_equipment_no IS DISTINCT FROM cm.bfm_equipment_no
+                ''')
+            except Exception as e:
+                print(f"Note: Unable to backfill cm_parts_requests equipment numbers: {e}")
         
             # Work Orders table
             cursor.execute('''
@@ -9004,6 +9019,27 @@ class AITCMMSSystem(QMainWindow):
                 WHERE status != 'Closed'
             ''')
 
+            # Per-equipment date range scans (equipment history, health score, trends).
+            # Covering: INCLUDE the small columns those queries read so they can be
+            # index-only scans (long TEXT columns like notes are left out on purpose)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cm_equipment_reported_date
+                ON corrective_maintenance(bfm_equipment_no, reported_date DESC)
+                INCLUDE (cm_number, closed_date, priority, status, assigned_technician, labor_hours)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cm_parts_requests_cm_date
+                ON cm_parts_requests(cm_number, requested_date DESC)
+                INCLUDE (part_number, model_number, requested_by)
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cm_parts_requests_equipment_date
+                ON cm_parts_requests(bfm_equipment_no, requested_date DESC)
+                INCLUDE (cm_number, part_number, model_number, requested_by)
+            ''')
+
             # === PM Completions Indexes ===
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_pm_completions_equipment
@@ -9020,6 +9056,12 @@ class AITCMMSSystem(QMainWindow):
                 ON pm_completions(technician_name)
             ''')
 
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_pm_completions_equipment_date
+                ON pm_completions(bfm_equipment_no, completion_date DESC)
+                INCLUDE (pm_type, technician_name, labor_hours)
+            ''')
+
             # === Audit Log Indexes ===
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp
@@ -9031,6 +9073,13 @@ class AITCMMSSystem(QMainWindow):
                 ON audit_log(user_name, table_name, action_timestamp)
             ''')
 
+            # Per-record history (equipment status changes on the timeline)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_audit_log_record
+                ON audit_log(table_name, record_id, action_timestamp DESC)
+                INCLUDE (action, user_name)
+            ''')
+
             print("CHECK: Performance indexes created successfully!")
 
             # Create default parts coordinator user if it doesn't exist
@@ -13630,6 +13679,12 @@ class AITCMMSSystem(QMainWindow):
                     orig_cm_number
                 ))
 
+                # Keep the equipment number copied onto this CM's part requests in sync
+                cursor.execute('''
+                    UPDATE cm_parts_requests SET bfm_equipment_no = %s
+                    WHERE cm_number = %s
+                ''', (bfm_var.get(), orig_cm_number))
+
                 self.conn.commit()
                 QMessageBox.information(self, "Success", f"CM {orig_cm_number} updated successfully!")
                 dialog.close()
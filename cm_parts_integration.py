@@ -5,21 +5,117 @@ Handles parts consumption tracking for Corrective Maintenance work orders
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
-    QPushButton, QTreeWidget, QTreeWidgetItem, QFrame, QScrollArea,
-    QWidget, QMessageBox, QHeaderView
+    QPushButton, QTreeWidget, QTreeWidgetItem, QTreeView, QAbstractItemView,
+    QFrame, QScrollArea, QWidget, QMessageBox, QHeaderView
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtCore import Qt, pyqtSignal, QSortFilterProxyModel, QTimer
+from PyQt5.QtGui import QColor, QFont, QStandardItemModel, QStandardItem
+from psycopg2.extras import execute_values
 from datetime import datetime
+import time
+from database_utils import like_pattern
+
+
+# Shared fonts, created on first use (QFont needs the QApplication to exist)
+_ITALIC_FONT = None
+
+
+def _italic_font():
+    """Return the shared font for out-of-stock rows"""
+    global _ITALIC_FONT
+    if _ITALIC_FONT is None:
+        _ITALIC_FONT = QFont('Arial', 9)
+        _ITALIC_FONT.setItalic(True)
+    return _ITALIC_FONT
 
 
 class CMPartsIntegration:
     """Integration module for tracking parts consumption in CM work orders"""
 
+    # Rows fetched per page of the available-parts list
+    INVENTORY_PAGE_SIZE = 500
+
     def __init__(self, parent):
         """Initialize with reference to parent CMMS application"""
         self.parent = parent
         self.conn = parent.conn
+        # Short-lived cache of active MRO inventory shared by consumption dialogs
+        self._inventory_cache = None
+        self._inventory_cache_ts = 0
+        self.inventory_cache_ttl = 30  # seconds
+        # Connection the inventory page statements were PREPAREd on
+        self._prepared_conn = None
+
+    def _prepare_statements(self, cursor):
+        """PREPARE the inventory page queries once per connection so they are parsed/planned once"""
+        if self._prepared_conn is self.conn:
+            return
+
+        cursor.execute('''
+            SELECT name FROM pg_prepared_statements
+            WHERE name IN ('cm_inventory_page', 'cm_inventory_search')
+        ''')
+        existing = {row[0] for row in cursor.fetchall()}
+
+        if 'cm_inventory_page' not in existing:
+            cursor.execute('''
+                PREPARE cm_inventory_page (int, int) AS
+                SELECT part_number, name, location, quantity_in_stock, unit_price
+                FROM mro_inventory
+                WHERE status = 'Active'
+                ORDER BY part_number
+                LIMIT $1 OFFSET $2
+            ''')
+        if 'cm_inventory_search' not in existing:
+            cursor.execute('''
+                PREPARE cm_inventory_search (text, int, int) AS
+                SELECT part_number, name, location, quantity_in_stock, unit_price
+                FROM mro_inventory
+                WHERE status = 'Active' AND (part_number ILIKE $1 OR name ILIKE $1)
+                ORDER BY part_number
+                LIMIT $2 OFFSET $3
+            ''')
+        self._prepared_conn = self.conn
+
+    def get_active_inventory(self, search_term='', offset=0):
+        """
+        Return one page of active MRO parts as
+        (part_number, name, location, quantity_in_stock, unit_price) rows
+
+        Args:
+            search_term: Optional text matched against part number and name
+            offset: Number of rows to skip (for fetching subsequent pages)
+
+        The unfiltered first page is cached for inventory_cache_ttl seconds so that
+        opening several CM dialogs in succession doesn't re-query mro_inventory each time.
+        """
+        cacheable = not search_term and not offset
+        if (cacheable and self._inventory_cache is not None
+                and time.time() - self._inventory_cache_ts < self.inventory_cache_ttl):
+            return self._inventory_cache
+
+        cursor = self.conn.cursor()
+        self._prepare_statements(cursor)
+        if search_term:
+            cursor.execute('EXECUTE cm_inventory_search (%s, %s, %s)',
+                           (like_pattern(search_term), self.INVENTORY_PAGE_SIZE, offset))
+        else:
+            cursor.execute('EXECUTE cm_inventory_page (%s, %s)',
+                           (self.INVENTORY_PAGE_SIZE, offset))
+        rows = cursor.fetchall()
+
+        if cacheable:
+            self._inventory_cache = rows
+            self._inventory_cache_ts = time.time()
+        return rows
+
+    def invalidate_inventory(self):
+        """Clear the cached inventory after stock levels change"""
+        self._inventory_cache = None
+        self._inventory_cache_ts = 0
+        # The MRO tab caches its totals and low-stock count too
+        if hasattr(self.parent, 'mro_manager'):
+            self.parent.mro_manager.invalidate_statistics()
 
     def show_parts_consumption_dialog(self, cm_number, technician_name, callback=None):
         """
@@ -52,9 +148,73 @@ class CMPartsIntegration:
         return dialog
 
 
+class PartsStockModel(QStandardItemModel):
+    """Item model that styles each row from a per-row (color, font) lookup instead of per-item roles"""
+
+    def __init__(self, rows, columns, parent=None):
+        super().__init__(rows, columns, parent)
+        self.row_styles = []
+
+    def set_row_styles(self, row_styles):
+        """Set the (foreground color, description font or None) for each row"""
+        self.row_styles = row_styles
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Serve foreground and description font from row_styles"""
+        if role == Qt.ForegroundRole and index.row() < len(self.row_styles):
+            return self.row_styles[index.row()][0]
+        if role == Qt.FontRole and index.column() == 1 and index.row() < len(self.row_styles):
+            return self.row_styles[index.row()][1]
+        return super().data(index, role)
+
+
+class PartsFilterProxyModel(QSortFilterProxyModel):
+    """Proxy model that matches the search term against part number and description"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_term = ''
+        self.search_keys = []
+        self._accepted_rows = None  # None means every row is accepted
+
+    def set_search_keys(self, search_keys):
+        """Set the precomputed (part_number, description) lowercase keys, one per source row"""
+        self.search_keys = search_keys
+        self._match_rows()
+
+    def set_search_term(self, search_term):
+        """Set the search term and re-apply the filter"""
+        self.search_term = search_term.lower().strip()
+        self._match_rows()
+        self.invalidateFilter()
+
+    def _match_rows(self):
+        """Evaluate the search term against every row once, outside the per-row callback"""
+        term = self.search_term
+        if not term:
+            self._accepted_rows = None
+            return
+        # Prefix match on part number is the common case - accept it before scanning description
+        self._accepted_rows = [
+            pn.startswith(term) or term in pn or term in desc
+            for pn, desc in self.search_keys
+        ]
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Show row if search term is empty or matches part number / description"""
+        if self._accepted_rows is None:
+            return True
+        return self._accepted_rows[source_row]
+
+
 class PartsConsumptionDialog(QDialog):
     """Dialog for recording parts consumption during corrective maintenance"""
 
+    # Stock-level styles shared by every row
+    _C_GRAY = QColor('gray')
+    _C_ORANGE = QColor('orange')
+    _C_BLACK = QColor('black')
+
     def __init__(self, parent, integration, cm_number, technician_name, callback=None):
         super().__init__(parent)
         self.integration = integration
@@ -62,8 +222,16 @@ class PartsConsumptionDialog(QDialog):
         self.cm_number = cm_number
         self.technician_name = technician_name
         self.callback = callback
-        self.consumed_parts = []
+        self.consumed_parts = {}  # part_number -> {'description', 'quantity'}
+        self._consumed_items = {}  # part_number -> QTreeWidgetItem in consumed_tree
         self.all_parts_data = []
+        self.price_by_pn = {}
+        self.stock_by_pn = {}
+        self._display = []
+        self._search_keys = []
+        self._loaded_search_term = ''
+        self._has_more_parts = False
+        self._complete_snapshot = False
 
         self.setWindowTitle(f"Parts Consumption - CM {cm_number}")
         self.setGeometry(100, 100, 950, 750)
@@ -72,7 +240,6 @@ class PartsConsumptionDialog(QDialog):
 
         self.init_ui()
         self.load_parts_data()
-        self.filter_parts()
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -119,9 +286,15 @@ class PartsConsumptionDialog(QDialog):
         search_label.setFont(QFont('Arial', 10, QFont.Bold))
         search_layout.addWidget(search_label)
 
+        # Debounce search so filtering runs once the user pauses typing
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self.filter_parts)
+
         self.search_entry = QLineEdit()
         self.search_entry.setMinimumWidth(400)
-        self.search_entry.textChanged.connect(self.filter_parts)
+        self.search_entry.textChanged.connect(lambda _text: self._filter_timer.start())
         search_layout.addWidget(self.search_entry)
 
         hint_label = QLabel("(by part number or description)")
@@ -167,15 +340,27 @@ class PartsConsumptionDialog(QDialog):
         legend_layout.addStretch()
         list_layout.addWidget(legend_frame)
 
-        # Parts tree widget
-        self.parts_tree = QTreeWidget()
-        self.parts_tree.setHeaderLabels(['Part Number', 'Description', 'Location', 'Qty Available'])
+        # Parts tree view - model is built once, search filters through the proxy
+        self.parts_model = PartsStockModel(0, 4, self)
+        self.parts_model.setHorizontalHeaderLabels(['Part Number', 'Description', 'Location', 'Qty Available'])
+        self.parts_proxy = PartsFilterProxyModel(self)
+        self.parts_proxy.setSourceModel(self.parts_model)
+
+        self.parts_tree = QTreeView()
+        self.parts_tree.setModel(self.parts_proxy)
+        self.parts_tree.setRootIsDecorated(False)
+        self.parts_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.parts_tree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.parts_tree.setSelectionMode(QAbstractItemView.SingleSelection)
         self.parts_tree.setColumnWidth(0, 150)
         self.parts_tree.setColumnWidth(1, 350)
         self.parts_tree.setColumnWidth(2, 150)
         self.parts_tree.setColumnWidth(3, 120)
-        self.parts_tree.setAlternatingRowColors(True)
-        self.parts_tree.itemSelectionChanged.connect(self.on_part_select)
+        # Fixed row heights / section sizes let Qt skip per-row measurement on layout
+        self.parts_tree.setUniformRowHeights(True)
+        self.parts_tree.header().setSectionResizeMode(QHeaderView.Fixed)
+        self.parts_tree.selectionModel().selectionChanged.connect(self.on_part_select)
+        self.parts_tree.verticalScrollBar().valueChanged.connect(self._on_parts_scrolled)
         list_layout.addWidget(self.parts_tree)
 
         scroll_layout.addWidget(list_frame)
@@ -215,6 +400,16 @@ class PartsConsumptionDialog(QDialog):
         buttons_layout.addStretch()
         entry_layout.addLayout(buttons_layout, 3, 0, 1, 2)
 
+        # Transient confirmation shown instead of a modal popup on each add
+        self._status_label = QLabel()
+        self._status_label.setStyleSheet("color: green;")
+        entry_layout.addWidget(self._status_label, 4, 0, 1, 2)
+
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(2000)
+        self._status_timer.timeout.connect(self._status_label.clear)
+
         scroll_layout.addWidget(entry_frame)
 
         # Consumed parts list
@@ -258,67 +453,125 @@ class PartsConsumptionDialog(QDialog):
         scroll_area.setWidget(scroll_widget)
         main_layout.addWidget(scroll_area)
 
-    def load_parts_data(self):
-        """Load available parts from MRO inventory"""
+    def load_parts_data(self, search_term=''):
+        """Load the first page of available parts from MRO inventory"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT part_number, name, location, quantity_in_stock
-                FROM mro_inventory
-                WHERE status = 'Active'
-                ORDER BY part_number
-            ''')
-            self.all_parts_data = cursor.fetchall()
+            rows = self.integration.get_active_inventory(search_term)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load MRO inventory: {str(e)}")
+            return
 
-    def filter_parts(self):
-        """Filter parts list based on search term"""
-        search_term = self.search_entry.text().lower().strip()
+        self._loaded_search_term = search_term
+        self.all_parts_data = list(rows)
+        self._add_parts(rows, append=False)
 
-        # Clear current items
-        self.parts_tree.clear()
+        # When every active part fits in one page, search can filter in memory
+        self._complete_snapshot = not search_term and not self._has_more_parts
 
-        # Filter and display parts
-        for part in self.all_parts_data:
-            part_number = str(part[0]).lower()
-            description = str(part[1]).lower()
-            qty_available = float(part[3]) if part[3] else 0.0
+    def load_more_parts(self):
+        """Fetch the next page of parts for the current search"""
+        if not self._has_more_parts:
+            return
+        try:
+            rows = self.integration.get_active_inventory(
+                self._loaded_search_term, offset=len(self.all_parts_data))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load MRO inventory: {str(e)}")
+            return
 
-            # Show part if search term is empty or matches
-            if not search_term or search_term in part_number or search_term in description:
-                item = QTreeWidgetItem(self.parts_tree)
-                item.setText(0, str(part[0]))
-                item.setText(1, str(part[1]))
-                item.setText(2, str(part[2]))
-                item.setText(3, str(part[3]))
-
-                # Set color based on stock level
-                if qty_available <= 0:
-                    for i in range(4):
-                        item.setForeground(i, QColor('gray'))
-                    item.setFont(1, QFont('Arial', 9, QFont.StyleItalic))
-                elif qty_available <= 5:
-                    for i in range(4):
-                        item.setForeground(i, QColor('orange'))
-                else:
-                    for i in range(4):
-                        item.setForeground(i, QColor('black'))
+        self.all_parts_data.extend(rows)
+        self._add_parts(rows, append=True)
+
+    def _add_parts(self, rows, append):
+        """Index a page of inventory rows and show it in the parts tree"""
+        self._has_more_parts = len(rows) >= self.integration.INVENTORY_PAGE_SIZE
+
+        # Cache unit prices so saving doesn't need to re-query them
+        self.price_by_pn.update((row[0], float(row[4]) if row[4] else 0.0) for row in rows)
+        self.stock_by_pn.update((row[0], float(row[3]) if row[3] else 0.0) for row in rows)
+
+        # Precompute display strings and lowercase search keys once, not per keystroke
+        display = [
+            (str(r[0]), str(r[1]), str(r[2]), str(r[3]), float(r[3]) if r[3] else 0.0)
+            for r in rows
+        ]
+        search_keys = [(d[0].lower(), d[1].lower()) for d in display]
+        if append:
+            self._display.extend(display)
+            self._search_keys.extend(search_keys)
+        else:
+            self._display = display
+            self._search_keys = search_keys
+        self.parts_proxy.set_search_keys(self._search_keys)
+
+        self._populate_tree(display, append=append)
+
+    def _on_parts_scrolled(self, value):
+        """Lazily fetch the next page once the user scrolls to the bottom"""
+        if self._has_more_parts and value == self.parts_tree.verticalScrollBar().maximum():
+            self.load_more_parts()
+
+    def _populate_tree(self, parts, append=False):
+        """Fill (or extend) the parts model from display tuples; filtering happens in the proxy"""
+        rows = []
+        row_styles = []
+        for part in parts:
+            qty_available = part[4]
+            rows.append([QStandardItem(text) for text in part[:4]])
+
+            # Set color based on stock level
+            if qty_available <= 0:
+                row_styles.append((self._C_GRAY, _italic_font()))
+            elif qty_available <= 5:
+                row_styles.append((self._C_ORANGE, None))
+            else:
+                row_styles.append((self._C_BLACK, None))
+
+        # Insert all rows with repaint and sorting suspended
+        sorting_enabled = self.parts_tree.isSortingEnabled()
+        self.parts_tree.setUpdatesEnabled(False)
+        self.parts_tree.setSortingEnabled(False)
+        try:
+            if append:
+                self.parts_model.set_row_styles(self.parts_model.row_styles + row_styles)
+            else:
+                self.parts_model.setRowCount(0)
+                self.parts_model.set_row_styles(row_styles)
+            for items in rows:
+                self.parts_model.appendRow(items)
+        finally:
+            self.parts_tree.setSortingEnabled(sorting_enabled)
+            self.parts_tree.setUpdatesEnabled(True)
+
+    def filter_parts(self):
+        """Filter parts list based on search term"""
+        if self._complete_snapshot:
+            self.parts_proxy.set_search_term(self.search_entry.text())
+        else:
+            # Only a page of the inventory is loaded - let the database do the matching
+            self.load_parts_data(self.search_entry.text().strip())
+
+    def get_selected_part(self):
+        """Return [part_number, description, location, qty] for the selected part, or None"""
+        indexes = self.parts_tree.selectionModel().selectedRows()
+        if not indexes:
+            return None
+        source_row = self.parts_proxy.mapToSource(indexes[0]).row()
+        return [self.parts_model.item(source_row, col).text() for col in range(4)]
 
     def on_part_select(self):
         """Update selected part label when user selects from available parts"""
-        selected_items = self.parts_tree.selectedItems()
-        if selected_items:
-            item = selected_items[0]
-            part_num = item.text(0)
-            desc = item.text(1)
+        selected_part = self.get_selected_part()
+        if selected_part:
+            part_num = selected_part[0]
+            desc = selected_part[1]
             self.selected_part_label.setText(f"{part_num} - {desc}")
             self.selected_part_label.setStyleSheet("color: black;")
 
     def add_consumed_part(self):
         """Add selected part to consumed list"""
-        selected_items = self.parts_tree.selectedItems()
-        if not selected_items:
+        selected_part = self.get_selected_part()
+        if not selected_part:
             QMessageBox.warning(self, "Warning", "Please select a part from the available parts list")
             return
 
@@ -331,10 +584,9 @@ class PartsConsumptionDialog(QDialog):
             QMessageBox.critical(self, "Error", "Invalid quantity value")
             return
 
-        item = selected_items[0]
-        part_num = item.text(0)
-        desc = item.text(1)
-        qty_available = float(item.text(3))
+        part_num = selected_part[0]
+        desc = selected_part[1]
+        qty_available = float(selected_part[3])
 
         if qty_available <= 0:
             QMessageBox.critical(self, "Part Out of Stock",
@@ -351,26 +603,26 @@ class PartsConsumptionDialog(QDialog):
             return
 
         # Check if part already added
-        for existing in self.consumed_parts:
-            if existing['part_number'] == part_num:
-                QMessageBox.warning(self, "Warning",
-                                  "This part is already in the consumed list. Remove it first if you need to change the quantity.")
-                return
+        if part_num in self.consumed_parts:
+            QMessageBox.warning(self, "Warning",
+                              "This part is already in the consumed list. Remove it first if you need to change the quantity.")
+            return
 
         # Add to consumed list
-        self.consumed_parts.append({
-            'part_number': part_num,
+        self.consumed_parts[part_num] = {
             'description': desc,
             'quantity': qty_used
-        })
+        }
 
         consumed_item = QTreeWidgetItem(self.consumed_tree)
         consumed_item.setText(0, part_num)
         consumed_item.setText(1, desc)
         consumed_item.setText(2, str(qty_used))
+        self._consumed_items[part_num] = consumed_item
 
         self.qty_entry.setText("1")  # Reset quantity
-        QMessageBox.information(self, "Success", f"Added {part_num} to consumed parts list")
+        self._status_label.setText(f"Added {part_num} to consumed parts list")
+        self._status_timer.start()
 
     def remove_consumed_part(self):
         """Remove selected part from consumed list"""
@@ -382,12 +634,10 @@ class PartsConsumptionDialog(QDialog):
         item = selected_items[0]
         part_num = item.text(0)
 
-        # Remove from list
-        self.consumed_parts = [p for p in self.consumed_parts if p['part_number'] != part_num]
-
-        # Remove from tree
-        index = self.consumed_tree.indexOfTopLevelItem(item)
-        self.consumed_tree.takeTopLevelItem(index)
+        # Remove from list and tree using the shared part_number key
+        self.consumed_parts.pop(part_num, None)
+        item = self._consumed_items.pop(part_num, item)
+        self.consumed_tree.takeTopLevelItem(self.consumed_tree.indexOfTopLevelItem(item))
 
     def save_and_close(self):
         """Save consumed parts to database and close dialog"""
@@ -402,57 +652,93 @@ class PartsConsumptionDialog(QDialog):
                 self.callback(True)
             return
 
+        # The loaded stock snapshot may be up to inventory_cache_ttl seconds old, so it
+        # only warns; the guarded UPDATE below decides against the live quantities
+        short_parts = [
+            part_number for part_number, part in self.consumed_parts.items()
+            if part['quantity'] > self.stock_by_pn.get(part_number, 0.0)
+        ]
+        if short_parts:
+            response = QMessageBox.question(self, "Insufficient Stock",
+                                          f"The loaded stock levels show too little stock for: {', '.join(short_parts)}\n\n"
+                                          f"Stock may have been received since. Try to record the parts anyway?",
+                                          QMessageBox.Yes | QMessageBox.No)
+            if response == QMessageBox.No:
+                return
+
         try:
+            # Build rows for each consumed part, sharing one timestamp, before
+            # touching the database so the write transaction stays short
+            now = datetime.now()
+            tx_notes = f"CM Work Order: {self.cm_number}"
+            cm_notes = f"Parts consumed during CM {self.cm_number}"
+            tx_rows = []
+            cm_rows = []
+            upd_rows = []
+            for part_number, part in self.consumed_parts.items():
+                total_cost = self.price_by_pn.get(part_number, 0.0) * part['quantity']
+
+                # Transaction record (negative quantity for consumption)
+                tx_rows.append((part_number, 'Issue', -part['quantity'],
+                                self.technician_name, tx_notes, now))
+                # cm_parts_used row for tracking and reporting
+                cm_rows.append((self.cm_number, part_number, part['quantity'],
+                                total_cost, now, self.technician_name, cm_notes))
+                # Inventory quantity update
+                upd_rows.append((part_number, part['quantity'], now))
+
+            upd_rows.sort(key=lambda row: row[0])
+
+            # psycopg2 opens the transaction implicitly; it spans only these
+            # statements and ends at commit/rollback below
             cursor = self.conn.cursor()
 
-            # Record each consumed part
-            for part in self.consumed_parts:
-                # Get unit price for cost calculation
-                cursor.execute('''
-                    SELECT unit_price FROM mro_inventory WHERE part_number = %s
-                ''', (part['part_number'],))
-                result = cursor.fetchone()
-                unit_price = float(result[0]) if result and result[0] else 0.0
-                total_cost = unit_price * part['quantity']
-
-                # Create transaction record
-                cursor.execute('''
-                    INSERT INTO mro_stock_transactions
-                    (part_number, transaction_type, quantity, technician_name, notes, transaction_date)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                ''', (
-                    part['part_number'],
-                    'Issue',
-                    -part['quantity'],  # Negative for consumption
-                    self.technician_name,
-                    f"CM Work Order: {self.cm_number}",
-                    datetime.now()
-                ))
-
-                # Record in cm_parts_used table for tracking and reporting
-                cursor.execute('''
-                    INSERT INTO cm_parts_used
-                    (cm_number, part_number, quantity_used, total_cost, recorded_date, recorded_by, notes)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ''', (
-                    self.cm_number,
-                    part['part_number'],
-                    part['quantity'],
-                    total_cost,
-                    datetime.now(),
-                    self.technician_name,
-                    f"Parts consumed during CM {self.cm_number}"
-                ))
-
-                # Update inventory quantity
-                cursor.execute('''
-                    UPDATE mro_inventory
-                    SET quantity_in_stock = quantity_in_stock - %s,
-                        last_updated = %s
-                    WHERE part_number = %s
-                ''', (part['quantity'], datetime.now(), part['part_number']))
+            # Lock the inventory rows in part-number order first, so concurrent saves
+            # touching overlapping parts queue up instead of deadlocking in the UPDATE
+            cursor.execute('''
+                SELECT part_number FROM mro_inventory
+                WHERE part_number = ANY(%s)
+                ORDER BY part_number
+                FOR UPDATE
+            ''', ([row[0] for row in upd_rows],))
+
+            # Apply all decrements in one set-based UPDATE joined against the VALUES list.
+            # The quantity guard makes this optimistic: if another user consumed stock
+            # since the snapshot was loaded, fewer rows are updated and we back out.
+            updated = execute_values(cursor, '''
+                UPDATE mro_inventory
+                SET quantity_in_stock = mro_inventory.quantity_in_stock - v.qty,
+                    last_updated = v.updated
+                FROM (VALUES %s) AS v(part_number, qty, updated)
+                WHERE mro_inventory.part_number = v.part_number
+                  AND mro_inventory.quantity_in_stock >= v.qty
+                RETURNING mro_inventory.part_number
+            ''', upd_rows, fetch=True)
+
+            if len(updated) < len(upd_rows):
+                self.conn.rollback()
+                self.integration.invalidate_inventory()
+                updated_parts = {row[0] for row in updated}
+                conflicts = [row[0] for row in upd_rows if row[0] not in updated_parts]
+                QMessageBox.warning(self, "Insufficient Stock",
+                                  f"Not enough stock in inventory for: {', '.join(conflicts)}\n\n"
+                                  f"Nothing was recorded. Please remove these parts or adjust the quantity.")
+                return
+
+            execute_values(cursor, '''
+                INSERT INTO mro_stock_transactions
+                (part_number, transaction_type, quantity, technician_name, notes, transaction_date)
+                VALUES %s
+            ''', tx_rows)
+
+            execute_values(cursor, '''
+                INSERT INTO cm_parts_used
+                (cm_number, part_number, quantity_used, total_cost, recorded_date, recorded_by, notes)
+                VALUES %s
+            ''', cm_rows)
 
             self.conn.commit()
+            self.integration.invalidate_inventory()
 
             QMessageBox.information(self, "Success",
                                f"Successfully recorded {len(self.consumed_parts)} part(s) consumed for CM {self.cm_number}")
@@ -555,7 +841,8 @@ class CMPartsDetailsDialog(QDialog):
         self.parts_tree.setColumnWidth(3, 100)
         self.parts_tree.setColumnWidth(4, 150)
         self.parts_tree.setColumnWidth(5, 100)
-        self.parts_tree.setAlternatingRowColors(True)
+        self.parts_tree.setUniformRowHeights(True)
+        self.parts_tree.header().setSectionResizeMode(QHeaderView.Fixed)
         list_layout.addWidget(self.parts_tree)
 
         main_layout.addWidget(list_frame)
@@ -588,12 +875,12 @@ class CMPartsDetailsDialog(QDialog):
                     cp.quantity_used,
                     cp.total_cost,
                     cp.recorded_date,
-                    cp.recorded_by,
-                    cp.notes
+                    cp.recorded_by
                 FROM cm_parts_used cp
                 LEFT JOIN mro_inventory mi ON cp.part_number = mi.part_number
                 WHERE cp.cm_number = %s
                 ORDER BY cp.recorded_date DESC
+                LIMIT 500
             ''', (self.cm_number,))
 
             parts_data = cursor.fetchall()
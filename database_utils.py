@@ -12,6 +12,13 @@ import hashlib
 import time
 
 
+def like_pattern(text):
+    """Return an ILIKE pattern matching text as a literal substring"""
+    # Backslash is the default LIKE escape character
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
 class DatabaseConnectionPool:
     """Manages PostgreSQL connection pool for concurrent users"""
 
@@ -34,17 +41,43 @@ class DatabaseConnectionPool:
             self.keepalive_thread = None
             self.keepalive_stop = threading.Event()
             self.keepalive_interval = 120  # 2 minutes (more aggressive to prevent NEON timeouts)
+            # Pool size: the GUI thread plus a few background workers. Each
+            # connection costs memory on the server, so keep it small
+            self.min_conn = 2
+            self.max_conn = 8
+            # Seconds get_connection waits for a connection while all are in use
+            self.wait_timeout = 10
+            # Signalled whenever a connection goes back to the pool
+            self._conn_available = threading.Condition()
+
+    def configure(self, min_conn, max_conn, wait_timeout=None):
+        """
+        Set the pool size used by initialize()
 
-    def initialize(self, db_config, min_conn=2, max_conn=10):
+        Args:
+            min_conn: Minimum number of connections to maintain
+            max_conn: Maximum number of connections allowed
+            wait_timeout: Seconds to wait for a free connection when all are in use
+        """
+        if self.pool is not None:
+            print("Note: connection pool already initialized; new size applies after close_all()")
+        self.min_conn = min_conn
+        self.max_conn = max_conn
+        if wait_timeout is not None:
+            self.wait_timeout = wait_timeout
+
+    def initialize(self, db_config, min_conn=None, max_conn=None):
         """
         Initialize the connection pool with keepalive settings
 
         Args:
             db_config: Dictionary with connection parameters
-            min_conn: Minimum number of connections to maintain
-            max_conn: Maximum number of connections allowed
+            min_conn: Minimum number of connections to maintain (default: configure())
+            max_conn: Maximum number of connections allowed (default: configure())
         """
         if self.pool is None:
+            min_conn = self.min_conn if min_conn is None else min_conn
+            max_conn = self.max_conn if max_conn is None else max_conn
             self.config = db_config
             self.pool = psycopg2.pool.ThreadedConnectionPool(
                 min_conn,
@@ -68,15 +101,25 @@ class DatabaseConnectionPool:
             # Start keepalive thread to prevent NEON free tier from suspending
             self._start_keepalive_thread()
 
-    def get_connection(self, max_retries=3):
-        """Get a connection from the pool with validation and retry logic"""
+    def get_connection(self, max_retries=3, timeout=None):
+        """
+        Get a connection from the pool with validation and retry logic
+
+        Args:
+            max_retries: Attempts to get a working connection
+            timeout: Seconds to wait while every connection is in use
+                (default: wait_timeout); 0 fails at once
+
+        Returns:
+            A validated connection, to be given back with return_connection()
+        """
         if self.pool is None:
             raise Exception("Connection pool not initialized. Call initialize() first.")
 
         last_error = None
         for attempt in range(max_retries):
             try:
-                conn = self.pool.getconn()
+                conn = self._wait_for_connection(self.wait_timeout if timeout is None else timeout)
 
                 # Validate connection is still alive before returning it
                 try:
@@ -92,7 +135,8 @@ class DatabaseConnectionPool:
                     # Connection is dead, close it and get a new one
                     print(f"Connection validation failed (attempt {attempt + 1}/{max_retries}): {e}")
                     try:
-                        conn.close()
+                        # Closed through the pool so its slot is freed
+                        self.return_connection(conn, close=True)
                     except:
                         pass
                     last_error = e
@@ -102,6 +146,10 @@ class DatabaseConnectionPool:
                         wait_time = 0.5 * (2 ** attempt)  # 0.5s, 1s, 2s
                         time.sleep(wait_time)
 
+            except pool.PoolError as e:
+                # Every connection stayed in use for the whole timeout - retrying
+                # would only make the caller wait longer
+                raise Exception(f"No database connection available ({e}). Please retry the operation.")
             except Exception as e:
                 print(f"Error getting connection (attempt {attempt + 1}/{max_retries}): {e}")
                 last_error = e
@@ -111,10 +159,25 @@ class DatabaseConnectionPool:
 
         raise Exception(f"Failed to get valid database connection after {max_retries} attempts: {last_error}")
 
-    def return_connection(self, conn):
-        """Return a connection to the pool"""
+    def _wait_for_connection(self, timeout):
+        """Take a connection from the pool, waiting up to timeout seconds while all are in use"""
+        deadline = time.monotonic() + timeout
+        with self._conn_available:
+            while True:
+                try:
+                    return self.pool.getconn()
+                except pool.PoolError:
+                    remaining = deadline - time.monotonic()
+                    if self.pool.closed or remaining <= 0:
+                        raise
+                    self._conn_available.wait(remaining)
+
+    def return_connection(self, conn, close=False):
+        """Return a connection to the pool (close=True discards it and frees its slot)"""
         if self.pool:
-            self.pool.putconn(conn)
+            self.pool.putconn(conn, close=close)
+            with self._conn_available:
+                self._conn_available.notify()
 
     def _keepalive_worker(self):
         """Background thread that keeps connections alive for NEON free tier"""
@@ -173,12 +236,18 @@ class DatabaseConnectionPool:
             print("Connection pool closed")
 
     @contextmanager
-    def get_cursor(self, commit=True):
+    def get_cursor(self, commit=True, name=None, itersize=500, cursor_factory=extras.RealDictCursor,
+                   timeout=None):
         """
         Context manager for database operations with automatic retry on connection failure
 
         Args:
             commit: Whether to commit automatically on success
+            name: Optional server-side cursor name; iterating the cursor then
+                streams rows in batches instead of buffering the whole result
+            itersize: Rows fetched per round trip by a named cursor
+            cursor_factory: Row type of the cursor; None for plain tuple rows
+            timeout: Seconds to wait for a free connection (default: wait_timeout)
 
         Yields:
             cursor: Database cursor
@@ -188,10 +257,14 @@ class DatabaseConnectionPool:
                 cursor.execute("SELECT * FROM equipment")
                 data = cursor.fetchall()
         """
-        conn = self.get_connection()  # This now validates the connection
+        conn = self.get_connection(timeout=timeout)  # This now validates the connection
         cursor = None
         try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            if name:
+                cursor = conn.cursor(name=name, cursor_factory=cursor_factory)
+                cursor.itersize = itersize
+            else:
+                cursor = conn.cursor(cursor_factory=cursor_factory)
             yield cursor
             if commit:
                 conn.commit()
@@ -207,9 +280,10 @@ class DatabaseConnectionPool:
                 conn.rollback()
             except:
                 pass
-            # Don't return bad connection to pool, close it
+            # Don't reuse the bad connection - close it through the pool so its
+            # slot is freed
             try:
-                conn.close()
+                self.return_connection(conn, close=True)
             except:
                 pass
             raise Exception(f"Database connection lost: {str(e)}. Please retry the operation.")
@@ -316,6 +390,37 @@ class AuditLogger:
             (user_name, action, table_name, record_id, str(old_values), str(new_values), notes)
         )
 
+    @staticmethod
+    def log_many(cursor, entries, page_size=500):
+        """
+        Log many database actions with multi-row INSERTs
+
+        Args:
+            cursor: Database cursor
+            entries: Iterable of (user_name, action, table_name, record_id[, old_values,
+                new_values, notes]) tuples, in the argument order of log()
+            page_size: Entries sent per INSERT statement
+        """
+        rows = []
+        for entry in entries:
+            user_name, action, table_name, record_id, *rest = entry
+            old_values, new_values, notes = (list(rest) + [None, None, None])[:3]
+            rows.append((user_name, action, table_name, record_id,
+                         str(old_values), str(new_values), notes))
+        if not rows:
+            return
+        extras.execute_values(
+            cursor,
+            """
+            INSERT INTO audit_log
+            (user_name, action, table_name, record_id, old_values, new_values, notes, action_timestamp)
+            VALUES %s
+            """,
+            rows,
+            template="(%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)",
+            page_size=page_size
+        )
+
 
 class UserManager:
     """Manages user authentication and sessions"""
@@ -495,11 +600,12 @@ class UserManager:
 
     @staticmethod
     def get_active_sessions(cursor):
-        """Get all active sessions"""
+        """Get all active sessions (id and times as display text)"""
         cursor.execute(
             """
-            SELECT s.id, s.user_id, s.username, u.full_name, u.role,
-                   s.login_time, s.last_activity
+            SELECT s.id::text AS id, s.user_id, s.username, u.full_name, u.role,
+                   TO_CHAR(s.login_time, 'YYYY-MM-DD HH24:MI:SS') AS login_time,
+                   TO_CHAR(s.last_activity, 'YYYY-MM-DD HH24:MI:SS') AS last_activity
             FROM user_sessions s
             JOIN users u ON s.user_id = u.id
             WHERE s.is_active = TRUE
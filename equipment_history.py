@@ -10,27 +10,217 @@ Provides comprehensive equipment history tracking and timeline visualization inc
 
 from PyQt5.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QTabWidget, QTreeWidget, QTreeWidgetItem, QTextEdit,
+    QComboBox, QTabWidget, QTreeView, QTextEdit,
     QMessageBox, QGroupBox, QHeaderView
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QBrush
+from datetime import datetime, date, timedelta
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple
 from collections import defaultdict
+from contextlib import contextmanager
+from psycopg2.extras import RealDictCursor
+import weakref
+from database_utils import db_pool
+
+
+class TimelineEvent(NamedTuple):
+    """One timeline row, in the column order of the timeline query"""
+    date: Any
+    type: str
+    category: str
+    title: str
+    details: str
+    notes: Optional[str]
 
 
 class EquipmentHistory:
     """Manages equipment history data and analysis"""
 
-    def __init__(self, conn):
+    # Timeline events fetched per page by the history viewer
+    TIMELINE_PAGE_SIZE = 200
+
+    # Timeline color for each event type (applied when rendering, not stored per event)
+    EVENT_COLORS = {
+        'PM': '#4CAF50',        # Green
+        'CM_OPEN': '#FF9800',   # Orange
+        'CM_CLOSE': '#4CAF50',  # Green
+        'PART': '#2196F3',      # Blue
+        'STATUS': '#9C27B0'     # Purple
+    }
+
+    # Hot read queries, PREPAREd once per connection (see _prepare_statements)
+    PREPARED_STATEMENTS = {
+        'eh_timeline': '''
+            PREPARE eh_timeline (text, text, bigint, bigint) AS
+            SELECT completion_date AS event_date, 'PM' AS type,
+                   'Preventive Maintenance' AS category,
+                   concat(pm_type, ' PM') AS title,
+                   concat('Technician: ', technician_name, ', Hours: ', labor_hours) AS details,
+                   notes
+            FROM pm_completions
+            WHERE bfm_equipment_no = $1 AND completion_date >= $2
+
+            UNION ALL
+
+            SELECT reported_date, 'CM_OPEN', 'Corrective Maintenance',
+                   concat('CM ', cm_number, ' Opened'),
+                   concat('Priority: ', priority, ', Assigned: ', assigned_technician),
+                   description
+            FROM corrective_maintenance
+            WHERE bfm_equipment_no = $1 AND reported_date >= $2
+
+            UNION ALL
+
+            SELECT closed_date, 'CM_CLOSE', 'Corrective Maintenance',
+                   concat('CM ', cm_number, ' Closed'),
+                   concat('Hours: ', labor_hours),
+                   notes
+            FROM corrective_maintenance
+            WHERE bfm_equipment_no = $1 AND reported_date >= $2
+            AND closed_date IS NOT NULL AND closed_date != ''
+
+            UNION ALL
+
+            SELECT requested_date, 'PART', 'Parts Request',
+                   concat('Part: ', part_number),
+                   concat('Model: ', model_number, ', Requested by: ', requested_by),
+                   concat('CM: ', cm_number, ', Notes: ', notes)
+            FROM cm_parts_requests
+            WHERE bfm_equipment_no = $1 AND requested_date >= $2
+
+            UNION ALL
+
+            SELECT to_char(action_timestamp, 'YYYY-MM-DD HH24:MI:SS'), 'STATUS', 'Status Change',
+                   'Status Changed',
+                   concat('By: ', user_name),
+                   concat('From: ', old_values, ' To: ', new_values)
+            FROM audit_log
+            WHERE table_name = 'equipment' AND record_id = $1
+            AND action_timestamp >= $2::timestamp
+
+            ORDER BY event_date DESC NULLS LAST, type, title
+            LIMIT $3 OFFSET $4
+        ''',
+        'eh_overview': '''
+            PREPARE eh_overview (text, text, text) AS
+            WITH pm AS (
+                SELECT COUNT(*) FILTER (WHERE completion_date >= $2) AS year_total,
+                       COALESCE(SUM(labor_hours) FILTER (WHERE completion_date >= $2), 0)::float AS year_hours,
+                       COUNT(*) FILTER (WHERE completion_date >= $3) AS total,
+                       COUNT(*) FILTER (WHERE completion_date >= $3 AND pm_type = 'Monthly') AS monthly,
+                       COUNT(*) FILTER (WHERE completion_date >= $3 AND pm_type = 'Annual') AS annual,
+                       COALESCE(SUM(labor_hours) FILTER (WHERE completion_date >= $3), 0)::float AS hours
+                FROM pm_completions
+                WHERE bfm_equipment_no = $1 AND completion_date >= LEAST($2, $3)
+            ), cm AS (
+                SELECT COUNT(*) FILTER (WHERE reported_date >= $2) AS year_total,
+                       COALESCE(SUM(labor_hours) FILTER (WHERE reported_date >= $2), 0)::float AS year_hours,
+                       COUNT(*) FILTER (WHERE reported_date >= $3) AS total,
+                       COUNT(*) FILTER (WHERE reported_date >= $3
+                                        AND status IS DISTINCT FROM 'Closed') AS open,
+                       COUNT(*) FILTER (WHERE reported_date >= $3 AND status = 'Closed') AS closed,
+                       COALESCE(SUM(labor_hours) FILTER (WHERE reported_date >= $3), 0)::float AS hours
+                FROM corrective_maintenance
+                WHERE bfm_equipment_no = $1 AND reported_date >= LEAST($2, $3)
+            ), parts AS (
+                SELECT COUNT(*) FILTER (WHERE requested_date >= $2) AS year_total,
+                       COUNT(*) FILTER (WHERE requested_date >= $3) AS total
+                FROM cm_parts_requests
+                WHERE bfm_equipment_no = $1 AND requested_date >= LEAST($2, $3)
+            )
+            SELECT e.bfm_equipment_no IS NOT NULL, e.status, e.monthly_pm, e.annual_pm,
+                   pm.year_total, pm.year_hours, cm.year_total, cm.year_hours, parts.year_total,
+                   pm.total, pm.monthly, pm.annual, pm.hours,
+                   cm.total, cm.open, cm.closed, cm.hours,
+                   parts.total
+            FROM pm CROSS JOIN cm CROSS JOIN parts
+            LEFT JOIN equipment e ON e.bfm_equipment_no = $1
+        ''',
+        'eh_trends': '''
+            PREPARE eh_trends (text, text, text) AS
+            SELECT 'PM' AS kind, LEFT(completion_date, 7) AS month,
+                   COUNT(*), COALESCE(SUM(labor_hours), 0)::float
+            FROM pm_completions
+            WHERE bfm_equipment_no = $1
+            AND completion_date >= $2
+            AND completion_date < $3
+            GROUP BY 2
+
+            UNION ALL
+
+            SELECT 'CM', LEFT(reported_date, 7),
+                   COUNT(*), COALESCE(SUM(labor_hours), 0)::float
+            FROM corrective_maintenance
+            WHERE bfm_equipment_no = $1
+            AND reported_date >= $2
+            AND reported_date < $3
+            GROUP BY 2
+        '''
+    }
+
+    def __init__(self, conn, connection_pool=None):
         """
         Initialize equipment history manager
 
         Args:
-            conn: Database connection
+            conn: Database connection, used only when there is no connection pool
+            connection_pool: Optional DatabaseConnectionPool the history reads run on,
+                leaving the transaction of conn alone
         """
         self.conn = conn
+        self.connection_pool = connection_pool
+        # Results cached per (query, equipment, date range/day) until clear_cache()
+        self._cache = {}
+        # Connections the PREPARED_STATEMENTS have been PREPAREd on
+        self._prepared_conns = weakref.WeakSet()
+
+    @contextmanager
+    def _read_cursor(self):
+        """Cursor for one read, on a pooled connection when there is a pool"""
+        if self.connection_pool is not None and self.connection_pool.pool is not None:
+            # The pool ends the read transaction when the connection is returned
+            with self.connection_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+                yield cursor
+            return
+
+        cursor = self.conn.cursor()
+        try:
+            yield cursor
+            self.conn.commit()
+        except Exception as e:
+            # Rollback on error
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            raise e
+
+    def _prepare_statements(self, cursor):
+        """PREPARE the hot read queries once per connection so they are parsed/planned once"""
+        conn = cursor.connection
+        if conn in self._prepared_conns:
+            return
+
+        cursor.execute('''
+            SELECT name FROM pg_prepared_statements
+            WHERE name = ANY(%s)
+        ''', (list(self.PREPARED_STATEMENTS),))
+        existing = {row[0] for row in cursor.fetchall()}
+        for name, statement in self.PREPARED_STATEMENTS.items():
+            if name not in existing:
+                cursor.execute(statement)
+        self._prepared_conns.add(conn)
+
+    def clear_cache(self):
+        """Drop cached history results so the next request re-queries the database"""
+        self._cache.clear()
+
+    def _cached(self, key, loader):
+        """Return the cached result for key, calling loader() on a miss"""
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
 
     def get_complete_history(self, bfm_no: str, start_date: Optional[str] = None,
                             end_date: Optional[str] = None) -> Dict[str, List[Dict]]:
@@ -45,196 +235,135 @@ class EquipmentHistory:
         Returns:
             Dictionary with categorized history records
         """
-        try:
-            history = {
-                'pm_completions': [],
-                'corrective_maintenance': [],
-                'parts_used': [],
-                'status_changes': []
-            }
-
-            # Get PM completions
-            history['pm_completions'] = self._get_pm_history(bfm_no, start_date, end_date)
-
-            # Get corrective maintenance
-            history['corrective_maintenance'] = self._get_cm_history(bfm_no, start_date, end_date)
-
-            # Get parts usage
-            history['parts_used'] = self._get_parts_history(bfm_no, start_date, end_date)
-
-            # Get status changes from audit log
-            history['status_changes'] = self._get_status_changes(bfm_no, start_date, end_date)
-
-            # Commit to end transaction cleanly
-            self.conn.commit()
-
-            return history
-        except Exception as e:
-            # Rollback on error
-            try:
-                self.conn.rollback()
-            except:
-                pass
-            raise e
-
-    def _get_pm_history(self, bfm_no: str, start_date: Optional[str] = None,
-                       end_date: Optional[str] = None) -> List[Dict]:
+        return self._cached(('history', bfm_no, start_date, end_date),
+                            lambda: self._load_complete_history(bfm_no, start_date, end_date))
+
+    def _load_complete_history(self, bfm_no: str, start_date: Optional[str],
+                               end_date: Optional[str]) -> Dict[str, List[Dict]]:
+        """Query complete history for equipment (uncached)"""
+        fetchers = {
+            'pm_completions': self._get_pm_history,
+            'corrective_maintenance': self._get_cm_history,
+            'parts_used': self._get_parts_history,
+            'status_changes': self._get_status_changes
+        }
+
+        start, end = self._date_range(start_date, end_date)
+
+        with self._read_cursor() as cursor:
+            return {key: fetch(bfm_no, start, end, conn=cursor.connection)
+                    for key, fetch in fetchers.items()}
+
+    @staticmethod
+    def _date_range(start_date: Optional[str], end_date: Optional[str]):
+        """Normalize inclusive YYYY-MM-DD bounds to a half-open [start, end + 1 day) date range"""
+        start = date.fromisoformat(start_date[:10]) if start_date else None
+        end = date.fromisoformat(end_date[:10]) + timedelta(days=1) if end_date else None
+        return start, end
+
+    def _fetch_dicts(self, name: str, query: str, params: List, conn=None) -> List[Dict]:
+        """Stream query rows through a server-side cursor, returning them as dicts"""
+        # Named (server-side) cursor fetches itersize rows per round-trip instead of
+        # materializing the whole result client-side; SELECT aliases give the dict keys
+        conn = conn or self.conn
+        with conn.cursor(name=f'{name}_{id(self)}', cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = 1000
+            cursor.execute(query, params)
+            return list(cursor)
+
+    def _get_pm_history(self, bfm_no: str, start: Optional[date] = None,
+                       end: Optional[date] = None, conn=None) -> List[Dict]:
         """Get PM completion history"""
-        cursor = self.conn.cursor()
-
         query = '''
-            SELECT completion_date, pm_type, technician_name, labor_hours,
+            SELECT completion_date AS date, 'PM' AS type, pm_type,
+                   technician_name AS technician, labor_hours,
                    notes, special_equipment
             FROM pm_completions
             WHERE bfm_equipment_no = %s
         '''
         params = [bfm_no]
 
-        if start_date:
+        if start:
             query += ' AND completion_date >= %s'
-            params.append(start_date)
-        if end_date:
-            query += ' AND completion_date <= %s'
-            params.append(end_date)
+            params.append(start.isoformat())
+        if end:
+            query += ' AND completion_date < %s'
+            params.append(end.isoformat())
 
         query += ' ORDER BY completion_date DESC'
 
-        cursor.execute(query, params)
+        return self._fetch_dicts('pm_hist', query, params, conn)
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'date': row[0],
-                'type': 'PM',
-                'pm_type': row[1],
-                'technician': row[2],
-                'labor_hours': row[3],
-                'notes': row[4],
-                'special_equipment': row[5]
-            })
-
-        return results
-
-    def _get_cm_history(self, bfm_no: str, start_date: Optional[str] = None,
-                       end_date: Optional[str] = None) -> List[Dict]:
+    def _get_cm_history(self, bfm_no: str, start: Optional[date] = None,
+                       end: Optional[date] = None, conn=None) -> List[Dict]:
         """Get corrective maintenance history"""
-        cursor = self.conn.cursor()
-
         query = '''
-            SELECT cm_number, reported_date, closed_date, description, priority,
-                   status, assigned_technician, labor_hours, notes, notes
+            SELECT 'CM' AS type, cm_number, reported_date AS date_opened,
+                   closed_date AS date_closed, description, priority, status,
+                   assigned_technician AS assigned_to, labor_hours, notes
             FROM corrective_maintenance
             WHERE bfm_equipment_no = %s
         '''
         params = [bfm_no]
 
-        if start_date:
+        if start:
             query += ' AND reported_date >= %s'
-            params.append(start_date)
-        if end_date:
-            query += ' AND reported_date <= %s'
-            params.append(end_date)
+            params.append(start.isoformat())
+        if end:
+            query += ' AND reported_date < %s'
+            params.append(end.isoformat())
 
         query += ' ORDER BY reported_date DESC'
 
-        cursor.execute(query, params)
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'type': 'CM',
-                'cm_number': row[0],
-                'date_opened': row[1],
-                'date_closed': row[2],
-                'description': row[3],
-                'priority': row[4],
-                'status': row[5],
-                'assigned_to': row[6],
-                'labor_hours': row[7],
-                'root_cause': row[8],
-                'corrective_action': row[9]
-            })
-
-        return results
-
-    def _get_parts_history(self, bfm_no: str, start_date: Optional[str] = None,
-                          end_date: Optional[str] = None) -> List[Dict]:
-        """Get parts usage history"""
-        cursor = self.conn.cursor()
+        return self._fetch_dicts('cm_hist', query, params, conn)
 
+    def _get_parts_history(self, bfm_no: str, start: Optional[date] = None,
+                          end: Optional[date] = None, conn=None) -> List[Dict]:
+        """Get parts usage history"""
         # Get parts from CM parts requests
         query = '''
-            SELECT cpr.requested_date, cpr.part_number, cpr.model_number,
-                   cpr.requested_by, cpr.notes, cm.cm_number
-            FROM cm_parts_requests cpr
-            JOIN corrective_maintenance cm ON cpr.cm_number = cm.cm_number
-            WHERE cm.bfm_equipment_no = %s
+            SELECT 'PART' AS type, requested_date AS date, part_number,
+                   model_number, requested_by, notes, cm_number
+            FROM cm_parts_requests
+            WHERE bfm_equipment_no = %s
         '''
         params = [bfm_no]
 
-        if start_date:
-            query += ' AND cpr.requested_date >= %s'
-            params.append(start_date)
-        if end_date:
-            query += ' AND cpr.requested_date <= %s'
-            params.append(end_date)
-
-        query += ' ORDER BY cpr.requested_date DESC'
-
-        cursor.execute(query, params)
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'type': 'PART',
-                'date': row[0],
-                'part_number': row[1],
-                'model_number': row[2],
-                'requested_by': row[3],
-                'notes': row[4],
-                'cm_number': row[5]
-            })
-
-        return results
-
-    def _get_status_changes(self, bfm_no: str, start_date: Optional[str] = None,
-                           end_date: Optional[str] = None) -> List[Dict]:
-        """Get status changes from audit log"""
-        cursor = self.conn.cursor()
+        if start:
+            query += ' AND requested_date >= %s'
+            params.append(start.isoformat())
+        if end:
+            query += ' AND requested_date < %s'
+            params.append(end.isoformat())
+
+        query += ' ORDER BY requested_date DESC'
+
+        return self._fetch_dicts('parts_hist', query, params, conn)
 
+    def _get_status_changes(self, bfm_no: str, start: Optional[date] = None,
+                           end: Optional[date] = None, conn=None) -> List[Dict]:
+        """Get status changes from audit log"""
         query = '''
-            SELECT timestamp, action, user_id, old_values, new_values
+            SELECT 'STATUS_CHANGE' AS type, action_timestamp AS date, action,
+                   user_name AS "user", old_values, new_values
             FROM audit_log
             WHERE table_name = 'equipment'
             AND record_id = %s
         '''
         params = [bfm_no]
 
-        if start_date:
-            query += ' AND timestamp >= %s'
-            params.append(start_date)
-        if end_date:
-            query += ' AND timestamp <= %s'
-            params.append(end_date)
-
-        query += ' ORDER BY timestamp DESC'
+        if start:
+            query += ' AND action_timestamp >= %s'
+            params.append(start)
+        if end:
+            query += ' AND action_timestamp < %s'
+            params.append(end)
 
-        cursor.execute(query, params)
+        query += ' ORDER BY action_timestamp DESC'
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'type': 'STATUS_CHANGE',
-                'date': row[0],
-                'action': row[1],
-                'user': row[2],
-                'old_values': row[3],
-                'new_values': row[4]
-            })
+        return self._fetch_dicts('status_hist', query, params, conn)
 
-        return results
-
-    def get_timeline_events(self, bfm_no: str, days: int = 365) -> List[Dict]:
+    def get_timeline_events(self, bfm_no: str, days: int = 365) -> List[TimelineEvent]:
         """
         Get timeline events for visualization
 
@@ -246,74 +375,74 @@ class EquipmentHistory:
             List of events sorted by date
         """
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        history = self.get_complete_history(bfm_no, start_date=start_date)
-
-        # Combine all events into a single timeline
-        events = []
-
-        # Add PM completions
-        for pm in history['pm_completions']:
-            events.append({
-                'date': pm['date'],
-                'type': 'PM',
-                'category': 'Preventive Maintenance',
-                'title': f"{pm['pm_type']} PM",
-                'details': f"Technician: {pm['technician']}, Hours: {pm['labor_hours']}",
-                'notes': pm['notes'],
-                'color': '#4CAF50'  # Green
-            })
-
-        # Add CM records
-        for cm in history['corrective_maintenance']:
-            events.append({
-                'date': cm['date_opened'],
-                'type': 'CM_OPEN',
-                'category': 'Corrective Maintenance',
-                'title': f"CM {cm['cm_number']} Opened",
-                'details': f"Priority: {cm['priority']}, Assigned: {cm['assigned_to']}",
-                'notes': cm['description'],
-                'color': '#FF9800'  # Orange
-            })
-
-            if cm['date_closed']:
-                events.append({
-                    'date': cm['date_closed'],
-                    'type': 'CM_CLOSE',
-                    'category': 'Corrective Maintenance',
-                    'title': f"CM {cm['cm_number']} Closed",
-                    'details': f"Hours: {cm['labor_hours']}",
-                    'notes': cm['corrective_action'],
-                    'color': '#4CAF50'  # Green
-                })
-
-        # Add parts usage
-        for part in history['parts_used']:
-            events.append({
-                'date': part['date'],
-                'type': 'PART',
-                'category': 'Parts Request',
-                'title': f"Part: {part['part_number']}",
-                'details': f"Model: {part['model_number']}, Requested by: {part['requested_by']}",
-                'notes': f"CM: {part['cm_number']}, Notes: {part['notes']}",
-                'color': '#2196F3'  # Blue
-            })
-
-        # Add status changes
-        for change in history['status_changes']:
-            events.append({
-                'date': change['date'],
-                'type': 'STATUS',
-                'category': 'Status Change',
-                'title': f"Status Changed",
-                'details': f"By: {change['user']}",
-                'notes': f"From: {change['old_values']} To: {change['new_values']}",
-                'color': '#9C27B0'  # Purple
-            })
-
-        # Sort by date (most recent first)
-        events.sort(key=lambda x: x['date'], reverse=True)
-
-        return events
+        return self._cached(('timeline', bfm_no, start_date),
+                            lambda: self._load_timeline_events(bfm_no, start_date))
+
+    def get_timeline_page(self, bfm_no: str, start_date: str, offset: int = 0) -> List[TimelineEvent]:
+        """
+        Get one page of timeline events, most recent first
+
+        Args:
+            bfm_no: BFM equipment number
+            start_date: Start date filter (YYYY-MM-DD)
+            offset: Number of events to skip
+
+        Returns:
+            Up to TIMELINE_PAGE_SIZE events
+        """
+        return self._cached(('timeline_page', bfm_no, start_date, offset),
+                            lambda: self._load_timeline_events(bfm_no, start_date,
+                                                               self.TIMELINE_PAGE_SIZE, offset))
+
+    def _load_timeline_events(self, bfm_no: str, start_date: str, limit: Optional[int] = None,
+                              offset: int = 0) -> List[TimelineEvent]:
+        """Query timeline events since start_date (uncached); limit None means all"""
+        with self._read_cursor() as cursor:
+            # Build every event type in one UNION ALL, shaped, sorted and paged by the database
+            self._prepare_statements(cursor)
+            cursor.execute('EXECUTE eh_timeline (%s, %s, %s, %s)', (bfm_no, start_date, limit, offset))
+
+            # Most recent first, as sorted by the query
+            return [TimelineEvent._make(row) for row in cursor.fetchall()]
+
+    def get_overview(self, bfm_no: str, start_date: str) -> Tuple[Dict, Dict]:
+        """
+        Get health metrics and summary statistics in a single round-trip
+
+        Args:
+            bfm_no: BFM equipment number
+            start_date: Summary start date (YYYY-MM-DD)
+
+        Returns:
+            Tuple of (health metrics, summary) dictionaries
+        """
+        return self._cached(('overview', bfm_no, start_date, date.today().isoformat()),
+                            lambda: self._load_overview(bfm_no, start_date))
+
+    def _load_overview(self, bfm_no: str, start_date: str) -> Tuple[Dict, Dict]:
+        """Aggregate health and summary statistics in the database (uncached)"""
+        # Health metrics always cover the last 12 months
+        one_year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+
+        with self._read_cursor() as cursor:
+            # Equipment info plus 12-month and summary-window aggregates, one scan per table
+            self._prepare_statements(cursor)
+            cursor.execute('EXECUTE eh_overview (%s, %s, %s)', (bfm_no, one_year_ago, start_date))
+            row = cursor.fetchone()
+
+        health = self._score_health(*row[:9])
+        summary = {
+            'pm_count': row[9],
+            'pm_monthly': row[10],
+            'pm_annual': row[11],
+            'pm_hours': row[12],
+            'cm_count': row[13],
+            'cm_open': row[14],
+            'cm_closed': row[15],
+            'cm_hours': row[16],
+            'parts_count': row[17]
+        }
+        return health, summary
 
     def get_equipment_health_score(self, bfm_no: str) -> Dict:
         """
@@ -325,127 +454,86 @@ class EquipmentHistory:
         Returns:
             Dictionary with health metrics
         """
-        try:
-            cursor = self.conn.cursor()
-
-            metrics = {
-                'health_score': 0,  # 0-100
-                'pm_compliance': 0,  # Percentage of on-time PMs
-                'cm_frequency': 0,  # CMs per month
-                'downtime_days': 0,  # Average downtime
-                'parts_cost': 0,  # Total parts cost (last 12 months)
-                'labor_hours': 0,  # Total labor hours (last 12 months)
-                'status': 'Unknown',
-                'recommendations': []
-            }
+        one_year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        return self.get_overview(bfm_no, one_year_ago)[0]
+
+    @staticmethod
+    def _score_health(found, status, monthly_pm, annual_pm, completed_pms, pm_hours,
+                      cm_count, cm_hours, parts_count) -> Dict:
+        """Build health metrics from the equipment row and its 12-month aggregates"""
+        metrics = {
+            'health_score': 0,  # 0-100
+            'pm_compliance': 0,  # Percentage of on-time PMs
+            'cm_frequency': 0,  # CMs per month
+            'downtime_days': 0,  # Average downtime
+            'parts_cost': 0,  # Total parts cost (last 12 months)
+            'labor_hours': 0,  # Total labor hours (last 12 months)
+            'status': 'Unknown',
+            'recommendations': []
+        }
+
+        if not found:
+            return metrics
 
-            # Get equipment info
-            cursor.execute('SELECT status, monthly_pm, annual_pm FROM equipment WHERE bfm_equipment_no = %s', (bfm_no,))
-            equip_row = cursor.fetchone()
-            if not equip_row:
-                return metrics
+        metrics['status'] = status
 
-            metrics['status'] = equip_row[0]
+        # Count expected PMs
+        expected_pms = 0
+        if monthly_pm == 'X':  # Has monthly PM
+            expected_pms += 12
+        if annual_pm == 'X':  # Has annual PM
+            expected_pms += 1
 
-            # Calculate PM compliance (last 12 months)
-            one_year_ago = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        if expected_pms > 0:
+            metrics['pm_compliance'] = min(100, int((completed_pms / expected_pms) * 100))
 
-            # Count expected PMs
-            expected_pms = 0
-            if equip_row[1] == 'X':  # Has monthly PM
-                expected_pms += 12
-            if equip_row[2] == 'X':  # Has annual PM
-                expected_pms += 1
+        metrics['cm_frequency'] = round(cm_count / 12, 1)
+        metrics['labor_hours'] = pm_hours + cm_hours
 
-            # Count completed PMs
-            cursor.execute('''
-                SELECT COUNT(*)
-                FROM pm_completions
-                WHERE bfm_equipment_no = %s
-                AND completion_date >= %s
-            ''', (bfm_no, one_year_ago))
-            completed_pms = cursor.fetchone()[0]
+        # Parts count (cost data not available in schema)
+        metrics['parts_cost'] = 0  # Not available in current schema
+        metrics['parts_count'] = parts_count or 0
 
-            if expected_pms > 0:
-                metrics['pm_compliance'] = min(100, int((completed_pms / expected_pms) * 100))
+        # Calculate health score (0-100)
+        score = 100
 
-            # Count CMs in last 12 months
-            cursor.execute('''
-                SELECT COUNT(*)
-                FROM corrective_maintenance
-                WHERE bfm_equipment_no = %s
-                AND reported_date >= %s
-            ''', (bfm_no, one_year_ago))
-            cm_count = cursor.fetchone()[0]
-            metrics['cm_frequency'] = round(cm_count / 12, 1)
-
-            # Calculate total labor hours
-            cursor.execute('''
-                SELECT COALESCE(SUM(labor_hours), 0)
-                FROM pm_completions
-                WHERE bfm_equipment_no = %s
-                AND completion_date >= %s
-            ''', (bfm_no, one_year_ago))
-            pm_hours = cursor.fetchone()[0] or 0
+        # Deduct for poor PM compliance
+        score -= (100 - metrics['pm_compliance']) * 0.3
 
-            cursor.execute('''
-                SELECT COALESCE(SUM(labor_hours), 0)
-                FROM corrective_maintenance
-                WHERE bfm_equipment_no = %s
-                AND reported_date >= %s
-            ''', (bfm_no, one_year_ago))
-            cm_hours = cursor.fetchone()[0] or 0
-
-            metrics['labor_hours'] = float(pm_hours) + float(cm_hours)
-
-            # Calculate parts count (cost data not available in schema)
-            cursor.execute('''
-                SELECT COUNT(*)
-                FROM cm_parts_requests cpr
-                JOIN corrective_maintenance cm ON cpr.cm_number = cm.cm_number
-                WHERE cm.bfm_equipment_no = %s
-                AND cpr.requested_date >= %s
-            ''', (bfm_no, one_year_ago))
-            metrics['parts_cost'] = 0  # Not available in current schema
-            metrics['parts_count'] = cursor.fetchone()[0] or 0
-
-            # Calculate health score (0-100)
-            score = 100
-
-            # Deduct for poor PM compliance
-            score -= (100 - metrics['pm_compliance']) * 0.3
-
-            # Deduct for high CM frequency (more than 1 per month is concerning)
-            if metrics['cm_frequency'] > 1:
-                score -= min(20, (metrics['cm_frequency'] - 1) * 10)
-
-            # Deduct for inactive status
-            if metrics['status'] != 'Active':
-                score -= 30
-
-            metrics['health_score'] = max(0, int(score))
-
-            # Generate recommendations
-            if metrics['pm_compliance'] < 80:
-                metrics['recommendations'].append("Improve PM compliance - currently below 80%")
-            if metrics['cm_frequency'] > 2:
-                metrics['recommendations'].append("High CM frequency - investigate root causes")
-            if metrics['parts_count'] > 20:
-                metrics['recommendations'].append("High parts usage - review equipment reliability")
-            if metrics['status'] != 'Active':
-                metrics['recommendations'].append(f"Equipment status is '{metrics['status']}' - review and update")
-
-            # Commit to end transaction cleanly
-            self.conn.commit()
+        # Deduct for high CM frequency (more than 1 per month is concerning)
+        if metrics['cm_frequency'] > 1:
+            score -= min(20, (metrics['cm_frequency'] - 1) * 10)
 
-            return metrics
-        except Exception as e:
-            # Rollback on error
-            try:
-                self.conn.rollback()
-            except:
-                pass
-            raise e
+        # Deduct for inactive status
+        if metrics['status'] != 'Active':
+            score -= 30
+
+        metrics['health_score'] = max(0, int(score))
+
+        # Generate recommendations
+        if metrics['pm_compliance'] < 80:
+            metrics['recommendations'].append("Improve PM compliance - currently below 80%")
+        if metrics['cm_frequency'] > 2:
+            metrics['recommendations'].append("High CM frequency - investigate root causes")
+        if metrics['parts_count'] > 20:
+            metrics['recommendations'].append("High parts usage - review equipment reliability")
+        if metrics['status'] != 'Active':
+            metrics['recommendations'].append(f"Equipment status is '{metrics['status']}' - review and update")
+
+        return metrics
+
+    def get_summary(self, bfm_no: str, start_date: str) -> Dict:
+        """
+        Get PM/CM/parts summary counts and hours since a date
+
+        Args:
+            bfm_no: BFM equipment number
+            start_date: Start date filter (YYYY-MM-DD)
+
+        Returns:
+            Dictionary with summary counts and labor hours
+        """
+        return self.get_overview(bfm_no, start_date)[1]
 
     def get_maintenance_trends(self, bfm_no: str, months: int = 12) -> Dict:
         """
@@ -458,9 +546,7 @@ class EquipmentHistory:
         Returns:
             Dictionary with trend data
         """
-        try:
-            cursor = self.conn.cursor()
-
+        with self._read_cursor() as cursor:
             trends = {
                 'monthly_pm_counts': [],
                 'monthly_cm_counts': [],
@@ -469,74 +555,133 @@ class EquipmentHistory:
                 'months': []
             }
 
-            # Generate month labels
-            current_date = datetime.now()
-            for i in range(months):
-                month_date = current_date - timedelta(days=30 * i)
-                trends['months'].insert(0, month_date.strftime('%Y-%m'))
-
-            # Get monthly data
+            # Month starts computed once as a running (year, month) index, oldest first.
+            # Stepping whole calendar months avoids the gaps/duplicates of 30-day steps
+            today = date.today()
+            first = today.year * 12 + today.month - 1 - (months - 1)
+            month_starts = [date((first + i) // 12, (first + i) % 12 + 1, 1)
+                            for i in range(months + 1)]
+            trends['months'] = [d.strftime('%Y-%m') for d in month_starts[:months]]
+
+            # Aggregate by month in the database: PM counts/hours and CM counts/hours.
+            # Dates are stored as ISO text, so the first 7 characters are the YYYY-MM key.
+            # Half-open range [first month start, start of the month after the last) -
+            # bound as ISO strings since the date columns are TEXT
+            range_start = month_starts[0].isoformat()
+            range_end = month_starts[-1].isoformat()
+
+            self._prepare_statements(cursor)
+            cursor.execute('EXECUTE eh_trends (%s, %s, %s)', (bfm_no, range_start, range_end))
+            by_month = {'PM': {}, 'CM': {}}
+            for kind, month, count, hours in cursor.fetchall():
+                by_month[kind][month] = (count, hours)
+            pm_by_month, cm_by_month = by_month['PM'], by_month['CM']
+
+            # Fill in zero months
             for month in trends['months']:
-                month_start = f"{month}-01"
-                # Calculate month end
-                year, mon = map(int, month.split('-'))
-                if mon == 12:
-                    month_end = f"{year + 1}-01-01"
-                else:
-                    month_end = f"{year}-{mon + 1:02d}-01"
-
-                # PM count
-                cursor.execute('''
-                    SELECT COUNT(*)
-                    FROM pm_completions
-                    WHERE bfm_equipment_no = %s
-                    AND completion_date >= %s
-                    AND completion_date < %s
-                ''', (bfm_no, month_start, month_end))
-                trends['monthly_pm_counts'].append(cursor.fetchone()[0])
-
-                # CM count
-                cursor.execute('''
-                    SELECT COUNT(*)
-                    FROM corrective_maintenance
-                    WHERE bfm_equipment_no = %s
-                    AND reported_date >= %s
-                    AND reported_date < %s
-                ''', (bfm_no, month_start, month_end))
-                trends['monthly_cm_counts'].append(cursor.fetchone()[0])
-
-                # Labor hours
-                cursor.execute('''
-                    SELECT COALESCE(SUM(labor_hours), 0)
-                    FROM pm_completions
-                    WHERE bfm_equipment_no = %s
-                    AND completion_date >= %s
-                    AND completion_date < %s
-                ''', (bfm_no, month_start, month_end))
-                pm_hours = cursor.fetchone()[0] or 0
-
-                cursor.execute('''
-                    SELECT COALESCE(SUM(labor_hours), 0)
-                    FROM corrective_maintenance
-                    WHERE bfm_equipment_no = %s
-                    AND reported_date >= %s
-                    AND reported_date < %s
-                ''', (bfm_no, month_start, month_end))
-                cm_hours = cursor.fetchone()[0] or 0
-
-                trends['monthly_labor_hours'].append(float(pm_hours) + float(cm_hours))
-
-            # Commit to end transaction cleanly
-            self.conn.commit()
+                pm_count, pm_hours = pm_by_month.get(month, (0, 0))
+                cm_count, cm_hours = cm_by_month.get(month, (0, 0))
+                trends['monthly_pm_counts'].append(pm_count)
+                trends['monthly_cm_counts'].append(cm_count)
+                trends['monthly_labor_hours'].append(pm_hours + cm_hours)
 
             return trends
+
+
+# Shared across viewers: one brush per timeline event type
+_EVENT_BRUSHES = {event_type: QBrush(QColor(color))
+                  for event_type, color in EquipmentHistory.EVENT_COLORS.items()}
+
+# Header font, created on first use (QFont needs the QApplication to exist)
+_HEADER_FONT = None
+
+
+def _header_font() -> QFont:
+    """Return the shared viewer header font"""
+    global _HEADER_FONT
+    if _HEADER_FONT is None:
+        _HEADER_FONT = QFont('Arial', 14, QFont.Bold)
+    return _HEADER_FONT
+
+
+class TimelineModel(QAbstractTableModel):
+    """Table model that pulls timeline events from the database a page at a time"""
+
+    HEADERS = ['Date', 'Category', 'Event', 'Details']
+
+    # Emitted with the error text when a further page fails to load
+    loadFailed = pyqtSignal(str)
+
+    def __init__(self, history_manager: EquipmentHistory, parent=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        self.bfm_no = None
+        self.start_date = None
+        self._events = []
+        self._has_more = False
+
+    def load(self, bfm_no: str, start_date: str):
+        """Reset the model to the first page of events since start_date"""
+        page = self.history_manager.get_timeline_page(bfm_no, start_date)
+        self.beginResetModel()
+        self.bfm_no = bfm_no
+        self.start_date = start_date
+        self._events = list(page)
+        self._has_more = len(page) == EquipmentHistory.TIMELINE_PAGE_SIZE
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._events)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        event = self._events[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(event.date)
+            if column == 1:
+                return event.category
+            if column == 2:
+                return event.title
+            return event.details
+        if role == Qt.ForegroundRole and column == 1:
+            # Category is colored by event type
+            return _EVENT_BRUSHES[event.type]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Append the next page when the view scrolls to the end"""
+        if parent.isValid() or not self._has_more:
+            return
+        try:
+            page = self.history_manager.get_timeline_page(self.bfm_no, self.start_date,
+                                                          len(self._events))
         except Exception as e:
-            # Rollback on error
-            try:
-                self.conn.rollback()
-            except:
-                pass
-            raise e
+            # Called from the view - don't let the error escape into Qt; stop paging
+            # and let the viewer report it
+            self._has_more = False
+            self.loadFailed.emit(str(e))
+            return
+
+        self._has_more = len(page) == EquipmentHistory.TIMELINE_PAGE_SIZE
+        if page:
+            first = len(self._events)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._events.extend(page)
+            self.endInsertRows()
 
 
 class EquipmentHistoryViewer(QDialog):
@@ -554,7 +699,7 @@ class EquipmentHistoryViewer(QDialog):
         super().__init__(parent)
         self.conn = conn
         self.bfm_no = bfm_no
-        self.history_manager = EquipmentHistory(conn)
+        self.history_manager = EquipmentHistory(conn, db_pool)
 
         # Set window properties
         self.setWindowTitle(f"Equipment History - {bfm_no}")
@@ -575,8 +720,7 @@ class EquipmentHistoryViewer(QDialog):
         header_layout.setContentsMargins(0, 0, 0, 0)
 
         header_label = QLabel(f"Equipment History: {self.bfm_no}")
-        header_font = QFont('Arial', 14, QFont.Bold)
-        header_label.setFont(header_font)
+        header_label.setFont(_header_font())
         header_layout.addWidget(header_label)
         header_layout.addStretch()
 
@@ -598,7 +742,7 @@ class EquipmentHistoryViewer(QDialog):
         filter_layout.addStretch()
 
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self._load_history)
+        refresh_btn.clicked.connect(self._refresh_history)
         filter_layout.addWidget(refresh_btn)
 
         filter_group.setLayout(filter_layout)
@@ -628,9 +772,13 @@ class EquipmentHistoryViewer(QDialog):
         """Create timeline view"""
         layout = QVBoxLayout(parent)
 
-        # Create tree widget for timeline
-        self.timeline_tree = QTreeWidget()
-        self.timeline_tree.setHeaderLabels(['Date', 'Category', 'Event', 'Details'])
+        # Timeline view backed by a model that loads further pages on scroll
+        self.timeline_model = TimelineModel(self.history_manager, self)
+        self.timeline_model.loadFailed.connect(self._on_timeline_load_failed)
+        self.timeline_tree = QTreeView()
+        self.timeline_tree.setModel(self.timeline_model)
+        self.timeline_tree.setRootIsDecorated(False)
+        self.timeline_tree.setUniformRowHeights(True)
 
         # Configure column widths
         header = self.timeline_tree.header()
@@ -658,33 +806,28 @@ class EquipmentHistoryViewer(QDialog):
         self.summary_text.setReadOnly(True)
         layout.addWidget(self.summary_text)
 
+    def _on_timeline_load_failed(self, message: str):
+        """Report a timeline page that failed to load while scrolling"""
+        QMessageBox.warning(self, "Error", f"Error loading more timeline events: {message}")
+
+    def _refresh_history(self):
+        """Discard cached results and reload equipment history"""
+        self.history_manager.clear_cache()
+        self._load_history()
+
     def _load_history(self):
         """Load and display equipment history"""
         try:
             days = int(self.days_combo.currentText())
+            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-            # Load timeline events
-            events = self.history_manager.get_timeline_events(self.bfm_no, days)
-
-            # Clear timeline
-            self.timeline_tree.clear()
-
-            # Populate timeline
-            for event in events:
-                item = QTreeWidgetItem([
-                    str(event['date']),
-                    event['category'],
-                    event['title'],
-                    event['details']
-                ])
-                self.timeline_tree.addTopLevelItem(item)
+            # Load the first page of timeline events; the view fetches more on scroll
+            self.timeline_model.load(self.bfm_no, start_date)
 
-            # Load health score
-            health = self.history_manager.get_equipment_health_score(self.bfm_no)
+            # Health score and summary come from one aggregate query
+            health, summary = self.history_manager.get_overview(self.bfm_no, start_date)
             self._display_health_score(health)
-
-            # Load summary
-            self._load_summary()
+            self._display_summary(days, summary)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error loading history: {str(e)}")
@@ -715,39 +858,28 @@ RECOMMENDATIONS:
 
         self.health_text.setPlainText(text)
 
-    def _load_summary(self):
-        """Load and display summary statistics"""
-        days = int(self.days_combo.currentText())
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        history = self.history_manager.get_complete_history(self.bfm_no, start_date=start_date)
-
-        pm_count = len(history['pm_completions'])
-        cm_count = len(history['corrective_maintenance'])
-        parts_count = len(history['parts_used'])
-
-        # Calculate totals
-        total_pm_hours = sum(float(pm.get('labor_hours', 0) or 0) for pm in history['pm_completions'])
-        total_cm_hours = sum(float(cm.get('labor_hours', 0) or 0) for cm in history['corrective_maintenance'])
+    def _display_summary(self, days: int, summary: Dict):
+        """Display summary statistics"""
 
         text = f"""
 SUMMARY (Last {days} days)
 
 PREVENTIVE MAINTENANCE:
-- Total PMs: {pm_count}
-- Total PM Hours: {total_pm_hours:.1f}
-- Monthly PMs: {len([p for p in history['pm_completions'] if p['pm_type'] == 'Monthly'])}
-- Annual PMs: {len([p for p in history['pm_completions'] if p['pm_type'] == 'Annual'])}
+- Total PMs: {summary['pm_count']}
+- Total PM Hours: {summary['pm_hours']:.1f}
+- Monthly PMs: {summary['pm_monthly']}
+- Annual PMs: {summary['pm_annual']}
 
 CORRECTIVE MAINTENANCE:
-- Total CMs: {cm_count}
-- Total CM Hours: {total_cm_hours:.1f}
-- Open CMs: {len([c for c in history['corrective_maintenance'] if c['status'] != 'Closed'])}
-- Closed CMs: {len([c for c in history['corrective_maintenance'] if c['status'] == 'Closed'])}
+- Total CMs: {summary['cm_count']}
+- Total CM Hours: {summary['cm_hours']:.1f}
+- Open CMs: {summary['cm_open']}
+- Closed CMs: {summary['cm_closed']}
 
 PARTS:
-- Parts Requests: {parts_count}
+- Parts Requests: {summary['parts_count']}
 
-TOTAL MAINTENANCE HOURS: {total_pm_hours + total_cm_hours:.1f}
+TOTAL MAINTENANCE HOURS: {summary['pm_hours'] + summary['cm_hours']:.1f}
 """
 
         self.summary_text.setPlainText(text)
@@ -7,214 +7,598 @@ from PyQt5.QtWidgets import (
     QWidget, QDialog, QMainWindow, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QTreeWidget, QTreeWidgetItem,
     QTextEdit, QMessageBox, QFileDialog, QGroupBox, QScrollArea, QTabWidget,
-    QHeaderView, QFrame, QSplitter, QApplication
+    QHeaderView, QFrame, QSplitter
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
-from PyQt5.QtGui import QPixmap, QImage, QFont, QColor
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QObject, QRunnable, QThreadPool
+from PyQt5.QtGui import QPixmap, QImage, QFont, QColor, QBrush
 from datetime import datetime
 import os
-from PIL import Image
+from PIL import Image, ImageOps
 import shutil
 import csv
 import io
-from database_utils import db_pool
-
-class MROStockManager:
-    """MRO (Maintenance, Repair, Operations) Stock Management"""
-
-    def __init__(self, parent_app):
-        self.parent_app = parent_app
-        self.conn = parent_app.conn
-        self.root = parent_app.root
-        self.init_mro_database()
-
-    def init_mro_database(self):
-        """Initialize MRO inventory table"""
-        cursor = self.conn.cursor()
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mro_inventory (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                part_number TEXT UNIQUE NOT NULL,
-                model_number TEXT,
-                equipment TEXT,
-                engineering_system TEXT,
-                unit_of_measure TEXT,
-                quantity_in_stock REAL DEFAULT 0,
-                unit_price REAL DEFAULT 0,
-                minimum_stock REAL DEFAULT 0,
-                supplier TEXT,
-                location TEXT,
-                rack TEXT,
-                row TEXT,
-                bin TEXT,
-                picture_1_path TEXT,
-                picture_2_path TEXT,
-                picture_1_data BYTEA,
-                picture_2_data BYTEA,
-                notes TEXT,
-                last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
-                created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'Active'
-            )
-        ''')
+import hashlib
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from psycopg2.extras import execute_values
+from database_utils import db_pool, like_pattern
+
+# Columns of the edit dialog's part SELECT, in order (rows are zipped into part_dict)
+_EDIT_COLUMNS = ('id', 'name', 'part_number', 'model_number', 'equipment', 'engineering_system',
+                 'unit_of_measure', 'quantity_in_stock', 'unit_price', 'minimum_stock',
+                 'supplier', 'location', 'rack', 'row', 'bin', 'picture_1_path',
+                 'picture_2_path', 'has_picture_1', 'has_picture_2',
+                 'notes', 'last_updated', 'created_date', 'status')
+
+# mro_inventory columns written by file imports, in _part_row_from_dict order
+_IMPORT_COLUMNS = ('name', 'part_number', 'model_number', 'equipment', 'engineering_system',
+                   'unit_of_measure', 'quantity_in_stock', 'unit_price', 'minimum_stock',
+                   'supplier', 'location', 'rack', 'row', 'bin')
+
+# Import-file headers matching _IMPORT_COLUMNS, and the ones parsed as numbers
+_IMPORT_HEADERS = ('Name', 'Part Number', 'Model Number', 'Equipment', 'Engineering System',
+                   'Unit of Measure', 'Quantity in Stock', 'Unit Price', 'Minimum Stock',
+                   'Supplier', 'Location', 'Rack', 'Row', 'Bin')
+_IMPORT_NUMERIC_HEADERS = ('Quantity in Stock', 'Unit Price', 'Minimum Stock')
+
+# Fields the Add Part dialog requires before saving
+_REQUIRED_FIELDS = ('name', 'part_number', 'engineering_system', 'unit_of_measure',
+                    'quantity_in_stock', 'minimum_stock', 'location')
+
+# Shared fonts, created on first use (QFont needs the QApplication to exist)
+_HEADER_FONT = None
+_STATS_FONT = None
+
+
+def _header_font():
+    """Return the shared section-header font"""
+    global _HEADER_FONT
+    if _HEADER_FONT is None:
+        _HEADER_FONT = QFont('Arial', 11, QFont.Bold)
+    return _HEADER_FONT
+
+
+def _stats_font():
+    """Return the shared statistics label font"""
+    global _STATS_FONT
+    if _STATS_FONT is None:
+        _STATS_FONT = QFont('Arial', 10)
+    return _STATS_FONT
+
+
+# Stock status banner (text, colour): below minimum, below 1.5x minimum, OK
+_STOCK_STATUS = (
+    ("LOW STOCK - Reorder Recommended", 'red'),
+    ("Stock Getting Low", 'orange'),
+    ("Stock Level OK", 'green'),
+)
 
-        # Migrate existing tables to add new columns if they don't exist
-        try:
-            # Check if picture_1_data column exists
-            cursor.execute("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name='mro_inventory' AND column_name='picture_1_data'
-            """)
-            if not cursor.fetchone():
-                cursor.execute('ALTER TABLE mro_inventory ADD COLUMN picture_1_data BYTEA')
-                self.conn.commit()
-                print("Added picture_1_data column to mro_inventory table")
-        except Exception as e:
-            self.conn.rollback()
-            print(f"Note: Could not add picture_1_data column: {e}")
+# Transaction colours (QColor, unlike QFont, is safe to build before the QApplication)
+_INCOMING_COLOR = QColor('green')
+_OUTGOING_COLOR = QColor('red')
+
+# Stock report table rows (formatted with str.format, compiled once)
+_MONTHLY_ROW_FORMAT = "{:<12} {:<8} {:<10} {:<15.1f} ${:<14,.2f}"
+_TOP_PART_ROW_FORMAT = "{:<15} {:<30} {:<8} {:<12.1f} ${:<14,.2f}"
+# One low-stock alert: three lines and a blank separator line
+_LOW_STOCK_ALERT_FORMAT = ("  Part: {0} - {1}\n"
+                           "  Current: {2} {4} | Minimum: {3} {4} | Deficit: {5} {4}\n"
+                           "  Location: {6}\n")
+_SYSTEM_ROW_FORMAT = "  {}: {} parts, ${:,.2f} value"
+
+# Background of low-stock rows in the inventory tree
+_LOW_STOCK_BRUSH = QBrush(QColor(255, 204, 204))
+
+
+def _truncate(text, limit, default=''):
+    """Shorten text to limit characters with an ellipsis, or return default when empty"""
+    if not text:
+        return default
+    return text[:limit] + '...' if len(text) > limit else text
+
+
+def _fill_tree(tree, items):
+    """Append items to a QTreeWidget in one call, with painting and sorting suspended"""
+    if not items:
+        return
+    sorting = tree.isSortingEnabled()
+    tree.setUpdatesEnabled(False)
+    tree.setSortingEnabled(False)
+    try:
+        tree.addTopLevelItems(items)
+    finally:
+        tree.setSortingEnabled(sorting)
+        tree.setUpdatesEnabled(True)
+
+
+def _scaled_thumbnail_image(data):
+    """Decode picture bytes to a 200px QImage (unlike QPixmap, safe off the GUI thread)"""
+    image = QImage.fromData(data)
+    if image.isNull():
+        raise ValueError("Unsupported image data")
+    return image.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class _PartDetailsFetcher(QRunnable):
+    """Loads part-details pictures and/or CM history and transactions on a worker thread"""
+
+    class Signals(QObject):
+        # picture number, thumbnail cache key (None on failure), picture bytes, decoded QImage
+        pictureReady = pyqtSignal(int, object, object, object)
+        # CM usage rows, quantity used in the last 30 days
+        historyReady = pyqtSignal(object, object)
+        transactionsReady = pyqtSignal(object)
+        # section, error message
+        failed = pyqtSignal(str, str)
+
+    def __init__(self, manager, part_id, part_number, pictures=(), load_activity=False):
+        super().__init__()
+        self.manager = manager
+        self.part_id = part_id
+        self.part_number = part_number
+        # Picture numbers stored in the database for this part
+        self.pictures = pictures
+        # Whether to load the CM history / transactions tabs as well
+        self.load_activity = load_activity
+        # Created here, on the GUI thread, so emits from run() are queued to it
+        self.signals = self.Signals()
+
+    def run(self):
+        for which in self.pictures:
+            key = data = image = None
+            try:
+                data = self.manager.get_picture_blob(self.part_id, which)
+                if data:
+                    key = MROStockManager._thumbnail_key(self.part_id, which, data)
+                    if not self.manager.has_thumbnail(key):
+                        image = _scaled_thumbnail_image(data)
+            except Exception as e:
+                print(f"Error loading picture {which} for {self.part_number}: {e}")
+                key = None
+            self.signals.pictureReady.emit(which, key, data, image)
 
+        if not self.load_activity:
+            return
         try:
-            # Check if picture_2_data column exists
-            cursor.execute("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name='mro_inventory' AND column_name='picture_2_data'
-            """)
-            if not cursor.fetchone():
-                cursor.execute('ALTER TABLE mro_inventory ADD COLUMN picture_2_data BYTEA')
-                self.conn.commit()
-                print("Added picture_2_data column to mro_inventory table")
+            cm_history, recent_usage, transactions = self.manager.fetch_part_activity(self.part_number)
         except Exception as e:
-            self.conn.rollback()
-            print(f"Note: Could not add picture_2_data column: {e}")
+            self.signals.failed.emit("CM history", str(e))
+            return
+        self.signals.historyReady.emit(cm_history, recent_usage)
+        self.signals.transactionsReady.emit(transactions)
 
-        # === PERFORMANCE OPTIMIZATION: Create comprehensive MRO indexes ===
-        print("CHECK: Creating MRO inventory performance indexes...")
 
-        # Basic indexes for unique lookups
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_part_number
-            ON mro_inventory(part_number)
-        ''')
+class MROStockManager:
+    """MRO (Maintenance, Repair, Operations) Stock Management"""
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_name
-            ON mro_inventory(name)
-        ''')
+    # Filter columns stored as case-insensitive CITEXT (plain btree indexes, no LOWER()).
+    # part_number (text FKs, unique key), name (trigram index) and status (partial
+    # index predicates) stay TEXT
+    CITEXT_COLUMNS = ('engineering_system', 'location', 'equipment', 'model_number')
 
-        # Functional indexes for case-insensitive searches (critical for filter performance)
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_engineering_system_lower
-            ON mro_inventory(LOWER(engineering_system))
-        ''')
+    # Longest edge (px) of part pictures stored in the database
+    PICTURE_MAX_SIZE = 1600
+    # Parts whose photos are read and upserted together by migrate_photos_to_database
+    PHOTO_MIGRATION_BATCH = 100
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_status_lower
-            ON mro_inventory(LOWER(status))
-        ''')
+    # One-time migrations recorded in cmms_schema, so startup skips their catalog
+    # checks once applied: photo bytes moved to mro_inventory_photos, then the
+    # CITEXT filter columns
+    SCHEMA_VERSION_PHOTOS_TABLE = 1
+    SCHEMA_VERSION_CITEXT = 2
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_location_lower
-            ON mro_inventory(LOWER(location))
-        ''')
+    # Imports at least this large are loaded with COPY through a staging table
+    BULK_COPY_THRESHOLD = 5000
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_equipment_lower
-            ON mro_inventory(LOWER(equipment))
-        ''')
+    # Decoded picture thumbnails kept for repeat views of part details
+    THUMBNAIL_CACHE_SIZE = 256
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_model_number_lower
-            ON mro_inventory(LOWER(model_number))
-        ''')
+    # Inventory rows fetched per page; the next page loads when the list is
+    # scrolled near its end
+    TREE_PAGE_SIZE = 1000
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_part_number_lower
-            ON mro_inventory(LOWER(part_number))
-        ''')
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_name_lower
-            ON mro_inventory(LOWER(name))
-        ''')
+    # Repeated write statements, PREPAREd once per connection (see _prepare_statements)
+    PREPARED_STATEMENTS = {
+        'mro_insert_part': '''
+            PREPARE mro_insert_part AS
+            INSERT INTO mro_inventory (
+                name, part_number, model_number, equipment, engineering_system,
+                unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
+                supplier, location, rack, row, bin, picture_1_path, picture_2_path,
+                notes
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
+            RETURNING id
+        ''',
+        # Edits are keyed by primary key; paths are only replaced when a new file was chosen
+        'mro_update_part': '''
+            PREPARE mro_update_part AS
+            UPDATE mro_inventory SET
+                name = $1, model_number = $2, equipment = $3, engineering_system = $4,
+                unit_of_measure = $5, quantity_in_stock = $6, unit_price = $7,
+                minimum_stock = $8, supplier = $9, location = $10, rack = $11,
+                row = $12, bin = $13,
+                picture_1_path = COALESCE($14, picture_1_path),
+                picture_2_path = COALESCE($15, picture_2_path),
+                notes = $16, status = $17, last_updated = NOW()
+            WHERE id = $18
+        ''',
+        # Full part row for the edit and details dialogs, in _EDIT_COLUMNS order
+        'mro_select_part': '''
+            PREPARE mro_select_part AS
+            SELECT id, name, part_number, model_number, equipment, engineering_system,
+                   unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
+                   supplier, location, rack, row, bin, picture_1_path,
+                   picture_2_path,
+                   p.picture_1_data IS NOT NULL AS has_picture_1,
+                   p.picture_2_data IS NOT NULL AS has_picture_2,
+                   notes, last_updated, created_date, status
+            FROM mro_inventory m
+            LEFT JOIN mro_inventory_photos p ON p.part_id = m.id
+            WHERE m.part_number = $1
+        ''',
+        # Part details history tabs: CM usage rows, 30-day usage, stock transactions
+        'mro_part_activity': '''
+            PREPARE mro_part_activity AS
+            WITH history AS (
+                SELECT
+                    cp.cm_number,
+                    cm.description,
+                    cm.bfm_equipment_no,
+                    cp.quantity_used,
+                    cp.total_cost,
+                    cp.recorded_date,
+                    cp.recorded_by,
+                    cm.status,
+                    cp.notes
+                FROM cm_parts_used cp
+                LEFT JOIN corrective_maintenance cm ON cp.cm_number = cm.cm_number
+                WHERE cp.part_number = $1
+                ORDER BY cp.recorded_date DESC
+                LIMIT 50
+            ),
+            recent AS (
+                SELECT COALESCE(SUM(quantity_used), 0) AS recent_usage
+                FROM cm_parts_used
+                WHERE part_number = $1
+                AND recorded_date >= TO_CHAR(CURRENT_DATE - INTERVAL '30 days', 'YYYY-MM-DD')
+            ),
+            tx AS (
+                SELECT
+                    transaction_date,
+                    transaction_type,
+                    quantity,
+                    technician_name,
+                    work_order,
+                    notes
+                FROM mro_stock_transactions
+                WHERE part_number = $1
+                ORDER BY transaction_date DESC
+                LIMIT 100
+            )
+            SELECT
+                (SELECT json_agg(json_build_array(
+                            h.cm_number, h.description, h.bfm_equipment_no,
+                            h.quantity_used, h.total_cost, h.recorded_date,
+                            h.recorded_by, h.status, h.notes)
+                        ORDER BY h.recorded_date DESC)
+                 FROM history h),
+                (SELECT recent_usage FROM recent),
+                (SELECT json_agg(json_build_array(
+                            t.transaction_date, t.transaction_type, t.quantity,
+                            t.technician_name, t.work_order, t.notes)
+                        ORDER BY t.transaction_date DESC)
+                 FROM tx t)
+        ''',
+    }
 
-        # Partial index for low stock queries (most common filter)
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_low_stock
-            ON mro_inventory(status, quantity_in_stock, minimum_stock)
-            WHERE quantity_in_stock < minimum_stock
-        ''')
+    def __init__(self, parent_app):
+        self.parent_app = parent_app
+        self.root = parent_app.root
+        # Columns actually migrated to CITEXT (set by init_mro_database)
+        self.citext_columns = set()
+        # Parameters of the current inventory filter (for EXECUTE mro_filter), the
+        # last part number loaded from it, and whether every page is loaded
+        self._filter_params = None
+        self._filter_last_part = None
+        self._filter_done = True
+        # Inventory tree items currently shown, by part number
+        self._mro_items = {}
+        # Search text the list currently reflects (None = not filtered yet)
+        self._filter_search_term = None
+        # Distinct inventory locations for the Location filter (None = not loaded)
+        self._location_cache = None
+        # Statistics bar text, and whether mro_inventory changed since it was queried
+        self._stats_cache = None
+        self._stats_dirty = True
+        # Connections (pooled or shared) that already hold PREPARED_STATEMENTS
+        self._prepared_conns = weakref.WeakSet()
+        # LRU of thumbnail QPixmaps keyed by (part id, picture number, data digest)
+        self._thumbnail_cache = OrderedDict()
+        self.init_mro_database()
 
-        # Covering index for statistics queries (eliminates table access)
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_active_stock_value
-            ON mro_inventory(status, quantity_in_stock, unit_price, minimum_stock)
-            WHERE status = 'Active'
-        ''')
+    def init_mro_database(self):
+        """Initialize MRO inventory table"""
+        # Startup DDL runs on a pooled connection like the rest of the module; each
+        # block commits on exit, so a missing extension privilege in the optional
+        # steps below can't roll back the work before it
+        with db_pool.get_cursor(commit=True) as cursor:
+            # All idempotent tables and indexes go to the server as one multi-statement
+            # batch - a single round-trip instead of one per statement
+            print("CHECK: Creating MRO inventory tables and performance indexes...")
+            ddl = [
+                # Applied one-time migration per component (see _set_schema_version)
+                '''
+                CREATE TABLE IF NOT EXISTS cmms_schema (
+                    component TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+                ''',
+                '''
+                CREATE TABLE IF NOT EXISTS mro_inventory (
+                    id SERIAL PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    part_number TEXT UNIQUE NOT NULL,
+                    model_number TEXT,
+                    equipment TEXT,
+                    engineering_system TEXT,
+                    unit_of_measure TEXT,
+                    quantity_in_stock REAL DEFAULT 0,
+                    unit_price REAL DEFAULT 0,
+                    minimum_stock REAL DEFAULT 0,
+                    supplier TEXT,
+                    location TEXT,
+                    rack TEXT,
+                    row TEXT,
+                    bin TEXT,
+                    picture_1_path TEXT,
+                    picture_2_path TEXT,
+                    notes TEXT,
+                    last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                    status TEXT DEFAULT 'Active'
+                )
+                ''',
+
+                # Stock transactions table for tracking stock movements
+                '''
+                CREATE TABLE IF NOT EXISTS mro_stock_transactions (
+                    id SERIAL PRIMARY KEY,
+                    part_number TEXT NOT NULL,
+                    transaction_type TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    transaction_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                    technician_name TEXT,
+                    work_order TEXT,
+                    notes TEXT,
+                    FOREIGN KEY (part_number) REFERENCES mro_inventory (part_number)
+                )
+                ''',
+
+                # CM parts usage table for tracking parts used in corrective maintenance
+                '''
+                CREATE TABLE IF NOT EXISTS cm_parts_used (
+                    id SERIAL PRIMARY KEY,
+                    cm_number TEXT NOT NULL,
+                    part_number TEXT NOT NULL,
+                    quantity_used REAL NOT NULL,
+                    total_cost REAL DEFAULT 0,
+                    recorded_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                    recorded_by TEXT,
+                    notes TEXT,
+                    FOREIGN KEY (part_number) REFERENCES mro_inventory (part_number)
+                )
+                ''',
+
+                # Photo bytes live in a 1:1 side table so the inventory rows the list,
+                # filter and statistics queries scan stay small
+                '''
+                CREATE TABLE IF NOT EXISTS mro_inventory_photos (
+                    part_id INTEGER PRIMARY KEY REFERENCES mro_inventory(id) ON DELETE CASCADE,
+                    picture_1_data BYTEA,
+                    picture_2_data BYTEA
+                )
+                ''',
+
+                # === PERFORMANCE OPTIMIZATION: Create comprehensive MRO indexes ===
+                # Indexes each MRO query path relies on:
+                #   status filter        -> idx_mro_status
+                #   system/location      -> idx_mro_engineering_system / idx_mro_location (below)
+                #   search box           -> idx_mro_*_trgm on all five searched columns (below)
+                #   low stock, stats     -> idx_mro_low_stock(_display) / idx_mro_active_stock_covering
+                # name is only ever substring-searched, so plain and LOWER() btrees on
+                # name/part_number were never usable and only cost writes
+                'DROP INDEX IF EXISTS idx_mro_name',
+                'DROP INDEX IF EXISTS idx_mro_name_lower',
+                'DROP INDEX IF EXISTS idx_mro_part_number_lower',
+
+                # part_number lookups use the UNIQUE constraint's index
+                # (mro_inventory_part_number_key); a second btree only cost writes
+                'DROP INDEX IF EXISTS idx_mro_part_number',
+
+                # Status filter values come from the combobox and match the stored
+                # values exactly, so a plain btree replaces the LOWER() one (CITEXT
+                # filter columns are indexed below)
+                'DROP INDEX IF EXISTS idx_mro_status_lower',
+                'CREATE INDEX IF NOT EXISTS idx_mro_status ON mro_inventory(status)',
+
+                # Partial index for low stock queries (most common filter)
+                '''
+                CREATE INDEX IF NOT EXISTS idx_mro_low_stock
+                ON mro_inventory(status, quantity_in_stock, minimum_stock)
+                WHERE quantity_in_stock < minimum_stock
+                ''',
+
+                # Covering partial index for the low-stock alert/report listings, so
+                # rendering them needs no heap access. Queries must repeat the
+                # predicate verbatim for the planner to match it
+                '''
+                CREATE INDEX IF NOT EXISTS idx_mro_low_stock_display
+                ON mro_inventory(part_number)
+                INCLUDE (name, quantity_in_stock, minimum_stock, unit_of_measure,
+                         location, supplier, status)
+                WHERE quantity_in_stock < minimum_stock
+                ''',
+
+                # The inventory list's Low Stock filter walks this index in
+                # part_number order; its predicate is repeated verbatim there
+                '''
+                CREATE INDEX IF NOT EXISTS idx_mro_low_stock_active
+                ON mro_inventory(part_number)
+                WHERE quantity_in_stock < minimum_stock AND status = 'Active'
+                ''',
+
+                # Covering index for statistics queries (eliminates table access): the
+                # stock columns are INCLUDE payload, not sort keys, so the stats aggregate
+                # runs as an index-only scan (autovacuum keeps the visibility map current)
+                'DROP INDEX IF EXISTS idx_mro_active_stock_value',
+                '''
+                CREATE INDEX IF NOT EXISTS idx_mro_active_stock_covering
+                ON mro_inventory(status)
+                INCLUDE (quantity_in_stock, unit_price, minimum_stock)
+                WHERE status = 'Active'
+                ''',
+
+                # Indexes for faster CM parts and transaction queries
+                'CREATE INDEX IF NOT EXISTS idx_cm_parts_cm_number ON cm_parts_used(cm_number)',
+                # recorded_date is ISO-8601 text, so date ranges are compared as
+                # strings against this index instead of casting every row
+                'CREATE INDEX IF NOT EXISTS idx_cm_parts_used_date ON cm_parts_used(recorded_date)',
+                'CREATE INDEX IF NOT EXISTS idx_mro_transactions_date ON mro_stock_transactions(transaction_date)',
+                # Per-part history is read newest-first with a LIMIT; the composite
+                # indexes return it pre-sorted and also cover plain part_number lookups
+                'DROP INDEX IF EXISTS idx_cm_parts_part_number',
+                '''
+                CREATE INDEX IF NOT EXISTS idx_cm_parts_part_date
+                ON cm_parts_used(part_number, recorded_date DESC)
+                ''',
+                'DROP INDEX IF EXISTS idx_mro_transactions_part_number',
+                '''
+                CREATE INDEX IF NOT EXISTS idx_mro_tx_part_date
+                ON mro_stock_transactions(part_number, transaction_date DESC)
+                ''',
+            ]
+            cursor.execute(';\n'.join(ddl))
+
+            cursor.execute("SELECT version FROM cmms_schema WHERE component = 'mro_inventory'")
+            row = cursor.fetchone()
+            schema_version = row['version'] if row else 0
+
+            # Migrate older tables that still keep photo bytes on mro_inventory: copy
+            # them to mro_inventory_photos. The inline columns are left in place
+            # (nothing reads them any more); dropping them is a manual admin step
+            # once the copy has been checked
+            if schema_version < self.SCHEMA_VERSION_PHOTOS_TABLE:
+                photo_columns = ('picture_1_data', 'picture_2_data')
+                cursor.execute("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_name = 'mro_inventory' AND column_name = ANY(%s)
+                """, (list(photo_columns),))
+                existing_columns = {row['column_name'] for row in cursor.fetchall()}
+                if existing_columns:
+                    select_columns = ', '.join(column if column in existing_columns else 'NULL'
+                                               for column in photo_columns)
+                    has_photo = ' OR '.join(f'{column} IS NOT NULL' for column in sorted(existing_columns))
+                    # Existing photo rows keep their pictures and only gain the ones
+                    # they are missing
+                    cursor.execute(f'''
+                        INSERT INTO mro_inventory_photos (part_id, picture_1_data, picture_2_data)
+                        SELECT id, {select_columns} FROM mro_inventory
+                        WHERE {has_photo}
+                        ON CONFLICT (part_id) DO UPDATE SET
+                            picture_1_data = COALESCE(mro_inventory_photos.picture_1_data,
+                                                      EXCLUDED.picture_1_data),
+                            picture_2_data = COALESCE(mro_inventory_photos.picture_2_data,
+                                                      EXCLUDED.picture_2_data)
+                    ''')
+                    print(f"Copied {cursor.rowcount} part photos to mro_inventory_photos")
+                self._set_schema_version(cursor, self.SCHEMA_VERSION_PHOTOS_TABLE)
 
         print("CHECK: MRO inventory indexes created successfully!")
 
-        # Stock transactions table for tracking stock movements
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mro_stock_transactions (
-                id SERIAL PRIMARY KEY,
-                part_number TEXT NOT NULL,
-                transaction_type TEXT NOT NULL,
-                quantity REAL NOT NULL,
-                transaction_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                technician_name TEXT,
-                work_order TEXT,
-                notes TEXT,
-                FOREIGN KEY (part_number) REFERENCES mro_inventory (part_number)
-            )
-        ''')
+        # Case-insensitive filter columns as CITEXT: equality/LIKE compare without
+        # LOWER(), so plain btree indexes serve the filters. One-time type change,
+        # skipped once recorded in cmms_schema
+        if schema_version >= self.SCHEMA_VERSION_CITEXT:
+            self.citext_columns = set(self.CITEXT_COLUMNS)
+        else:
+            self._migrate_citext_columns()
 
-        # CM parts usage table for tracking parts used in corrective maintenance
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cm_parts_used (
-                id SERIAL PRIMARY KEY,
-                cm_number TEXT NOT NULL,
-                part_number TEXT NOT NULL,
-                quantity_used REAL NOT NULL,
-                total_cost REAL DEFAULT 0,
-                recorded_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                recorded_by TEXT,
-                notes TEXT,
-                FOREIGN KEY (part_number) REFERENCES mro_inventory (part_number)
-            )
-        ''')
+        # The inventory list statement compares differently depending on which
+        # columns ended up CITEXT, so it is added to this instance's statements
+        self.PREPARED_STATEMENTS = dict(self.PREPARED_STATEMENTS,
+                                        mro_filter=self._filter_statement())
 
-        # Indexes for faster CM parts and transaction queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cm_parts_cm_number
-            ON cm_parts_used(cm_number)
-        ''')
-
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cm_parts_part_number
-            ON cm_parts_used(part_number)
-        ''')
+        # Trigram indexes so substring (ILIKE '%term%') part searches can use an index
+        try:
+            with db_pool.get_cursor(commit=True) as cursor:
+                cursor.execute('''
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS idx_mro_part_number_trgm
+                    ON mro_inventory USING gin (part_number gin_trgm_ops);
+                    CREATE INDEX IF NOT EXISTS idx_mro_name_trgm
+                    ON mro_inventory USING gin (name gin_trgm_ops);
+                    CREATE INDEX IF NOT EXISTS idx_mro_model_number_trgm
+                    ON mro_inventory USING gin ((model_number::text) gin_trgm_ops);
+                    CREATE INDEX IF NOT EXISTS idx_mro_equipment_trgm
+                    ON mro_inventory USING gin ((equipment::text) gin_trgm_ops);
+                    CREATE INDEX IF NOT EXISTS idx_mro_location_trgm
+                    ON mro_inventory USING gin ((location::text) gin_trgm_ops)
+                ''')
+        except Exception as e:
+            print(f"Note: Could not create trigram indexes: {e}")
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_cm_parts_used_date
-            ON cm_parts_used(recorded_date)
-        ''')
+        print("MRO inventory database initialized with performance indexes")
 
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_transactions_date
-            ON mro_stock_transactions(transaction_date)
-        ''')
+    def _migrate_citext_columns(self):
+        """Convert CITEXT_COLUMNS to CITEXT, falling back to LOWER() indexes if unavailable"""
+        try:
+            with db_pool.get_cursor(commit=True) as cursor:
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS citext')
+                cursor.execute("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_name = 'mro_inventory' AND column_name = ANY(%s)
+                    AND udt_name != 'citext'
+                """, (list(self.CITEXT_COLUMNS),))
+                to_convert = [row['column_name'] for row in cursor.fetchall()]
+                if to_convert:
+                    cursor.execute('ALTER TABLE mro_inventory ' + ', '.join(
+                        f'ALTER COLUMN {column} TYPE citext' for column in to_convert))
+                    print(f"Converted mro_inventory columns to CITEXT: {', '.join(to_convert)}")
+                cursor.execute('''
+                    DROP INDEX IF EXISTS idx_mro_engineering_system_lower;
+                    DROP INDEX IF EXISTS idx_mro_location_lower;
+                    DROP INDEX IF EXISTS idx_mro_equipment_lower;
+                    DROP INDEX IF EXISTS idx_mro_model_number_lower;
+                    CREATE INDEX IF NOT EXISTS idx_mro_engineering_system
+                    ON mro_inventory(engineering_system);
+                    CREATE INDEX IF NOT EXISTS idx_mro_location
+                    ON mro_inventory(location)
+                ''')
+                self._set_schema_version(cursor, self.SCHEMA_VERSION_CITEXT)
+            self.citext_columns = set(self.CITEXT_COLUMNS)
+        except Exception as e:
+            print(f"Note: Could not convert MRO filter columns to CITEXT: {e}")
+            # Fall back to LOWER() functional indexes for the filter columns
+            with db_pool.get_cursor(commit=True) as cursor:
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_mro_engineering_system_lower
+                    ON mro_inventory(LOWER(engineering_system));
+                    CREATE INDEX IF NOT EXISTS idx_mro_location_lower
+                    ON mro_inventory(LOWER(location));
+                    CREATE INDEX IF NOT EXISTS idx_mro_location
+                    ON mro_inventory(location)
+                ''')
 
+    def _set_schema_version(self, cursor, version):
+        """Record the applied mro_inventory migration version in cmms_schema"""
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_mro_transactions_part_number
-            ON mro_stock_transactions(part_number)
-        ''')
-
-        self.conn.commit()
-        print("MRO inventory database initialized with performance indexes")
+            INSERT INTO cmms_schema (component, version) VALUES ('mro_inventory', %s)
+            ON CONFLICT (component) DO UPDATE SET version = EXCLUDED.version
+        ''', (version,))
 
     def create_mro_tab(self, notebook):
         """Create MRO Stock Management tab"""
@@ -286,7 +670,12 @@ class MROStockManager:
 
         search_layout.addWidget(QLabel("Search:"))
         self.mro_search_entry = QLineEdit()
-        self.mro_search_entry.textChanged.connect(self.filter_mro_list)
+        # Debounce typing: re-filter once the user pauses for 250 ms
+        self._filter_timer = QTimer()
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_search)
+        self.mro_search_entry.textChanged.connect(lambda: self._filter_timer.start())
         search_layout.addWidget(self.mro_search_entry)
 
         search_layout.addWidget(QLabel("System:"))
@@ -308,7 +697,8 @@ class MROStockManager:
         search_layout.addWidget(self.mro_location_filter)
 
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self.refresh_mro_list)
+        refresh_btn.clicked.connect(
+            lambda: self.refresh_mro_list(reload_locations=True, reload_stats=True))
         search_layout.addWidget(refresh_btn)
 
         search_layout.addStretch()
@@ -331,12 +721,15 @@ class MROStockManager:
         for i, width in enumerate(column_widths):
             self.mro_tree.setColumnWidth(i, width)
 
-        self.mro_tree.setSortingEnabled(True)
+        # Header sorting is switched on by _load_mro_page once every page is loaded
         self.mro_tree.setAlternatingRowColors(True)
 
         # Double-click to view details
         self.mro_tree.itemDoubleClicked.connect(lambda: self.view_part_details())
 
+        # Load further pages of the inventory as the list is scrolled
+        self.mro_tree.verticalScrollBar().valueChanged.connect(self._on_mro_scroll)
+
         list_layout.addWidget(self.mro_tree)
         list_group.setLayout(list_layout)
         main_layout.addWidget(list_group)
@@ -346,8 +739,7 @@ class MROStockManager:
         stats_layout = QVBoxLayout()
 
         self.mro_stats_label = QLabel("Loading...")
-        font = QFont('Arial', 10)
-        self.mro_stats_label.setFont(font)
+        self.mro_stats_label.setFont(_stats_font())
         stats_layout.addWidget(self.mro_stats_label)
 
         stats_group.setLayout(stats_layout)
@@ -380,7 +772,7 @@ class MROStockManager:
 
         # Basic Information
         basic_label = QLabel("BASIC INFORMATION")
-        font = QFont('Arial', 11, QFont.Bold)
+        font = _header_font()
         basic_label.setFont(font)
         scroll_layout.addWidget(basic_label, row, 0, 1, 2)
         row += 1
@@ -481,45 +873,27 @@ class MROStockManager:
 
         def save_part():
             try:
-                # Validate required fields
-                required = ['name', 'part_number', 'engineering_system',
-                        'unit_of_measure', 'quantity_in_stock', 'minimum_stock', 'location']
-
-                for field in required:
-                    if field in ['notes', 'picture_1', 'picture_2']:
-                        continue
-                    value = fields[field].text() if hasattr(fields[field], 'text') else ''
-                    if not value:
-                        QMessageBox.critical(dialog, "Error", f"Please fill in: {field.replace('_', ' ').title()}")
-                        return
+                # Validate required fields, reporting every missing one at once
+                missing = [field for field in _REQUIRED_FIELDS if not fields[field].text().strip()]
+                if missing:
+                    QMessageBox.critical(dialog, "Error", "Please fill in: " +
+                                         ", ".join(field.replace('_', ' ').title() for field in missing))
+                    return
 
-                # Read image files as binary data
                 pic1_path = fields['picture_1'].text()
                 pic2_path = fields['picture_2'].text()
 
-                pic1_data = None
-                pic2_data = None
-
-                if pic1_path and os.path.exists(pic1_path):
-                    with open(pic1_path, 'rb') as f:
-                        pic1_data = f.read()
-
-                if pic2_path and os.path.exists(pic2_path):
-                    with open(pic2_path, 'rb') as f:
-                        pic2_data = f.read()
-
                 # Insert into database using connection pool
                 notes_text = fields['notes'].toPlainText() if 'notes' in fields else ''
 
-                # Use connection pool to avoid SSL timeout issues
+                # Use connection pool to avoid SSL timeout issues. The part row is
+                # inserted and committed without photo data so the main transaction
+                # stays small; photos follow in their own UPDATE
                 with db_pool.get_cursor(commit=True) as cursor:
+                    self._prepare_statements(cursor)
                     cursor.execute('''
-                        INSERT INTO mro_inventory (
-                            name, part_number, model_number, equipment, engineering_system,
-                            unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                            supplier, location, rack, row, bin, picture_1_path, picture_2_path,
-                            picture_1_data, picture_2_data, notes
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        EXECUTE mro_insert_part (%s, %s, %s, %s, %s, %s, %s, %s, %s,
+                                                 %s, %s, %s, %s, %s, %s, %s, %s)
                     ''', (
                         fields['name'].text(),
                         fields['part_number'].text(),
@@ -537,14 +911,20 @@ class MROStockManager:
                         fields['bin'].text(),
                         pic1_path,
                         pic2_path,
-                        pic1_data,
-                        pic2_data,
                         notes_text
                     ))
+                    part_id = cursor.fetchone()['id']
+                self._stats_dirty = True
+
+                try:
+                    self.save_part_pictures(part_id, pic1_path, pic2_path)
+                except Exception as e:
+                    QMessageBox.warning(dialog, "Warning",
+                                        f"Part added, but its pictures could not be saved: {str(e)}")
 
                 QMessageBox.information(dialog, "Success", "Part added successfully!")
                 dialog.accept()
-                self.refresh_mro_list()
+                self.refresh_mro_list(reload_locations=True)
 
             except Exception as e:
                 error_msg = str(e).lower()
@@ -576,6 +956,150 @@ class MROStockManager:
 
         dialog.exec_()
 
+    def read_picture(self, path):
+        """Read an image file for storage as a downscaled JPEG, or None if there is no file"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            # Phone photos are often 5-15 MB; store at most PICTURE_MAX_SIZE px
+            # on the long edge, re-encoded as JPEG
+            with Image.open(path) as img:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((self.PICTURE_MAX_SIZE, self.PICTURE_MAX_SIZE), Image.LANCZOS)
+                buffer = io.BytesIO()
+                img.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+                return buffer.getvalue()
+        except OSError:
+            # Not an image PIL can decode - store the file as-is
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def _prepare_statements(self, cursor):
+        """PREPARE the repeated statements once per connection so they are parsed/planned once"""
+        conn = cursor.connection
+        if conn in self._prepared_conns:
+            return
+
+        cursor.execute('''
+            SELECT name FROM pg_prepared_statements
+            WHERE name = ANY(%s)
+        ''', (list(self.PREPARED_STATEMENTS),))
+        existing = {row['name'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+        for name, statement in self.PREPARED_STATEMENTS.items():
+            if name not in existing:
+                cursor.execute(statement)
+        self._prepared_conns.add(conn)
+
+    def save_part_pictures(self, part_id, pic1_path, pic2_path):
+        """Store picture data for a part in its own short transaction"""
+        pic1_data = self.read_picture(pic1_path)
+        pic2_data = self.read_picture(pic2_path)
+        if pic1_data is None and pic2_data is None:
+            return
+
+        # Only the pictures that were replaced are written; an unchanged photo
+        # is left out of the SET list entirely
+        set_clauses = [f'{column} = EXCLUDED.{column}'
+                       for column, data in (('picture_1_data', pic1_data), ('picture_2_data', pic2_data))
+                       if data is not None]
+        with db_pool.get_cursor(commit=True) as cursor:
+            cursor.execute(f'''
+                INSERT INTO mro_inventory_photos (part_id, picture_1_data, picture_2_data)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (part_id) DO UPDATE SET {', '.join(set_clauses)}
+            ''', (part_id, pic1_data, pic2_data))
+
+    def get_picture_blob(self, part_id, which):
+        """
+        Fetch one stored picture of a part
+
+        Args:
+            part_id: mro_inventory.id of the part
+            which: Picture number (1 or 2)
+
+        Returns:
+            bytes or None: Image data, or None if none is stored
+        """
+        column = {1: 'picture_1_data', 2: 'picture_2_data'}[which]
+        try:
+            with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+                cursor.execute(f'SELECT {column} FROM mro_inventory_photos WHERE part_id = %s',
+                               (part_id,))
+                row = cursor.fetchone()
+        except Exception as e:
+            print(f"Error loading picture {which} for part {part_id}: {e}")
+            return None
+        return bytes(row[0]) if row and row[0] is not None else None
+
+    @staticmethod
+    def _thumbnail_key(part_id, which, data):
+        """Thumbnail cache key for one stored picture"""
+        return (part_id, which, hashlib.blake2b(data, digest_size=8).digest())
+
+    def has_thumbnail(self, key):
+        """Whether a thumbnail for key is cached (lets the worker skip decoding)"""
+        return key in self._thumbnail_cache
+
+    def _picture_thumbnail(self, key, data, image=None):
+        """Return a 200px QPixmap thumbnail of picture data, decoding it only on a cache miss
+
+        Args:
+            key: Cache key from _thumbnail_key
+            data: Picture bytes
+            image: Already decoded and scaled QImage, if the worker thread made one
+        """
+        pixmap = self._thumbnail_cache.get(key)
+        if pixmap is not None:
+            self._thumbnail_cache.move_to_end(key)
+            return pixmap
+
+        # Qt decodes the bytes itself - no PIL RGBA copy of the full image
+        if image is None:
+            image = _scaled_thumbnail_image(data)
+        pixmap = QPixmap.fromImage(image)
+
+        self._thumbnail_cache[key] = pixmap
+        if len(self._thumbnail_cache) > self.THUMBNAIL_CACHE_SIZE:
+            self._thumbnail_cache.popitem(last=False)
+        return pixmap
+
+    def _build_picture_label(self, which, stored, path):
+        """
+        Build the part-details label for one picture
+
+        Args:
+            which: Picture number (1 or 2)
+            stored: Whether the picture is in the database (the label is then a
+                    placeholder the background loader fills in)
+            path: Legacy file path of the picture
+
+        Returns:
+            QLabel or None: Placeholder, picture or error label; None if there is no picture
+        """
+        if stored:
+            return QLabel(f"Loading picture {which}...")
+        if not path or not os.path.exists(path):
+            return None
+
+        label = QLabel()
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            self._set_picture_error(label, which)
+        else:
+            label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        return label
+
+    @staticmethod
+    def _set_picture_error(label, which):
+        """Turn a picture label into its error message"""
+        label.setText(f"Picture {which}: Error loading")
+        label.setStyleSheet("color: red;")
+
+    def _invalidate_thumbnails(self, part_id):
+        """Drop cached thumbnails of a part whose pictures changed"""
+        for key in [key for key in self._thumbnail_cache if key[0] == part_id]:
+            del self._thumbnail_cache[key]
+
     def browse_image(self, line_edit):
         """Browse for image file"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -598,16 +1122,11 @@ class MROStockManager:
         part_number = str(item.text(0)).strip()
 
         try:
-            # Get full part data - use explicit column list to ensure correct order
-            with db_pool.get_cursor(commit=False) as cursor:
-                cursor.execute('''
-                    SELECT id, name, part_number, model_number, equipment, engineering_system,
-                           unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                           supplier, location, rack, row, bin, picture_1_path,
-                           picture_2_path, picture_1_data, picture_2_data, notes,
-                           last_updated, created_date, status
-                    FROM mro_inventory WHERE part_number = %s
-                ''', (part_number,))
+            # Get full part data - explicit column list in _EDIT_COLUMNS order, fetched
+            # as a plain tuple
+            with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+                self._prepare_statements(cursor)
+                cursor.execute('EXECUTE mro_select_part (%s)', (part_number,))
                 part_data = cursor.fetchone()
 
                 if not part_data:
@@ -619,7 +1138,7 @@ class MROStockManager:
                     return
 
                 # Extract all data while cursor is still active
-                part_dict = dict(part_data)
+                part_dict = dict(zip(_EDIT_COLUMNS, part_data))
         except Exception as e:
             QMessageBox.critical(self.root, "Database Error",
                 f"Error loading part data: {str(e)}\n\n"
@@ -646,7 +1165,7 @@ class MROStockManager:
 
         # Basic Information
         basic_label = QLabel("BASIC INFORMATION")
-        font = QFont('Arial', 11, QFont.Bold)
+        font = _header_font()
         basic_label.setFont(font)
         scroll_layout.addWidget(basic_label, row, 0, 1, 2)
         row += 1
@@ -735,11 +1254,11 @@ class MROStockManager:
         fields['picture_2'] = QLineEdit()
 
         # Show current photo status
-        pic1_status = "Photo stored in database" if part_dict.get('picture_1_data') else "No photo"
+        pic1_status = "Photo stored in database" if part_dict.get('has_picture_1') else "No photo"
         scroll_layout.addWidget(QLabel("Picture 1:"), row, 0)
         pic1_layout = QHBoxLayout()
         pic1_status_label = QLabel(pic1_status)
-        pic1_status_label.setStyleSheet("color: green;" if part_dict.get('picture_1_data') else "color: gray;")
+        pic1_status_label.setStyleSheet("color: green;" if part_dict.get('has_picture_1') else "color: gray;")
         pic1_layout.addWidget(pic1_status_label)
         pic1_layout.addWidget(fields['picture_1'])
         pic1_browse_btn = QPushButton("Browse New")
@@ -750,11 +1269,11 @@ class MROStockManager:
         scroll_layout.addWidget(pic1_widget, row, 1)
         row += 1
 
-        pic2_status = "Photo stored in database" if part_dict.get('picture_2_data') else "No photo"
+        pic2_status = "Photo stored in database" if part_dict.get('has_picture_2') else "No photo"
         scroll_layout.addWidget(QLabel("Picture 2:"), row, 0)
         pic2_layout = QHBoxLayout()
         pic2_status_label = QLabel(pic2_status)
-        pic2_status_label.setStyleSheet("color: green;" if part_dict.get('picture_2_data') else "color: gray;")
+        pic2_status_label.setStyleSheet("color: green;" if part_dict.get('has_picture_2') else "color: gray;")
         pic2_layout.addWidget(pic2_status_label)
         pic2_layout.addWidget(fields['picture_2'])
         pic2_browse_btn = QPushButton("Browse New")
@@ -782,32 +1301,10 @@ class MROStockManager:
                 pic1_path = fields['picture_1'].text()
                 pic2_path = fields['picture_2'].text()
 
-                # Get existing photo data and paths from database first
-                with db_pool.get_cursor(commit=False) as cursor:
-                    cursor.execute('SELECT picture_1_path, picture_2_path, picture_1_data, picture_2_data FROM mro_inventory WHERE part_number = %s', (part_number,))
-                    existing_data = cursor.fetchone()
-                    existing_pic1_path = existing_data['picture_1_path'] if existing_data else None
-                    existing_pic2_path = existing_data['picture_2_path'] if existing_data else None
-                    existing_pic1_data = existing_data['picture_1_data'] if existing_data else None
-                    existing_pic2_data = existing_data['picture_2_data'] if existing_data else None
-
-                # Only read new photo data if a NEW file is selected
-                final_pic1_path = existing_pic1_path
-                final_pic2_path = existing_pic2_path
-                pic1_data = existing_pic1_data
-                pic2_data = existing_pic2_data
-
-                # Check if user selected a new file for picture 1
-                if pic1_path and os.path.exists(pic1_path):
-                    with open(pic1_path, 'rb') as f:
-                        pic1_data = f.read()
-                    final_pic1_path = pic1_path
-
-                # Check if user selected a new file for picture 2
-                if pic2_path and os.path.exists(pic2_path):
-                    with open(pic2_path, 'rb') as f:
-                        pic2_data = f.read()
-                    final_pic2_path = pic2_path
+                # Only files that exist replace a stored photo; otherwise the
+                # existing path (and photo row) is kept
+                new_pic1_path = pic1_path if pic1_path and os.path.exists(pic1_path) else None
+                new_pic2_path = pic2_path if pic2_path and os.path.exists(pic2_path) else None
 
                 notes_text = fields['notes'].toPlainText()
 
@@ -815,16 +1312,13 @@ class MROStockManager:
                 eng_system_value = fields['engineering_system'].currentText() if isinstance(fields['engineering_system'], QComboBox) else fields['engineering_system'].text()
                 status_value = fields['status'].currentText() if isinstance(fields['status'], QComboBox) else fields['status'].text()
 
+                # OPTIMIZED: single prepared UPDATE by primary key - no pre-SELECT,
+                # and the statement is planned once per pooled connection
                 with db_pool.get_cursor(commit=True) as cursor:
+                    self._prepare_statements(cursor)
                     cursor.execute('''
-                        UPDATE mro_inventory SET
-                            name = %s, model_number = %s, equipment = %s, engineering_system = %s,
-                            unit_of_measure = %s, quantity_in_stock = %s, unit_price = %s,
-                            minimum_stock = %s, supplier = %s, location = %s, rack = %s,
-                            row = %s, bin = %s, picture_1_path = %s, picture_2_path = %s,
-                            picture_1_data = %s, picture_2_data = %s,
-                            notes = %s, status = %s, last_updated = %s
-                        WHERE part_number = %s
+                        EXECUTE mro_update_part (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                                                 %s, %s, %s, %s, %s, %s, %s, %s)
                     ''', (
                         fields['name'].text(),
                         fields['model_number'].text(),
@@ -839,19 +1333,26 @@ class MROStockManager:
                         fields['rack'].text(),
                         fields['row'].text(),
                         fields['bin'].text(),
-                        final_pic1_path,
-                        final_pic2_path,
-                        pic1_data,
-                        pic2_data,
+                        new_pic1_path,
+                        new_pic2_path,
                         notes_text,
                         status_value,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        part_number
+                        part_dict['id']
                     ))
+                self._stats_dirty = True
+
+                try:
+                    self.save_part_pictures(part_dict['id'], new_pic1_path, new_pic2_path)
+                    if new_pic1_path or new_pic2_path:
+                        self._invalidate_thumbnails(part_dict['id'])
+                except Exception as e:
+                    QMessageBox.warning(dialog, "Warning",
+                                        f"Part updated, but its pictures could not be saved: {str(e)}")
 
                 QMessageBox.information(dialog, "Success", "Part updated successfully!")
                 dialog.accept()
-                self.refresh_mro_list()
+                self.refresh_mro_list(
+                    reload_locations=fields['location'].text() != (part_dict.get('location') or ''))
 
             except Exception as e:
                 QMessageBox.critical(dialog, "Error", f"Failed to update part: {str(e)}")
@@ -896,8 +1397,9 @@ class MROStockManager:
             try:
                 with db_pool.get_cursor(commit=True) as cursor:
                     cursor.execute('DELETE FROM mro_inventory WHERE part_number = %s', (part_number,))
+                self._stats_dirty = True
                 QMessageBox.information(self.root, "Success", "Part deleted successfully!")
-                self.refresh_mro_list()
+                self.refresh_mro_list(reload_locations=True)
             except Exception as e:
                 QMessageBox.critical(self.root, "Error", f"Failed to delete part: {str(e)}")
 
@@ -915,14 +1417,8 @@ class MROStockManager:
         try:
             # Get full part data
             with db_pool.get_cursor(commit=False) as cursor:
-                cursor.execute('''
-                    SELECT id, name, part_number, model_number, equipment, engineering_system,
-                           unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                           supplier, location, rack, row, bin, picture_1_path,
-                           picture_2_path, picture_1_data, picture_2_data, notes,
-                           last_updated, created_date, status
-                    FROM mro_inventory WHERE part_number = %s
-                ''', (part_number,))
+                self._prepare_statements(cursor)
+                cursor.execute('EXECUTE mro_select_part (%s)', (part_number,))
                 part_data = cursor.fetchone()
 
                 if not part_data:
@@ -1015,75 +1511,29 @@ class MROStockManager:
             scroll_layout.addWidget(notes_display, row, 1)
             row += 1
 
-        # Pictures section
+        # Pictures section - stored photos are fetched and decoded by the
+        # background loader; placeholders are filled in as they arrive
         row += 1
-        pic1_data = part_dict.get('picture_1_data')
-        pic2_data = part_dict.get('picture_2_data')
         pic1_path = part_dict.get('picture_1_path')
         pic2_path = part_dict.get('picture_2_path')
+        stored_pictures = [which for which in (1, 2) if part_dict.get(f'has_picture_{which}')]
+        picture_labels = {}
 
-        if pic1_data or pic2_data or pic1_path or pic2_path:
+        if stored_pictures or pic1_path or pic2_path:
             label_widget = QLabel("Pictures:")
             label_widget.setFont(QFont('Arial', 10, QFont.Bold))
             scroll_layout.addWidget(label_widget, row, 0, Qt.AlignTop)
 
             pic_layout = QHBoxLayout()
 
-            # Display Picture 1
-            if pic1_data:
-                try:
-                    img1 = Image.open(io.BytesIO(pic1_data))
-                    img1.thumbnail((200, 200))
-                    img1 = img1.convert("RGBA")
-                    data = img1.tobytes("raw", "RGBA")
-                    qimage = QImage(data, img1.size[0], img1.size[1], QImage.Format_RGBA8888)
-                    pixmap = QPixmap.fromImage(qimage)
-                    label1 = QLabel()
-                    label1.setPixmap(pixmap)
-                    pic_layout.addWidget(label1)
-                except Exception as e:
-                    error_label = QLabel("Picture 1: Error loading")
-                    error_label.setStyleSheet("color: red;")
-                    pic_layout.addWidget(error_label)
-            elif pic1_path and os.path.exists(pic1_path):
-                try:
-                    pixmap = QPixmap(pic1_path)
-                    pixmap = pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    label1 = QLabel()
-                    label1.setPixmap(pixmap)
-                    pic_layout.addWidget(label1)
-                except Exception as e:
-                    error_label = QLabel("Picture 1: Error loading")
-                    error_label.setStyleSheet("color: red;")
-                    pic_layout.addWidget(error_label)
-
-            # Display Picture 2
-            if pic2_data:
-                try:
-                    img2 = Image.open(io.BytesIO(pic2_data))
-                    img2.thumbnail((200, 200))
-                    img2 = img2.convert("RGBA")
-                    data = img2.tobytes("raw", "RGBA")
-                    qimage = QImage(data, img2.size[0], img2.size[1], QImage.Format_RGBA8888)
-                    pixmap = QPixmap.fromImage(qimage)
-                    label2 = QLabel()
-                    label2.setPixmap(pixmap)
-                    pic_layout.addWidget(label2)
-                except Exception as e:
-                    error_label = QLabel("Picture 2: Error loading")
-                    error_label.setStyleSheet("color: red;")
-                    pic_layout.addWidget(error_label)
-            elif pic2_path and os.path.exists(pic2_path):
-                try:
-                    pixmap = QPixmap(pic2_path)
-                    pixmap = pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    label2 = QLabel()
-                    label2.setPixmap(pixmap)
-                    pic_layout.addWidget(label2)
-                except Exception as e:
-                    error_label = QLabel("Picture 2: Error loading")
-                    error_label.setStyleSheet("color: red;")
-                    pic_layout.addWidget(error_label)
+            for which, path in ((1, pic1_path), (2, pic2_path)):
+                stored = which in stored_pictures
+                label = self._build_picture_label(which, stored, path)
+                if label is None:
+                    continue
+                if stored:
+                    picture_labels[which] = label
+                pic_layout.addWidget(label)
 
             pic_widget = QWidget()
             pic_widget.setLayout(pic_layout)
@@ -1095,18 +1545,11 @@ class MROStockManager:
         qty_stock = part_dict['quantity_in_stock']
         min_stock = part_dict['minimum_stock']
 
-        if qty_stock < min_stock:
-            status_text = "LOW STOCK - Reorder Recommended"
-            status_color = 'red'
-        elif qty_stock < min_stock * 1.5:
-            status_text = "Stock Getting Low"
-            status_color = 'orange'
-        else:
-            status_text = "Stock Level OK"
-            status_color = 'green'
+        status_idx = 0 if qty_stock < min_stock else 1 if qty_stock < min_stock * 1.5 else 2
+        status_text, status_color = _STOCK_STATUS[status_idx]
 
         status_label = QLabel(status_text)
-        status_label.setFont(QFont('Arial', 11, QFont.Bold))
+        status_label.setFont(_header_font())
         status_label.setStyleSheet(f"color: {status_color};")
         scroll_layout.addWidget(status_label, row, 0, 1, 2, Qt.AlignCenter)
 
@@ -1121,69 +1564,16 @@ class MROStockManager:
         history_layout = QVBoxLayout(history_widget)
 
         header_label = QLabel(f"Corrective Maintenance History for {part_number}")
-        header_label.setFont(QFont('Arial', 11, QFont.Bold))
+        header_label.setFont(_header_font())
         history_layout.addWidget(header_label)
 
-        try:
-            # Get CM usage data
-            with db_pool.get_cursor(commit=False) as cursor:
-                cursor.execute('''
-                    SELECT
-                        cp.cm_number,
-                        cm.description,
-                        cm.bfm_equipment_no,
-                        cp.quantity_used,
-                        cp.total_cost,
-                        cp.recorded_date,
-                        cp.recorded_by,
-                        cm.status,
-                        cp.notes
-                    FROM cm_parts_used cp
-                    LEFT JOIN corrective_maintenance cm ON cp.cm_number = cm.cm_number
-                    WHERE cp.part_number = %s
-                    ORDER BY cp.recorded_date DESC
-                    LIMIT 50
-                ''', (part_number,))
-
-                cm_history = cursor.fetchall()
-
-                # Statistics
-                stats_group = QGroupBox("Usage Statistics")
-                stats_layout = QVBoxLayout()
-
-                if cm_history:
-                    total_cms = len(cm_history)
-                    total_qty_used = sum(row['quantity_used'] for row in cm_history)
-                    total_cost = sum(row['total_cost'] or 0 for row in cm_history)
-
-                    stats_text = (f"Total CMs: {total_cms} | "
-                                f"Total Quantity Used: {total_qty_used:.2f} {part_dict['unit_of_measure']} | "
-                                f"Total Cost: ${total_cost:.2f}")
-                    stats_layout.addWidget(QLabel(stats_text))
-
-                    # Recent usage (last 30 days)
-                    cursor.execute('''
-                        SELECT SUM(quantity_used)
-                        FROM cm_parts_used
-                        WHERE part_number = %s
-                        AND recorded_date::timestamp >= CURRENT_DATE - INTERVAL '30 days'
-                    ''', (part_number,))
-
-                    recent_result = cursor.fetchone()
-                    recent_usage = recent_result['sum'] if recent_result and recent_result['sum'] else 0
-                    recent_label = QLabel(f"Usage Last 30 Days: {recent_usage:.2f} {part_dict['unit_of_measure']}")
-                    recent_label.setFont(QFont('Arial', 9, QFont.StyleItalic))
-                    stats_layout.addWidget(recent_label)
-                else:
-                    no_data_label = QLabel("No CM usage history available")
-                    no_data_label.setFont(QFont('Arial', 10, QFont.StyleItalic))
-                    stats_layout.addWidget(no_data_label)
-
-                stats_group.setLayout(stats_layout)
-                history_layout.addWidget(stats_group)
-        except Exception as e:
-            QMessageBox.critical(dialog, "Database Error", f"Error loading CM history: {str(e)}")
-            return
+        # Statistics (filled in by show_history)
+        stats_group = QGroupBox("Usage Statistics")
+        stats_layout = QVBoxLayout()
+        history_loading_label = QLabel("Loading CM usage history...")
+        stats_layout.addWidget(history_loading_label)
+        stats_group.setLayout(stats_layout)
+        history_layout.addWidget(stats_group)
 
         # History treeview
         history_tree = QTreeWidget()
@@ -1191,34 +1581,8 @@ class MROStockManager:
         history_tree.setColumnCount(len(columns))
         history_tree.setHeaderLabels(columns)
 
-        for row in cm_history:
-            desc = row['description']
-            if desc and len(desc) > 30:
-                desc = desc[:30] + '...'
-            else:
-                desc = desc or 'N/A'
-
-            notes = row['notes']
-            if notes and len(notes) > 20:
-                notes = notes[:20] + '...'
-            else:
-                notes = notes or ''
-
-            item = QTreeWidgetItem([
-                row['cm_number'],
-                desc,
-                row['bfm_equipment_no'] or 'N/A',
-                f"{row['quantity_used']:.2f}",
-                f"${row['total_cost']:.2f}" if row['total_cost'] else '$0.00',
-                row['recorded_date'][:10] if row['recorded_date'] else '',
-                row['recorded_by'] or 'N/A',
-                row['status'] or 'Unknown',
-                notes
-            ])
-            history_tree.addTopLevelItem(item)
-
         history_layout.addWidget(history_tree)
-        tab_widget.addTab(history_widget, "CM Usage History")
+        history_tab = tab_widget.addTab(history_widget, "CM Usage History")
 
         # ============================================================
         # TAB 3: Transaction History
@@ -1227,58 +1591,91 @@ class MROStockManager:
         trans_layout = QVBoxLayout(trans_widget)
 
         trans_header = QLabel(f"All Stock Transactions for {part_number}")
-        trans_header.setFont(QFont('Arial', 11, QFont.Bold))
+        trans_header.setFont(_header_font())
         trans_layout.addWidget(trans_header)
 
-        # Get all transactions
-        with db_pool.get_cursor(commit=False) as cursor:
-            cursor.execute('''
-                SELECT
-                    transaction_date,
-                    transaction_type,
-                    quantity,
-                    technician_name,
-                    work_order,
-                    notes
-                FROM mro_stock_transactions
-                WHERE part_number = %s
-                ORDER BY transaction_date DESC
-                LIMIT 100
-            ''', (part_number,))
-
-            transactions = cursor.fetchall()
+        # Transactions treeview (filled in by show_transactions)
+        trans_tree = QTreeWidget()
+        trans_columns = ['Date', 'Type', 'Quantity', 'Technician', 'Work Order', 'Notes']
+        trans_tree.setColumnCount(len(trans_columns))
+        trans_tree.setHeaderLabels(trans_columns)
 
-            # Transactions treeview
-            trans_tree = QTreeWidget()
-            trans_columns = ['Date', 'Type', 'Quantity', 'Technician', 'Work Order', 'Notes']
-            trans_tree.setColumnCount(len(trans_columns))
-            trans_tree.setHeaderLabels(trans_columns)
+        trans_layout.addWidget(trans_tree)
+        trans_tab = tab_widget.addTab(trans_widget, "All Transactions")
 
-            for row in transactions:
-                qty = row['quantity']
+        def show_picture(which, key, data, image):
+            label = picture_labels[which]
+            try:
+                if key is None:
+                    raise ValueError("No picture data")
+                label.setPixmap(self._picture_thumbnail(key, data, image))
+            except Exception:
+                self._set_picture_error(label, which)
+
+        def show_history(cm_history, recent_usage):
+            history_loading_label.hide()
+
+            if cm_history:
+                total_cms = len(cm_history)
+                total_qty_used = sum(row[3] for row in cm_history)
+                total_cost = sum(row[4] or 0 for row in cm_history)
+
+                stats_text = (f"Total CMs: {total_cms} | "
+                            f"Total Quantity Used: {total_qty_used:.2f} {part_dict['unit_of_measure']} | "
+                            f"Total Cost: ${total_cost:.2f}")
+                stats_layout.addWidget(QLabel(stats_text))
+
+                recent_label = QLabel(f"Usage Last 30 Days: {recent_usage:.2f} {part_dict['unit_of_measure']}")
+                recent_label.setFont(QFont('Arial', 9, QFont.StyleItalic))
+                stats_layout.addWidget(recent_label)
+            else:
+                no_data_label = QLabel("No CM usage history available")
+                no_data_label.setFont(QFont('Arial', 10, QFont.StyleItalic))
+                stats_layout.addWidget(no_data_label)
+
+            items = []
+            for (cm_number, description, bfm_equipment_no, quantity_used, total_cost,
+                 recorded_date, recorded_by, status, notes) in cm_history:
+                items.append(QTreeWidgetItem([
+                    cm_number,
+                    _truncate(description, 30, 'N/A'),
+                    bfm_equipment_no or 'N/A',
+                    f"{quantity_used:.2f}",
+                    f"${total_cost:.2f}" if total_cost else '$0.00',
+                    recorded_date[:10] if recorded_date else '',
+                    recorded_by or 'N/A',
+                    status or 'Unknown',
+                    _truncate(notes, 20)
+                ]))
+            _fill_tree(history_tree, items)
+
+        def show_transactions(transactions):
+            items = []
+            for (transaction_date, transaction_type, qty, technician_name,
+                 work_order, notes) in transactions:
                 qty_display = f"+{qty:.2f}" if qty > 0 else f"{qty:.2f}"
 
                 item = QTreeWidgetItem([
-                    row['transaction_date'][:19] if row['transaction_date'] else '',
-                    row['transaction_type'] or 'N/A',
+                    transaction_date[:19] if transaction_date else '',
+                    transaction_type or 'N/A',
                     qty_display,
-                    row['technician_name'] or 'N/A',
-                    row['work_order'] or 'N/A',
-                    row['notes'] or ''
+                    technician_name or 'N/A',
+                    work_order or 'N/A',
+                    notes or ''
                 ])
 
                 # Color code based on transaction type
-                if qty > 0:
-                    for i in range(item.columnCount()):
-                        item.setForeground(i, QColor('green'))
-                else:
-                    for i in range(item.columnCount()):
-                        item.setForeground(i, QColor('red'))
+                color = _INCOMING_COLOR if qty > 0 else _OUTGOING_COLOR
+                for i in range(len(trans_columns)):
+                    item.setForeground(i, color)
 
-                trans_tree.addTopLevelItem(item)
+                items.append(item)
+            _fill_tree(trans_tree, items)
 
-        trans_layout.addWidget(trans_tree)
-        tab_widget.addTab(trans_widget, "All Transactions")
+        def show_error(section, message):
+            if section == "CM history":
+                history_loading_label.setText("CM usage history could not be loaded")
+            QMessageBox.critical(dialog, "Database Error", f"Error loading {section}: {message}")
 
         # Add tab widget to main layout
         main_layout.addWidget(tab_widget)
@@ -1293,8 +1690,57 @@ class MROStockManager:
 
         main_layout.addLayout(button_layout)
 
+        # Work runs off the GUI thread while the dialog is already showing
+        active_signals = []
+
+        def start_fetch(**kwargs):
+            fetcher = _PartDetailsFetcher(self, part_dict['id'], part_number, **kwargs)
+            signals = fetcher.signals
+            signals.pictureReady.connect(show_picture)
+            signals.historyReady.connect(show_history)
+            signals.transactionsReady.connect(show_transactions)
+            signals.failed.connect(show_error)
+            active_signals.append(signals)
+            QThreadPool.globalInstance().start(fetcher)
+
+        # OPTIMIZED: CM history and transactions are only queried once one of
+        # their tabs is opened (a single query fills both)
+        def load_activity_tabs(index):
+            if index in (history_tab, trans_tab):
+                tab_widget.currentChanged.disconnect(load_activity_tabs)
+                start_fetch(load_activity=True)
+
+        tab_widget.currentChanged.connect(load_activity_tabs)
+        if stored_pictures:
+            start_fetch(pictures=stored_pictures)
+
         dialog.exec_()
 
+        # Results arriving after the dialog closed have no widgets to fill
+        for signals in active_signals:
+            signals.blockSignals(True)
+
+    def fetch_part_activity(self, part_number):
+        """
+        Load the CM usage history, 30-day usage and stock transactions shown
+        in the part details dialog with a single query
+
+        Args:
+            part_number: Part to load
+
+        Returns:
+            tuple: (latest 50 CM usage rows, quantity used in the last 30 days,
+                    latest 100 transaction rows); rows are lists in SELECT order
+        """
+        # OPTIMIZED: one round trip of a prepared statement - both row sets come
+        # back as JSON arrays of positional rows, so no per-row dict is built
+        with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+            self._prepare_statements(cursor)
+            cursor.execute('EXECUTE mro_part_activity (%s)', (part_number,))
+            history, recent_usage, transactions = cursor.fetchone()
+
+        cm_history = history or []
+        return cm_history, recent_usage if cm_history else 0, transactions or []
 
     def show_parts_usage_report(self):
         """Show comprehensive parts usage report"""
@@ -1311,25 +1757,24 @@ class MROStockManager:
 
         try:
             # Get summary data
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT
-                    mi.part_number,
-                    mi.name,
-                    SUM(cp.quantity_used) as total_qty,
-                    COUNT(DISTINCT cp.cm_number) as cm_count,
-                    SUM(cp.total_cost) as total_cost
-                FROM cm_parts_used cp
-                JOIN mro_inventory mi ON cp.part_number = mi.part_number
-                WHERE cp.recorded_date::timestamp >= CURRENT_DATE - INTERVAL '90 days'
-                GROUP BY mi.part_number, mi.name
-                ORDER BY total_cost DESC
-                LIMIT 50
-            ''')
+            with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+                cursor.execute('''
+                    SELECT
+                        mi.part_number,
+                        mi.name,
+                        SUM(cp.quantity_used) as total_qty,
+                        COUNT(DISTINCT cp.cm_number) as cm_count,
+                        SUM(cp.total_cost) as total_cost
+                    FROM cm_parts_used cp
+                    JOIN mro_inventory mi ON cp.part_number = mi.part_number
+                    WHERE cp.recorded_date >= TO_CHAR(CURRENT_DATE - INTERVAL '90 days', 'YYYY-MM-DD')
+                    GROUP BY mi.part_number, mi.name
+                    ORDER BY total_cost DESC
+                    LIMIT 50
+                ''')
 
-            usage_data = cursor.fetchall()
+                usage_data = cursor.fetchall()
         except Exception as e:
-            self.conn.rollback()
             QMessageBox.critical(dialog, "Database Error", f"Error loading usage report: {str(e)}")
             dialog.reject()
             return
@@ -1346,15 +1791,16 @@ class MROStockManager:
         tree.setColumnWidth(3, 100)
         tree.setColumnWidth(4, 120)
 
-        for row in usage_data:
-            item = QTreeWidgetItem([
+        _fill_tree(tree, [
+            QTreeWidgetItem([
                 row[0],
                 row[1],
-                f"{float(row[2]):.2f}",
+                f"{row[2]:.2f}",
                 str(row[3]),
-                f"${float(row[4]):.2f}"
+                f"${row[4] or 0:.2f}"
             ])
-            tree.addTopLevelItem(item)
+            for row in usage_data
+        ])
 
         main_layout.addWidget(tree)
 
@@ -1380,46 +1826,70 @@ class MROStockManager:
             imported_count = 0
             skipped_count = 0
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if file_path.endswith('.csv'):
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        try:
-                            self.import_part_from_dict(row)
-                            imported_count += 1
-                        except:
-                            skipped_count += 1
-                else:
-                    # Parse text file format
-                    QMessageBox.information(self.root, "Info",
-                                      "Please use CSV format for bulk import.\n\n"
-                                      "Required columns:\n"
-                                      "Name, Part Number, Model Number, Equipment, "
-                                      "Engineering System, Unit of Measure, Quantity in Stock, "
-                                      "Unit Price, Minimum Stock, Supplier, Location, Rack, Row, Bin")
-                    return
+            if file_path.endswith('.csv'):
+                rows, skipped_count = self._read_import_csv(file_path)
+
+                # OPTIMIZED: One multi-row INSERT per page instead of one per part;
+                # existing part numbers are skipped by ON CONFLICT
+                imported_count = self._bulk_insert_parts(rows)
+                skipped_count += len(rows) - imported_count
+            else:
+                # Parse text file format
+                QMessageBox.information(self.root, "Info",
+                                  "Please use CSV format for bulk import.\n\n"
+                                  "Required columns:\n"
+                                  "Name, Part Number, Model Number, Equipment, "
+                                  "Engineering System, Unit of Measure, Quantity in Stock, "
+                                  "Unit Price, Minimum Stock, Supplier, Location, Rack, Row, Bin")
+                return
 
-            self.conn.commit()
             QMessageBox.information(self.root, "Import Complete",
                               f"Successfully imported: {imported_count} parts\n"
                               f"Skipped (duplicates/errors): {skipped_count} parts")
-            self.refresh_mro_list()
+            self.refresh_mro_list(reload_locations=True)
 
         except Exception as e:
             QMessageBox.critical(self.root, "Import Error", f"Failed to import file:\n{str(e)}")
 
     def import_part_from_dict(self, data):
         """Import a single part from dictionary"""
-        cursor = self.conn.cursor()
+        self._bulk_insert_parts([self._part_row_from_dict(data)])
 
-        cursor.execute('''
-            INSERT INTO mro_inventory (
-                name, part_number, model_number, equipment, engineering_system,
-                unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                supplier, location, rack, row, bin
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (part_number) DO NOTHING
-        ''', (
+    @staticmethod
+    def _read_import_csv(file_path):
+        """
+        Parse an import CSV into mro_inventory INSERT rows
+
+        Missing columns and blank numbers default to '' / 0; records with
+        a non-numeric quantity, price or minimum are skipped.
+
+        Args:
+            file_path: CSV file with _IMPORT_HEADERS columns
+
+        Returns:
+            tuple: (rows in _IMPORT_COLUMNS order, number of records skipped)
+        """
+        try:
+            # OPTIMIZED: pandas parses and converts the numeric columns in C
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False, encoding='utf-8')
+        except pd.errors.EmptyDataError:
+            return [], 0
+
+        df = df.reindex(columns=list(_IMPORT_HEADERS)).fillna('')
+        invalid = pd.Series(False, index=df.index)
+        for header in _IMPORT_NUMERIC_HEADERS:
+            text = df[header].str.strip()
+            values = pd.to_numeric(text, errors='coerce')
+            invalid |= values.isna() & (text != '')
+            df[header] = values.fillna(0.0)
+
+        df = df[~invalid]
+        return list(df.itertuples(index=False, name=None)), int(invalid.sum())
+
+    @staticmethod
+    def _part_row_from_dict(data):
+        """Convert an import-file record to an mro_inventory INSERT row"""
+        return (
             data.get('Name', ''),
             data.get('Part Number', ''),
             data.get('Model Number', ''),
@@ -1434,7 +1904,61 @@ class MROStockManager:
             data.get('Rack', ''),
             data.get('Row', ''),
             data.get('Bin', '')
-        ))
+        )
+
+    def _bulk_insert_parts(self, rows, page_size=1000):
+        """
+        Insert many parts in bulk, skipping existing part numbers
+
+        Up to BULK_COPY_THRESHOLD rows go out as multi-row INSERTs; larger
+        imports are streamed with COPY into a temporary staging table and
+        merged with a single INSERT ... SELECT.
+
+        Args:
+            rows: Sequence of tuples as built by _part_row_from_dict
+            page_size: Rows sent per INSERT statement
+
+        Returns:
+            int: Number of parts actually inserted
+        """
+        if not rows:
+            return 0
+
+        self._stats_dirty = True
+        columns = ', '.join(_IMPORT_COLUMNS)
+        with db_pool.get_cursor(commit=True) as cursor:
+            if len(rows) < self.BULK_COPY_THRESHOLD:
+                inserted = execute_values(cursor, f'''
+                    INSERT INTO mro_inventory ({columns}) VALUES %s
+                    ON CONFLICT (part_number) DO NOTHING
+                    RETURNING part_number
+                ''', rows, page_size=page_size, fetch=True)
+                return len(inserted)
+
+            cursor.execute('''
+                CREATE TEMP TABLE mro_import_staging (
+                    name TEXT, part_number TEXT, model_number TEXT, equipment TEXT,
+                    engineering_system TEXT, unit_of_measure TEXT, quantity_in_stock REAL,
+                    unit_price REAL, minimum_stock REAL, supplier TEXT, location TEXT,
+                    rack TEXT, row TEXT, bin TEXT
+                ) ON COMMIT DROP
+            ''')
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            # FORCE_NOT_NULL keeps empty text fields as '' like the INSERT path
+            text_columns = ', '.join(column for column in _IMPORT_COLUMNS
+                                     if column not in ('quantity_in_stock', 'unit_price', 'minimum_stock'))
+            cursor.copy_expert(f'''
+                COPY mro_import_staging ({columns}) FROM STDIN
+                WITH (FORMAT csv, FORCE_NOT_NULL ({text_columns}))
+            ''', buffer)
+            cursor.execute(f'''
+                INSERT INTO mro_inventory ({columns})
+                SELECT {columns} FROM mro_import_staging
+                ON CONFLICT (part_number) DO NOTHING
+            ''')
+            return cursor.rowcount
 
     def export_to_csv(self):
         """Export inventory to CSV"""
@@ -1449,27 +1973,28 @@ class MROStockManager:
             return
 
         try:
-            cursor = self.conn.cursor()
-            # Select specific columns for export (exclude binary picture data)
-            cursor.execute('''
-                SELECT id, name, part_number, model_number, equipment, engineering_system,
-                       unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                       supplier, location, rack, row, bin, picture_1_path, picture_2_path,
-                       notes, last_updated, created_date, status
-                FROM mro_inventory ORDER BY part_number
-            ''')
-            rows = cursor.fetchall()
-
-            columns = ['ID', 'Name', 'Part Number', 'Model Number', 'Equipment',
-                      'Engineering System', 'Unit of Measure', 'Quantity in Stock',
-                      'Unit Price', 'Minimum Stock', 'Supplier', 'Location', 'Rack',
-                      'Row', 'Bin', 'Picture 1 Path', 'Picture 2 Path', 'Notes',
-                      'Last Updated', 'Created Date', 'Status']
-
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(columns)
-                writer.writerows(rows)
+            # Specific columns for export (no picture data), aliased to the CSV headers
+            columns = [('id', 'ID'), ('name', 'Name'), ('part_number', 'Part Number'),
+                       ('model_number', 'Model Number'), ('equipment', 'Equipment'),
+                       ('engineering_system', 'Engineering System'),
+                       ('unit_of_measure', 'Unit of Measure'),
+                       ('quantity_in_stock', 'Quantity in Stock'), ('unit_price', 'Unit Price'),
+                       ('minimum_stock', 'Minimum Stock'), ('supplier', 'Supplier'),
+                       ('location', 'Location'), ('rack', 'Rack'), ('row', 'Row'), ('bin', 'Bin'),
+                       ('picture_1_path', 'Picture 1 Path'), ('picture_2_path', 'Picture 2 Path'),
+                       ('notes', 'Notes'), ('last_updated', 'Last Updated'),
+                       ('created_date', 'Created Date'), ('status', 'Status')]
+            select_list = ', '.join(f'{column} AS "{header}"' for column, header in columns)
+
+            # OPTIMIZED: COPY streams the CSV straight from the server into the
+            # file instead of materializing every row in Python first; the 1 MiB
+            # buffer turns COPY's many small chunks into few large writes
+            with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor, \
+                    open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                cursor.copy_expert(f'''
+                    COPY (SELECT {select_list} FROM mro_inventory ORDER BY part_number)
+                    TO STDOUT WITH (FORMAT csv, HEADER)
+                ''', f)
 
             QMessageBox.information(self.root, "Success", f"Inventory exported to:\n{file_path}")
 
@@ -1491,8 +2016,6 @@ class MROStockManager:
         report_text.setFont(QFont('Courier', 10))
 
         # Generate report
-        cursor = self.conn.cursor()
-
         report = []
         report.append("=" * 80)
         report.append("MRO INVENTORY STOCK REPORT")
@@ -1500,156 +2023,185 @@ class MROStockManager:
         report.append("=" * 80)
         report.append("")
 
-        # Summary statistics
-        cursor.execute("SELECT COUNT(*) FROM mro_inventory WHERE status = 'Active'")
-        total_parts = cursor.fetchone()[0]
-
-        cursor.execute("SELECT SUM(quantity_in_stock * unit_price) FROM mro_inventory WHERE status = 'Active'")
-        total_value = cursor.fetchone()[0] or 0
-
-        cursor.execute('''
-            SELECT COUNT(*) FROM mro_inventory
-            WHERE quantity_in_stock < minimum_stock AND status = 'Active'
-        ''')
-        low_stock_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT SUM(quantity_in_stock) FROM mro_inventory WHERE status = 'Active'")
-        total_quantity = cursor.fetchone()[0] or 0
-
-        report.append("SUMMARY")
-        report.append("-" * 80)
-        report.append(f"Total Active Parts: {total_parts}")
-        report.append(f"Total Quantity in Stock: {total_quantity:,.1f}")
-        report.append(f"Total Inventory Value: ${total_value:,.2f}")
-        report.append(f"Low Stock Items: {low_stock_count}")
-        report.append("")
-
-        # Low stock items
-        if low_stock_count > 0:
-            report.append("LOW STOCK ALERTS")
-            report.append("-" * 80)
+        with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+            # Summary statistics - OPTIMIZED: one pass with conditional aggregates
             cursor.execute('''
-                SELECT part_number, name, quantity_in_stock, minimum_stock,
-                       unit_of_measure, location
+                SELECT
+                    COUNT(*),
+                    COALESCE(SUM(quantity_in_stock * unit_price), 0),
+                    COUNT(*) FILTER (WHERE quantity_in_stock < minimum_stock),
+                    COALESCE(SUM(quantity_in_stock), 0)
                 FROM mro_inventory
-                WHERE quantity_in_stock < minimum_stock AND status = 'Active'
-                ORDER BY (minimum_stock - quantity_in_stock) DESC
+                WHERE status = 'Active'
             ''')
+            total_parts, total_value, low_stock_count, total_quantity = cursor.fetchone()
 
-            for row in cursor.fetchall():
-                part_no, name, qty, min_qty, unit, loc = row
-                deficit = min_qty - qty
-                report.append(f"  Part: {part_no} - {name}")
-                report.append(f"  Current: {qty} {unit} | Minimum: {min_qty} {unit} | Deficit: {deficit} {unit}")
-                report.append(f"  Location: {loc}")
-                report.append("")
-
-        # Inventory by system
-        report.append("INVENTORY BY ENGINEERING SYSTEM")
-        report.append("-" * 80)
-        cursor.execute('''
-            SELECT engineering_system, COUNT(*), SUM(quantity_in_stock * unit_price)
-            FROM mro_inventory
-            WHERE status = 'Active'
-            GROUP BY engineering_system
-            ORDER BY engineering_system
-        ''')
-
-        for row in cursor.fetchall():
-            system, count, value = row
-            report.append(f"  {system or 'Unknown'}: {count} parts, ${value or 0:,.2f} value")
-
-        report.append("")
-
-        # CM Parts Usage by Month
-        report.append("CM PARTS USAGE - MONTHLY BREAKDOWN")
-        report.append("-" * 80)
+            report.append("SUMMARY")
+            report.append("-" * 80)
+            report.append(f"Total Active Parts: {total_parts}")
+            report.append(f"Total Quantity in Stock: {total_quantity:,.1f}")
+            report.append(f"Total Inventory Value: ${total_value:,.2f}")
+            report.append(f"Low Stock Items: {low_stock_count}")
+            report.append("")
 
-        try:
-            # Get monthly summary
+            # Low stock items
+            if low_stock_count > 0:
+                report.append("LOW STOCK ALERTS")
+                report.append("-" * 80)
+                # OPTIMIZED: server-side cursor on the same transaction - rows are
+                # formatted while the next batch is fetched, never all held at once
+                with cursor.connection.cursor(name='mro_report_low_stock') as low_cursor:
+                    low_cursor.itersize = 500
+                    low_cursor.execute('''
+                        SELECT part_number, name, quantity_in_stock, minimum_stock,
+                               unit_of_measure, location
+                        FROM mro_inventory
+                        WHERE quantity_in_stock < minimum_stock AND status = 'Active'
+                        ORDER BY (minimum_stock - quantity_in_stock) DESC
+                    ''')
+
+                    alert_format = _LOW_STOCK_ALERT_FORMAT.format
+                    for part_no, name, qty, min_qty, unit, loc in low_cursor:
+                        report.append(alert_format(part_no, name, qty, min_qty, unit, min_qty - qty, loc))
+
+            # Inventory by system
+            report.append("INVENTORY BY ENGINEERING SYSTEM")
+            report.append("-" * 80)
             cursor.execute('''
-                SELECT
-                    TO_CHAR(recorded_date::timestamp, 'YYYY-MM') as month,
-                    COUNT(DISTINCT cm_number) as cm_count,
-                    COUNT(*) as parts_entries,
-                    SUM(quantity_used) as total_quantity,
-                    SUM(total_cost) as total_cost
-                FROM cm_parts_used
-                GROUP BY TO_CHAR(recorded_date::timestamp, 'YYYY-MM')
-                ORDER BY month DESC
-                LIMIT 12
+                SELECT engineering_system, COUNT(*), SUM(quantity_in_stock * unit_price)
+                FROM mro_inventory
+                WHERE status = 'Active'
+                GROUP BY engineering_system
+                ORDER BY engineering_system
             ''')
 
-            monthly_data = cursor.fetchall()
-
-            if monthly_data:
-                report.append("")
-                report.append(f"{'Month':<12} {'CMs':<8} {'Parts':<10} {'Qty Used':<15} {'Total Cost':<15}")
-                report.append("-" * 80)
-
-                grand_total_cost = 0
-                for row in monthly_data:
-                    month = row[0]
-                    cm_count = row[1]
-                    parts_entries = row[2]
-                    total_qty = float(row[3]) if row[3] else 0
-                    total_cost = float(row[4]) if row[4] else 0
-                    grand_total_cost += total_cost
-
-                    report.append(f"{month:<12} {cm_count:<8} {parts_entries:<10} {total_qty:<15.1f} ${total_cost:<14,.2f}")
-
-                report.append("-" * 80)
-                report.append(f"{'Total Cost (Last 12 Months):':<60} ${grand_total_cost:,.2f}")
-            else:
-                report.append("  No CM parts usage data available")
+            row_format = _SYSTEM_ROW_FORMAT.format
+            report.extend(row_format(system or 'Unknown', count, value or 0)
+                          for system, count, value in cursor)
 
             report.append("")
 
-            # Top 10 most used parts
-            report.append("TOP 10 PARTS USED IN CMs (ALL TIME)")
+            # CM Parts Usage by Month
+            report.append("CM PARTS USAGE - MONTHLY BREAKDOWN")
             report.append("-" * 80)
 
-            cursor.execute('''
-                SELECT
-                    cpu.part_number,
-                    mi.name,
-                    COUNT(DISTINCT cpu.cm_number) as cm_count,
-                    SUM(cpu.quantity_used) as total_qty,
-                    SUM(cpu.total_cost) as total_cost
-                FROM cm_parts_used cpu
-                LEFT JOIN mro_inventory mi ON cpu.part_number = mi.part_number
-                GROUP BY cpu.part_number, mi.name
-                ORDER BY total_qty DESC
-                LIMIT 10
-            ''')
+            try:
+                # OPTIMIZED: monthly summary and top 10 parts in one round trip,
+                # told apart by the section column
+                cursor.execute('''
+                    -- Two-level GROUP BY instead of COUNT(DISTINCT cm_number): the
+                    -- inner per-CM aggregate can use parallel workers, the outer one
+                    -- just counts its rows
+                    WITH monthly_cm AS (
+                        SELECT
+                            LEFT(recorded_date, 7) as month,
+                            cm_number,
+                            COUNT(*) as parts_entries,
+                            SUM(quantity_used) as total_qty,
+                            SUM(total_cost) as total_cost
+                        FROM cm_parts_used
+                        GROUP BY LEFT(recorded_date, 7), cm_number
+                    ),
+                    monthly AS (
+                        SELECT
+                            month,
+                            COUNT(*) as cm_count,
+                            SUM(parts_entries) as parts_entries,
+                            SUM(total_qty) as total_qty,
+                            SUM(total_cost) as total_cost
+                        FROM monthly_cm
+                        GROUP BY month
+                        ORDER BY month DESC
+                        LIMIT 12
+                    ),
+                    -- Aggregate usage first so only the 10 winners are joined for names
+                    part_cm AS (
+                        SELECT
+                            part_number,
+                            cm_number,
+                            SUM(quantity_used) as total_qty,
+                            SUM(total_cost) as total_cost
+                        FROM cm_parts_used
+                        GROUP BY part_number, cm_number
+                    ),
+                    top_usage AS (
+                        SELECT
+                            part_number,
+                            COUNT(*) as cm_count,
+                            SUM(total_qty) as total_qty,
+                            SUM(total_cost) as total_cost
+                        FROM part_cm
+                        GROUP BY part_number
+                        ORDER BY total_qty DESC
+                        LIMIT 10
+                    ),
+                    top_parts AS (
+                        SELECT tu.part_number, mi.name, tu.cm_count, tu.total_qty, tu.total_cost
+                        FROM top_usage tu
+                        LEFT JOIN mro_inventory mi ON mi.part_number = tu.part_number
+                    )
+                    SELECT 'monthly' AS section, ROW_NUMBER() OVER (ORDER BY month DESC) AS rank,
+                           month, NULL AS name, cm_count, parts_entries,
+                           COALESCE(total_qty, 0), COALESCE(total_cost, 0)
+                    FROM monthly
+                    UNION ALL
+                    SELECT 'top', ROW_NUMBER() OVER (ORDER BY total_qty DESC),
+                           part_number, LEFT(COALESCE(name, 'N/A'), 28), cm_count, NULL,
+                           COALESCE(total_qty, 0), COALESCE(total_cost, 0)
+                    FROM top_parts
+                    ORDER BY section, rank
+                ''')
 
-            top_parts = cursor.fetchall()
+                # Rows are formatted as they are read and added to the report in one
+                # extend per section
+                monthly_format = _MONTHLY_ROW_FORMAT.format
+                top_format = _TOP_PART_ROW_FORMAT.format
+                monthly_rows = []
+                top_rows = []
+                grand_total_cost = 0
+                for section, _, key, name, cm_count, parts_entries, total_qty, total_cost in cursor:
+                    if section == 'monthly':
+                        monthly_rows.append(monthly_format(key, cm_count, parts_entries, total_qty, total_cost))
+                        grand_total_cost += total_cost
+                    else:
+                        top_rows.append(top_format(key, name, cm_count, total_qty, total_cost))
+
+                if monthly_rows:
+                    report.append("")
+                    report.append(f"{'Month':<12} {'CMs':<8} {'Parts':<10} {'Qty Used':<15} {'Total Cost':<15}")
+                    report.append("-" * 80)
+                    report.extend(monthly_rows)
+                    report.append("-" * 80)
+                    report.append(f"{'Total Cost (Last 12 Months):':<60} ${grand_total_cost:,.2f}")
+                else:
+                    report.append("  No CM parts usage data available")
 
-            if top_parts:
                 report.append("")
-                report.append(f"{'Part Number':<15} {'Description':<30} {'CMs':<8} {'Qty':<12} {'Cost':<15}")
-                report.append("-" * 80)
 
-                for row in top_parts:
-                    part_num = row[0]
-                    name = (row[1] or 'N/A')[:28]
-                    cm_count = row[2]
-                    qty = float(row[3]) if row[3] else 0
-                    cost = float(row[4]) if row[4] else 0
+                # Top 10 most used parts
+                report.append("TOP 10 PARTS USED IN CMs (ALL TIME)")
+                report.append("-" * 80)
 
-                    report.append(f"{part_num:<15} {name:<30} {cm_count:<8} {qty:<12.1f} ${cost:<14,.2f}")
-            else:
-                report.append("  No parts usage data available")
+                if top_rows:
+                    report.append("")
+                    report.append(f"{'Part Number':<15} {'Description':<30} {'CMs':<8} {'Qty':<12} {'Cost':<15}")
+                    report.append("-" * 80)
+                    report.extend(top_rows)
+                else:
+                    report.append("  No parts usage data available")
 
-        except Exception as e:
-            report.append(f"  Error loading CM parts data: {str(e)}")
+            except Exception as e:
+                cursor.connection.rollback()
+                report.append(f"  Error loading CM parts data: {str(e)}")
 
         report.append("")
         report.append("=" * 80)
         report.append("END OF REPORT")
         report.append("=" * 80)
 
-        report_text.setPlainText('\n'.join(report))
+        # Joined once; the export below writes the same text
+        report_content = '\n'.join(report)
+        report_text.setPlainText(report_content)
         main_layout.addWidget(report_text)
 
         # Export button
@@ -1662,7 +2214,7 @@ class MROStockManager:
             )
             if file_path:
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(report))
+                    f.write(report_content)
                 QMessageBox.information(dialog, "Success", f"Report exported to:\n{file_path}")
 
         export_btn = QPushButton("Export Report")
@@ -1673,16 +2225,16 @@ class MROStockManager:
 
     def show_low_stock(self):
         """Show low stock alert dialog"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT part_number, name, quantity_in_stock, minimum_stock,
-                   unit_of_measure, location, supplier
-            FROM mro_inventory
-            WHERE quantity_in_stock < minimum_stock AND status = 'Active'
-            ORDER BY (minimum_stock - quantity_in_stock) DESC
-        ''')
+        with db_pool.get_cursor(commit=False, cursor_factory=None) as cursor:
+            cursor.execute('''
+                SELECT part_number, name, quantity_in_stock, minimum_stock,
+                       unit_of_measure, location, supplier
+                FROM mro_inventory
+                WHERE quantity_in_stock < minimum_stock AND status = 'Active'
+                ORDER BY (minimum_stock - quantity_in_stock) DESC
+            ''')
 
-        low_stock_items = cursor.fetchall()
+            low_stock_items = cursor.fetchall()
 
         if not low_stock_items:
             QMessageBox.information(self.root, "Stock Status", "All items are adequately stocked!")
@@ -1712,14 +2264,15 @@ class MROStockManager:
             tree.setColumnWidth(col_idx, 120)
 
         # Populate tree
+        tree_items = []
         for item in low_stock_items:
             part_no, name, current, minimum, unit, location, supplier = item
             deficit = minimum - current
-            tree_item = QTreeWidgetItem([
+            tree_items.append(QTreeWidgetItem([
                 part_no, name, f"{current:.1f}", f"{minimum:.1f}",
                 f"{deficit:.1f}", unit, location or 'N/A', supplier or 'N/A'
-            ])
-            tree.addTopLevelItem(tree_item)
+            ]))
+        _fill_tree(tree, tree_items)
 
         main_layout.addWidget(tree)
 
@@ -1729,117 +2282,247 @@ class MROStockManager:
 
         dialog.exec_()
 
-    def refresh_mro_list(self):
-        """Refresh MRO inventory list"""
+    def refresh_mro_list(self, reload_locations=False, reload_stats=False):
+        """Refresh MRO inventory list
+
+        Args:
+            reload_locations: Re-query the Location filter options instead of
+                using the cached list (after parts are added, edited or deleted)
+            reload_stats: Re-query the statistics even if no inventory change
+                was recorded (changes made outside this manager)
+        """
+        if reload_locations:
+            self._location_cache = None
+        if reload_stats:
+            self._stats_dirty = True
         self.update_location_filter()
         self.filter_mro_list()
         self.update_mro_statistics()
 
     def filter_mro_list(self, *args):
         """Filter MRO list based on search and filters - OPTIMIZED"""
-        search_term = self.mro_search_entry.text().lower()
+        search_term = self.mro_search_entry.text()
         system_filter = self.mro_system_filter.currentText()
         status_filter = self.mro_status_filter.currentText()
         location_filter = self.mro_location_filter.currentText()
 
-        # Clear existing items
-        self.mro_tree.clear()
-
-        # OPTIMIZED: Only select columns needed for display
-        query = '''SELECT part_number, name, model_number, equipment, engineering_system,
-                          unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
-                          location, status
-                   FROM mro_inventory WHERE 1=1'''
-        params = []
-
-        # OPTIMIZED: Use LOWER() which now has functional indexes
+        # Unused filters are passed as NULL and drop out of mro_filter's WHERE
+        system_param = None
         if system_filter != 'All':
-            query += ' AND LOWER(engineering_system) = LOWER(%s)'
-            params.append(system_filter)
+            system_param = self._ci_equals('engineering_system', system_filter)[1]
 
-        if status_filter == 'Low Stock':
-            query += ' AND quantity_in_stock < minimum_stock'
-        elif status_filter != 'All':
-            query += ' AND LOWER(status) = LOWER(%s)'
-            params.append(status_filter)
-
-        # Location filter
+        location_param = None
         if location_filter != 'All':
-            query += ' AND LOWER(location) = LOWER(%s)'
-            params.append(location_filter)
-
-        if search_term:
-            query += ''' AND (
-                LOWER(name) LIKE %s OR
-                LOWER(part_number) LIKE %s OR
-                LOWER(model_number) LIKE %s OR
-                LOWER(equipment) LIKE %s OR
-                LOWER(location) LIKE %s
-            )'''
-            search_param = f'%{search_term}%'
-            params.extend([search_param] * 5)
-
-        query += ' ORDER BY part_number'
+            location_param = self._ci_equals('location', location_filter)[1]
+
+        low_stock = status_filter == 'Low Stock'
+        status_param = status_filter if status_filter not in ('All', 'Low Stock') else None
+        search_param = like_pattern(search_term) if search_term else None
+
+        # OPTIMIZED: Keyset pagination - only the first page is fetched and turned
+        # into tree items now; _on_mro_scroll loads the rest on demand
+        self._filter_search_term = search_term
+        self._filter_params = (system_param, status_param, low_stock, location_param, search_param)
+        self._filter_last_part = None
+        self._filter_done = False
+
+        self._load_mro_page(reset=True)
+
+    def _apply_search(self):
+        """Debounced search box handler: re-filter only if the text actually changed"""
+        # Typing and then deleting back to the same text (or only pausing)
+        # would otherwise repeat the query for an unchanged list
+        if self.mro_search_entry.text() != self._filter_search_term:
+            self.filter_mro_list()
+
+    def _filter_statement(self):
+        """PREPARE text for the inventory list query, one page after a given part number"""
+        system_predicate = self._ci_equals('engineering_system', '', '$1')[0]
+        location_predicate = self._ci_equals('location', '', '$4')[0]
+        # Parameters: $1 system, $2 status, $3 low stock only, $4 location,
+        # $5 search pattern, $6 last part number loaded, $7 page size. Each
+        # column comparison comes before its IS NULL test so the parameter takes
+        # the column's type (CITEXT where migrated)
+        return f'''
+            PREPARE mro_filter AS
+            SELECT part_number, name, model_number, equipment, engineering_system,
+                   unit_of_measure, quantity_in_stock, unit_price, minimum_stock,
+                   location, quantity_in_stock < minimum_stock AS is_low_stock,
+                   CASE WHEN quantity_in_stock < minimum_stock THEN 'LOW' ELSE status END
+                       AS display_status
+            FROM mro_inventory
+            WHERE ({system_predicate} OR $1 IS NULL)
+            AND (status = $2 OR $2 IS NULL)
+            AND (NOT $3 OR (quantity_in_stock < minimum_stock AND status = 'Active'))
+            AND ({location_predicate} OR $4 IS NULL)
+            AND (name ILIKE $5 OR
+                 part_number ILIKE $5 OR
+                 model_number::text ILIKE $5 OR
+                 equipment::text ILIKE $5 OR
+                 location::text ILIKE $5 OR
+                 $5 IS NULL)
+            AND (part_number > $6 OR $6 IS NULL)
+            ORDER BY part_number
+            LIMIT $7
+        '''
+
+    def _load_mro_page(self, reset=False):
+        """
+        Merge the next TREE_PAGE_SIZE rows of the current filter into the MRO tree
+
+        Args:
+            reset: Load the first page of a new filter; items no longer in it
+                are removed, and ones still in it are updated in place
+        """
+        if self._filter_done:
+            return
 
+        # OPTIMIZED: one prepared statement for every filter combination, so
+        # typing in the search box re-binds parameters instead of re-parsing SQL.
+        # PostgreSQL still plans with the actual values (NULL filters fold away)
         with db_pool.get_cursor(commit=False) as cursor:
-            cursor.execute(query, params)
-
-            for idx, row in enumerate(cursor.fetchall()):
-                part_number = row['part_number']
-                name = row['name']
-                model_number = row['model_number']
-                equipment = row['equipment']
-                engineering_system = row['engineering_system']
-                unit_of_measure = row['unit_of_measure']
-                qty = float(row['quantity_in_stock'])
-                unit_price = float(row['unit_price'])
-                min_stock = float(row['minimum_stock'])
-                location = row['location']
-                status = row['status']
-
-                # Determine display status
-                display_status = 'LOW' if qty < min_stock else status
-
-                item = QTreeWidgetItem([
-                    part_number,
-                    name,
-                    model_number or '',
-                    equipment or '',
-                    engineering_system or '',
-                    f"{qty:.1f}",
-                    f"{min_stock:.1f}",
-                    unit_of_measure or '',
-                    f"${unit_price:.2f}",
-                    location or '',
-                    display_status
-                ])
-
-                # Color low stock items
-                if qty < min_stock:
-                    for col_idx in range(item.columnCount()):
-                        item.setBackground(col_idx, QColor(255, 204, 204))
-
-                self.mro_tree.addTopLevelItem(item)
-
-                # Process events to keep UI responsive
-                if idx % 50 == 0:
-                    QApplication.processEvents()
+            self._prepare_statements(cursor)
+            cursor.execute('EXECUTE mro_filter (%s, %s, %s, %s, %s, %s, %s)',
+                           (*self._filter_params, self._filter_last_part, self.TREE_PAGE_SIZE))
+            rows = cursor.fetchall()
+        done = len(rows) < self.TREE_PAGE_SIZE
 
-    def update_location_filter(self):
-        """Update location filter dropdown with unique locations from database"""
+        # OPTIMIZED: Apply the result as a diff - parts that stay in the list keep
+        # their items, so a refinement only touches the rows that changed
+        tree = self.mro_tree
+        tree.setUpdatesEnabled(False)
+        tree.setSortingEnabled(False)
         try:
+            if reset:
+                keys = {row['part_number'] for row in rows}
+                stale = [key for key in self._mro_items if key not in keys]
+                if len(stale) > len(self._mro_items) // 2:
+                    # Mostly different rows - clearing beats removing them one by one
+                    tree.clear()
+                    self._mro_items = {}
+                else:
+                    root = tree.invisibleRootItem()
+                    for key in stale:
+                        root.removeChild(self._mro_items.pop(key))
+
+            items = []
+            column_count = tree.columnCount()
+            for row in rows:
+                # REAL columns already arrive as Python floats
+                texts = [
+                    row['part_number'],
+                    row['name'],
+                    row['model_number'] or '',
+                    row['equipment'] or '',
+                    row['engineering_system'] or '',
+                    f"{row['quantity_in_stock']:.1f}",
+                    f"{row['minimum_stock']:.1f}",
+                    row['unit_of_measure'] or '',
+                    f"${row['unit_price']:.2f}",
+                    row['location'] or '',
+                    row['display_status']
+                ]
+
+                item = self._mro_items.get(row['part_number'])
+                if item is None:
+                    item = QTreeWidgetItem(texts)
+                    self._mro_items[row['part_number']] = item
+                    items.append(item)
+                    # Color low stock items
+                    if row['is_low_stock']:
+                        for col_idx in range(column_count):
+                            item.setBackground(col_idx, _LOW_STOCK_BRUSH)
+                    continue
+
+                was_low = item.background(0).style() != Qt.NoBrush
+                for col_idx, text in enumerate(texts):
+                    if item.text(col_idx) != text:
+                        item.setText(col_idx, text)
+                if bool(row['is_low_stock']) != was_low:
+                    brush = _LOW_STOCK_BRUSH if row['is_low_stock'] else QBrush()
+                    for col_idx in range(column_count):
+                        item.setBackground(col_idx, brush)
+
+            self._add_mro_items(items)
+            if reset and not done:
+                # Items kept from the previous filter may be in a header-sorted order;
+                # later pages are appended, so put this page back in part-number order
+                tree.sortItems(0, Qt.AscendingOrder)
+        finally:
+            # A header sort would only order the pages loaded so far, so the header
+            # is clickable only once the whole filter result is in the tree
+            tree.setSortingEnabled(done)
+            tree.setUpdatesEnabled(True)
+
+        if rows:
+            # part_number is unique, so the key of the last loaded row marks the page
+            self._filter_last_part = rows[-1]['part_number']
+        self._filter_done = done
+
+    def _on_mro_scroll(self, value):
+        """Load the next inventory page once the list is scrolled near its end"""
+        scroll_bar = self.mro_tree.verticalScrollBar()
+        if not self._filter_done and value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            try:
+                self._load_mro_page()
+            except Exception as e:
+                print(f"Error loading more MRO parts: {e}")
+
+    def _add_mro_items(self, items):
+        """Add a batch of items to the MRO tree with painting suspended"""
+        _fill_tree(self.mro_tree, items)
+
+    def _ci_equals(self, column, value, placeholder='%s'):
+        """
+        Case-insensitive equality filter on column
+
+        Returns:
+            tuple: (SQL predicate comparing to placeholder, parameter for it)
+        """
+        if column in self.citext_columns:
+            return f'{column} = {placeholder}', value
+        # Lower-case the parameter once here rather than per row in SQL
+        return f'LOWER({column}) = {placeholder}', value.lower()
+
+    def _load_location_options(self):
+        """Return the distinct inventory locations, querying only when not cached"""
+        if self._location_cache is None:
             with db_pool.get_cursor(commit=False) as cursor:
+                # OPTIMIZED: loose index scan - each step seeks idx_mro_location for
+                # the next larger value, reading one entry per distinct location
+                # instead of scanning and sorting the whole table. Rows come out
+                # in ascending order by construction
                 cursor.execute('''
-                    SELECT DISTINCT location
-                    FROM mro_inventory
-                    WHERE location IS NOT NULL AND location != ''
-                    ORDER BY location
+                    WITH RECURSIVE locations AS (
+                        SELECT MIN(location) AS location
+                        FROM mro_inventory
+                        WHERE location > ''
+                        UNION ALL
+                        SELECT (SELECT MIN(m.location) FROM mro_inventory m
+                                WHERE m.location > l.location)
+                        FROM locations l
+                        WHERE l.location IS NOT NULL
+                    )
+                    SELECT location FROM locations WHERE location IS NOT NULL
                 ''')
+                self._location_cache = [row['location'] for row in cursor.fetchall()]
+        return self._location_cache
+
+    def update_location_filter(self):
+        """Update location filter dropdown with unique locations from database"""
+        try:
+            locations = ['All'] + self._load_location_options()
 
-                locations = ['All'] + [row['location'] for row in cursor.fetchall()]
+            current_items = [self.mro_location_filter.itemText(i)
+                             for i in range(self.mro_location_filter.count())]
+            if current_items == locations:
+                return
 
-                # Update combobox values
-                current_value = self.mro_location_filter.currentText()
+            # Update combobox values without firing filter_mro_list for each
+            # intermediate selection (the caller filters afterwards)
+            current_value = self.mro_location_filter.currentText()
+            self.mro_location_filter.blockSignals(True)
+            try:
                 self.mro_location_filter.clear()
                 self.mro_location_filter.addItems(locations)
 
@@ -1848,11 +2531,23 @@ class MROStockManager:
                     self.mro_location_filter.setCurrentText(current_value)
                 else:
                     self.mro_location_filter.setCurrentText('All')
+            finally:
+                self.mro_location_filter.blockSignals(False)
         except Exception as e:
             print(f"Error updating location filter: {e}")
 
+    def invalidate_statistics(self):
+        """Re-query the statistics on their next update (stock changed outside this manager)"""
+        self._stats_dirty = True
+
     def update_mro_statistics(self):
         """Update inventory statistics - OPTIMIZED"""
+        # OPTIMIZED: the totals only change with mro_inventory, so reuse them
+        # until a part is added, edited, deleted or imported
+        if not self._stats_dirty and self._stats_cache is not None:
+            self.mro_stats_label.setText(self._stats_cache)
+            return
+
         with db_pool.get_cursor(commit=False) as cursor:
             # OPTIMIZED: Combined query
             cursor.execute('''
@@ -1873,75 +2568,84 @@ class MROStockManager:
                          f"Total Value: ${value:,.2f} | "
                          f"Low Stock Items: {low_stock}")
 
-            self.mro_stats_label.setText(stats_text)
+        self._stats_cache = stats_text
+        self._stats_dirty = False
+        self.mro_stats_label.setText(stats_text)
 
     def sort_mro_column(self, col):
         """Sort MRO treeview by column"""
-        # Sorting is handled automatically by QTreeWidget.setSortingEnabled(True)
+        # Sorting is handled by QTreeWidget once the whole filter result is loaded
         pass
 
+    def _read_part_pictures(self, part):
+        """
+        Read both pictures of a part for migrate_photos_to_database (runs on a worker thread)
+
+        Args:
+            part: (id, part_number, picture_1_path, picture_2_path) row
+
+        Returns:
+            tuple: (part id, picture 1 data, picture 2 data, number of read errors)
+        """
+        part_id, part_number, pic1_path, pic2_path = part
+        pictures = []
+        errors = 0
+        for path in (pic1_path, pic2_path):
+            data = None
+            try:
+                data = self.read_picture(path)
+            except Exception as e:
+                errors += 1
+                print(f"Error reading {path} for {part_number}: {e}")
+            pictures.append(data)
+        return part_id, pictures[0], pictures[1], errors
+
     def migrate_photos_to_database(self):
         """Migrate existing photos from file paths to database binary storage"""
         try:
-            cursor = self.conn.cursor()
-
-            # Get all parts with photo paths but no binary data
-            cursor.execute('''
-                SELECT part_number, picture_1_path, picture_2_path
-                FROM mro_inventory
-                WHERE (picture_1_path IS NOT NULL AND picture_1_path != '' AND picture_1_data IS NULL)
-                   OR (picture_2_path IS NOT NULL AND picture_2_path != '' AND picture_2_data IS NULL)
-            ''')
+            with db_pool.get_cursor(commit=True, cursor_factory=None) as cursor:
+                # Get all parts with photo paths but no binary data
+                cursor.execute('''
+                    SELECT m.id, m.part_number, m.picture_1_path, m.picture_2_path
+                    FROM mro_inventory m
+                    LEFT JOIN mro_inventory_photos p ON p.part_id = m.id
+                    WHERE (m.picture_1_path IS NOT NULL AND m.picture_1_path != '' AND p.picture_1_data IS NULL)
+                       OR (m.picture_2_path IS NOT NULL AND m.picture_2_path != '' AND p.picture_2_data IS NULL)
+                ''')
 
-            parts_to_migrate = cursor.fetchall()
+                parts_to_migrate = cursor.fetchall()
 
-            if not parts_to_migrate:
-                QMessageBox.information(self.root, "Migration Complete", "No photos need migration. All photos are already in the database!")
-                return
-
-            migrated_count = 0
-            skipped_count = 0
-            error_count = 0
-
-            for part_number, pic1_path, pic2_path in parts_to_migrate:
-                pic1_data = None
-                pic2_data = None
-
-                # Try to read picture 1
-                if pic1_path and os.path.exists(pic1_path):
-                    try:
-                        with open(pic1_path, 'rb') as f:
-                            pic1_data = f.read()
-                    except Exception as e:
-                        error_count += 1
-                        print(f"Error reading {pic1_path}: {e}")
-
-                # Try to read picture 2
-                if pic2_path and os.path.exists(pic2_path):
-                    try:
-                        with open(pic2_path, 'rb') as f:
-                            pic2_data = f.read()
-                    except Exception as e:
-                        error_count += 1
-                        print(f"Error reading {pic2_path}: {e}")
-
-                # Update database with binary data
-                if pic1_data or pic2_data:
-                    try:
-                        cursor.execute('''
-                            UPDATE mro_inventory
-                            SET picture_1_data = COALESCE(picture_1_data, %s),
-                                picture_2_data = COALESCE(picture_2_data, %s)
-                            WHERE part_number = %s
-                        ''', (pic1_data, pic2_data, part_number))
-                        migrated_count += 1
-                    except Exception as e:
-                        error_count += 1
-                        print(f"Error updating database for {part_number}: {e}")
-                else:
-                    skipped_count += 1
+                if not parts_to_migrate:
+                    QMessageBox.information(self.root, "Migration Complete", "No photos need migration. All photos are already in the database!")
+                    return
 
-            self.conn.commit()
+                migrated_count = 0
+                skipped_count = 0
+                error_count = 0
+
+                # OPTIMIZED: files are read/downscaled on a thread pool, and each
+                # batch of parts is written with one multi-row upsert
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    for start in range(0, len(parts_to_migrate), self.PHOTO_MIGRATION_BATCH):
+                        batch = parts_to_migrate[start:start + self.PHOTO_MIGRATION_BATCH]
+                        rows = []
+                        for part_id, pic1_data, pic2_data, errors in executor.map(
+                                self._read_part_pictures, batch):
+                            error_count += errors
+                            if pic1_data or pic2_data:
+                                rows.append((part_id, pic1_data, pic2_data))
+                            else:
+                                skipped_count += 1
+
+                        if rows:
+                            execute_values(cursor, '''
+                                INSERT INTO mro_inventory_photos (part_id, picture_1_data, picture_2_data)
+                                VALUES %s
+                                ON CONFLICT (part_id) DO UPDATE SET
+                                    picture_1_data = COALESCE(mro_inventory_photos.picture_1_data, EXCLUDED.picture_1_data),
+                                    picture_2_data = COALESCE(mro_inventory_photos.picture_2_data, EXCLUDED.picture_2_data)
+                            ''', rows, page_size=len(rows))
+                            migrated_count += len(rows)
 
             QMessageBox.information(
                 self.root,
@@ -1953,7 +2657,6 @@ class MROStockManager:
             )
 
         except Exception as e:
-            self.conn.rollback()
             QMessageBox.critical(self.root, "Migration Error", f"Failed to migrate photos:\n{str(e)}")
 
 
@@ -3,13 +3,56 @@ Password Change Interface for All Users
 Allows users to change their own passwords
 """
 
+import hmac
 from PyQt5.QtWidgets import (QDialog, QLabel, QLineEdit, QPushButton, QFrame,
                              QVBoxLayout, QHBoxLayout, QGridLayout, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QFont
 from database_utils import db_pool, UserManager, AuditLogger
 
 
+class _PasswordChangeWorker(QRunnable):
+    """Verifies and stores the new password on a worker thread"""
+
+    class Signals(QObject):
+        # success, message from UserManager.change_password
+        finished = pyqtSignal(bool, str)
+        # database error message
+        failed = pyqtSignal(str)
+
+    def __init__(self, current_user, username, current_password, new_password):
+        super().__init__()
+        self.current_user = current_user
+        self.username = username
+        self.current_password = current_password
+        self.new_password = new_password
+        # Created here, on the GUI thread, so emits from run() are queued to it
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            with db_pool.get_cursor(commit=True) as cursor:
+                success, message = UserManager.change_password(
+                    cursor, self.username, self.current_password, self.new_password
+                )
+
+                if success:
+                    # Log the password change to audit log
+                    AuditLogger.log(
+                        cursor,
+                        self.current_user,
+                        'UPDATE',
+                        'users',
+                        self.username,
+                        notes="User changed their own password"
+                    )
+        except Exception as e:
+            print(f"Password change error: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(success, message)
+
+
 class PasswordChangeDialog(QDialog):
     """Dialog for users to change their own password"""
 
@@ -123,9 +166,9 @@ class PasswordChangeDialog(QDialog):
         button_layout.setSpacing(5)
         button_frame.setLayout(button_layout)
 
-        change_btn = QPushButton("Change Password")
-        change_btn.clicked.connect(self.change_password)
-        button_layout.addWidget(change_btn)
+        self.change_btn = QPushButton("Change Password")
+        self.change_btn.clicked.connect(self.change_password)
+        button_layout.addWidget(self.change_btn)
 
         cancel_btn = QPushButton("Cancel")
         cancel_btn.clicked.connect(self.close)
@@ -149,9 +192,16 @@ class PasswordChangeDialog(QDialog):
 
     def change_password(self):
         """Handle password change"""
+        if not self.change_btn.isEnabled():
+            # A change is already in progress
+            return
+
         current_password = self.current_password_entry.text().strip()
         new_password = self.new_password_entry.text().strip()
         confirm_password = self.confirm_password_entry.text().strip()
+        # Encoded once for the constant-time comparisons below
+        # (compare_digest only accepts ASCII str)
+        new_password_bytes = new_password.encode()
 
         # Validate inputs
         if not current_password:
@@ -169,49 +219,44 @@ class PasswordChangeDialog(QDialog):
             self.new_password_entry.setFocus()
             return
 
-        if new_password != confirm_password:
+        if not hmac.compare_digest(new_password_bytes, confirm_password.encode()):
             QMessageBox.critical(self, "Validation Error", "New passwords do not match")
             self.confirm_password_entry.clear()
             self.confirm_password_entry.setFocus()
             return
 
-        if current_password == new_password:
+        if hmac.compare_digest(current_password.encode(), new_password_bytes):
             QMessageBox.warning(self, "Validation Warning",
                                "New password must be different from current password")
             self.new_password_entry.setFocus()
             return
 
-        # Attempt to change password
-        try:
-            with db_pool.get_cursor(commit=True) as cursor:
-                success, message = UserManager.change_password(
-                    cursor, self.username, current_password, new_password
-                )
-
-                if success:
-                    # Log the password change to audit log
-                    AuditLogger.log(
-                        cursor,
-                        self.current_user,
-                        'UPDATE',
-                        'users',
-                        self.username,
-                        notes="User changed their own password"
-                    )
-
-                    QMessageBox.information(self, "Success", message)
-                    self.close()
-                else:
-                    QMessageBox.critical(self, "Error", message)
-                    # Clear password fields if current password was wrong
-                    if "incorrect" in message.lower():
-                        self.current_password_entry.clear()
-                        self.current_password_entry.setFocus()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Database Error",
-                               f"Failed to change password: {str(e)}")
-            print(f"Password change error: {e}")
+        # OPTIMIZED: hash and update off the GUI thread so the dialog stays responsive
+        self.change_btn.setEnabled(False)
+        worker = _PasswordChangeWorker(self.current_user, self.username,
+                                       current_password, new_password)
+        worker.signals.finished.connect(self._on_password_changed)
+        worker.signals.failed.connect(self._on_password_change_failed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_password_changed(self, success, message):
+        """Show the result of the password change"""
+        self.change_btn.setEnabled(True)
+        if success:
+            QMessageBox.information(self, "Success", message)
+            self.close()
+        else:
+            QMessageBox.critical(self, "Error", message)
+            # Clear password fields if current password was wrong
+            if "incorrect" in message.lower():
+                self.current_password_entry.clear()
+                self.current_password_entry.setFocus()
+
+    def _on_password_change_failed(self, error):
+        """Report a database error from the password change"""
+        self.change_btn.setEnabled(True)
+        QMessageBox.critical(self, "Database Error",
+                           f"Failed to change password: {error}")
 
 
 def show_password_change_dialog(parent, current_user, username):
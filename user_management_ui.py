@@ -5,26 +5,193 @@ Allows managers to create, edit, and deactivate users
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
-    QPushButton, QFrame, QTreeWidget, QTreeWidgetItem, QComboBox,
+    QPushButton, QFrame, QTreeWidget, QTreeWidgetItem, QTreeView, QComboBox,
     QCheckBox, QTextEdit, QMessageBox, QWidget, QHeaderView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable,
+                          QThreadPool, QTimer, pyqtSignal)
 from PyQt5.QtGui import QFont
 from database_utils import db_pool, UserManager, AuditLogger
 
+# Fixed UPDATE texts for Edit User, with and without a password reset, so each
+# statement is always sent with the same text and parameter list
+_UPDATE_USER_SQL = """
+    UPDATE users
+    SET full_name = %s, email = %s, role = %s, is_active = %s, notes = %s,
+        updated_date = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+_UPDATE_USER_PASSWORD_SQL = """
+    UPDATE users
+    SET full_name = %s, email = %s, role = %s, is_active = %s, notes = %s,
+        password_hash = %s, updated_date = CURRENT_TIMESTAMP
+    WHERE id = %s
+"""
+
+# Arial fonts by (point size, bold), created on first use (QFont needs the
+# QApplication) and shared by every dialog opened afterwards
+_FONTS = {}
+
+
+def _font(point_size, bold=False):
+    """Return the shared Arial font of the given size"""
+    font = _FONTS.get((point_size, bold))
+    if font is None:
+        font = _FONTS[(point_size, bold)] = QFont('Arial', point_size,
+                                                  QFont.Bold if bold else QFont.Normal)
+    return font
+
+
+def _make_flat_list(tree):
+    """Set up a tree view as a flat list: uniform row heights, fixed column widths, no expand decoration"""
+    tree.setUniformRowHeights(True)
+    tree.setItemsExpandable(False)
+    tree.setRootIsDecorated(False)
+    tree.header().setSectionResizeMode(QHeaderView.Fixed)
+
+
+class _DbWorker(QRunnable):
+    """
+    Runs fn(cursor) inside db_pool.get_cursor() on a worker thread
+
+    If prepare is given it runs first, before a connection is taken from the
+    pool, and its result is passed on as fn(cursor, prepared). Slow CPU work
+    such as password hashing goes there so the connection is only held for SQL.
+    """
+
+    class Signals(QObject):
+        # Return value of fn
+        result = pyqtSignal(object)
+        # Error message
+        error = pyqtSignal(str)
+
+    def __init__(self, fn, prepare=None, **cursor_kwargs):
+        super().__init__()
+        self.fn = fn
+        self.prepare = prepare
+        # Passed to db_pool.get_cursor (commit, name, itersize, cursor_factory)
+        self.cursor_kwargs = cursor_kwargs
+        # Created here, on the GUI thread, so emits from run() are queued to it
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            args = () if self.prepare is None else (self.prepare(),)
+            with db_pool.get_cursor(**self.cursor_kwargs) as cursor:
+                result = self.fn(cursor, *args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.result.emit(result)
+
+
+class UserTableModel(QAbstractTableModel):
+    """Table model for the user list, filled by one model reset per load"""
+
+    HEADERS = ['ID', 'Username', 'Full Name', 'Role', 'Active', 'Last Login', 'Created']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # (id, username, full_name, role, active, last_login, created, email, notes)
+        # tuples; the first seven are the columns shown, all but the id as display
+        # text from the query, and email/notes fill the Edit User dialog
+        self._rows = []
+        # Column and order of the view's current sort (None = unsorted)
+        self._sort_column = None
+        self._sort_order = Qt.AscendingOrder
+
+    def set_rows(self, rows):
+        """Replace all rows, keeping the current sort"""
+        rows = list(rows)
+        if self._sort_column is not None:
+            self._sort_rows(rows)
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def user_at(self, row):
+        """Return the user tuple shown in the given row"""
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self._display(self._rows[index.row()], index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by the displayed text, like the QTreeWidget list did"""
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        # Keep the selection on the same users while rows move
+        persistent = self.persistentIndexList()
+        persistent_rows = [self._rows[index.row()] for index in persistent]
+        self._sort_rows(self._rows)
+        positions = {id(row): i for i, row in enumerate(self._rows)}
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(positions[id(row)], index.column())
+             for row, index in zip(persistent_rows, persistent)])
+        self.layoutChanged.emit()
+
+    def _sort_rows(self, rows):
+        column = self._sort_column
+        rows.sort(key=lambda row: self._display(row, column),
+                  reverse=self._sort_order == Qt.DescendingOrder)
+
+    @staticmethod
+    def _display(row, column):
+        # Text columns can be NULL (created, email, notes); show and sort them as ''
+        return str(row[0]) if column == 0 else row[column] or ''
+
 
 class UserManagementDialog:
     """Dialog for managing users (Manager access only)"""
 
+    # Rows per round trip when streaming the user list from its server-side cursor
+    USERS_FETCH_SIZE = 200
+
+    # How often the open Active User Sessions dialog re-queries the sessions (ms)
+    SESSIONS_REFRESH_MS = 5000
+
     def __init__(self, parent, current_user):
         self.parent = parent
         self.current_user = current_user
         self.dialog = None
         self.tree = None
+        self.model = None
+        self.loading_label = None
+        # Add/Edit User dialogs, built on first use, and their widgets by name
+        self._add_dialog = None
+        self._add_fields = None
+        self._edit_dialog = None
+        self._edit_fields = None
+        # (id, username) of the user the Edit dialog is showing
+        self._edit_target = None
+        # Active User Sessions dialog (built on first use), its list, refresh
+        # timer, list items by session id, and whether a refresh is running
+        self._sessions_dialog = None
+        self._sessions_tree = None
+        self._sessions_timer = None
+        self._session_items = {}
+        self._sessions_loading = False
 
     def show(self):
         """Show the user management dialog"""
         self.dialog = QDialog(self.parent)
+        # Cached Add/Edit/Sessions dialogs are children of the previous window
+        self._add_dialog = self._edit_dialog = self._sessions_dialog = None
         self.dialog.setWindowTitle("User Management")
         self.dialog.setMinimumSize(800, 600)
         self.dialog.setModal(True)
@@ -39,9 +206,7 @@ class UserManagementDialog:
         header_layout.setContentsMargins(0, 0, 0, 0)
 
         title_label = QLabel("User Management")
-        title_font = QFont('Arial', 14)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(_font(14, bold=True))
         header_layout.addWidget(title_label)
 
         header_layout.addStretch()
@@ -65,10 +230,16 @@ class UserManagementDialog:
 
         main_layout.addWidget(header_widget)
 
-        # User list (QTreeWidget with built-in scrollbars)
-        self.tree = QTreeWidget()
-        self.tree.setColumnCount(7)
-        self.tree.setHeaderLabels(['ID', 'Username', 'Full Name', 'Role', 'Active', 'Last Login', 'Created'])
+        # Shown while load_users waits for its query
+        self.loading_label = QLabel("Loading users...")
+        self.loading_label.hide()
+        main_layout.addWidget(self.loading_label)
+
+        # User list (QTreeView over UserTableModel - only visible rows are rendered)
+        self.model = UserTableModel(self.dialog)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        _make_flat_list(self.tree)
 
         # Column widths
         self.tree.setColumnWidth(0, 50)
@@ -96,35 +267,81 @@ class UserManagementDialog:
 
     def load_users(self):
         """Load all users from database"""
-        # Clear existing items
-        self.tree.clear()
-
-        try:
-            with db_pool.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, username, full_name, role, is_active,
-                           last_login, created_date
-                    FROM users
-                    ORDER BY created_date DESC
-                """)
-
-                for row in cursor.fetchall():
-                    item = QTreeWidgetItem([
-                        str(row['id']),
-                        row['username'],
-                        row['full_name'],
-                        row['role'],
-                        'Yes' if row['is_active'] else 'No',
-                        str(row['last_login']) if row['last_login'] else 'Never',
-                        str(row['created_date'])
-                    ])
-                    self.tree.addTopLevelItem(item)
-
-        except Exception as e:
-            QMessageBox.critical(self.dialog, "Error", f"Failed to load users: {e}")
+        def fetch_users(cursor):
+            # Display text is formatted by the server so rendering needs no conversions
+            cursor.execute("""
+                SELECT id, username, full_name, role,
+                       CASE WHEN is_active THEN 'Yes' ELSE 'No' END AS active,
+                       COALESCE(TO_CHAR(last_login, 'YYYY-MM-DD HH24:MI'), 'Never') AS last_login,
+                       TO_CHAR(created_date, 'YYYY-MM-DD HH24:MI') AS created,
+                       email, notes
+                FROM users
+                ORDER BY created_date DESC
+            """)
+            # Named cursor: rows arrive USERS_FETCH_SIZE at a time instead of
+            # the whole result in one transfer
+            return list(cursor)
+
+        def users_loaded(rows):
+            self.loading_label.hide()
+            # OPTIMIZED: one model reset instead of one tree item per user
+            self.model.set_rows(rows)
+
+        def load_failed(error):
+            self.loading_label.hide()
+            self.model.set_rows([])
+            QMessageBox.critical(self.dialog, "Error", f"Failed to load users: {error}")
+
+        self.loading_label.show()
+        self.run_in_background(fetch_users, users_loaded, load_failed, cursor_factory=None,
+                               name='users_stream', itersize=self.USERS_FETCH_SIZE)
+
+    def run_in_background(self, fn, on_result, on_error, prepare=None, **cursor_kwargs):
+        """
+        Run a database function off the GUI thread
+
+        Args:
+            fn: Called with a db_pool cursor on a worker thread
+            on_result: Called on the GUI thread with fn's return value
+            on_error: Called on the GUI thread with the error message
+            prepare: Optional function run on the worker before the cursor is
+                acquired; its result is passed to fn as a second argument
+            **cursor_kwargs: Passed to db_pool.get_cursor (e.g. name/itersize
+                for a server-side cursor)
+        """
+        worker = _DbWorker(fn, prepare, **cursor_kwargs)
+        worker.signals.result.connect(on_result)
+        worker.signals.error.connect(on_error)
+        QThreadPool.globalInstance().start(worker)
+
+    def selected_user(self):
+        """Return the selected user's row tuple, or None if no user is selected"""
+        rows = self.tree.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.user_at(rows[0].row())
 
     def add_user(self):
         """Show dialog to add a new user"""
+        # OPTIMIZED: the dialog is built on first use and cleared for each later one
+        if self._add_dialog is None:
+            self._add_dialog, self._add_fields = self._build_add_dialog()
+        else:
+            fields = self._add_fields
+            for name in ('username', 'fullname', 'email', 'password', 'confirm', 'notes'):
+                fields[name].clear()
+            fields['role'].setCurrentIndex(0)
+            fields['username'].setFocus()
+
+        self._add_dialog.exec_()
+
+    def _build_add_dialog(self):
+        """
+        Build the Add User dialog
+
+        Returns:
+            tuple: (dialog, dict of its input widgets and Save button by name)
+        """
         dialog = QDialog(self.dialog)
         dialog.setWindowTitle("Add User")
         dialog.setMinimumSize(400, 350)
@@ -187,59 +404,10 @@ class UserManagementDialog:
         main_layout.addLayout(form_layout)
         main_layout.addStretch()
 
-        def save_user():
-            username = username_entry.text().strip()
-            fullname = fullname_entry.text().strip()
-            email = email_entry.text().strip()
-            role = role_combo.currentText()
-            password = password_entry.text()
-            confirm = confirm_entry.text()
-            notes = notes_text.toPlainText().strip()
-
-            # Validation
-            if not username or not fullname or not password:
-                QMessageBox.critical(dialog, "Error", "Username, full name, and password are required")
-                return
-
-            if password != confirm:
-                QMessageBox.critical(dialog, "Error", "Passwords do not match")
-                return
-
-            if len(password) < 4:
-                QMessageBox.critical(dialog, "Error", "Password must be at least 4 characters")
-                return
-
-            try:
-                with db_pool.get_cursor() as cursor:
-                    # Check if username exists
-                    cursor.execute("SELECT id FROM users WHERE username = %s", (username,))
-                    if cursor.fetchone():
-                        QMessageBox.critical(dialog, "Error", "Username already exists")
-                        return
-
-                    # Create user
-                    password_hash = UserManager.hash_password(password)
-                    cursor.execute("""
-                        INSERT INTO users
-                        (username, password_hash, full_name, email, role, created_by, notes)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, (username, password_hash, fullname, email, role, self.current_user, notes))
-
-                    # Log the action
-                    AuditLogger.log(cursor, self.current_user, 'INSERT', 'users', username,
-                                notes=f"Created new {role} user: {fullname}")
-
-                QMessageBox.information(dialog, "Success", f"User '{username}' created successfully")
-                dialog.accept()
-                self.load_users()
-
-            except Exception as e:
-                QMessageBox.critical(dialog, "Error", f"Failed to create user: {e}")
-
         # Buttons
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save")
-        save_btn.clicked.connect(save_user)
+        save_btn.clicked.connect(self._save_new_user)
         button_layout.addWidget(save_btn)
 
         button_layout.addStretch()
@@ -250,36 +418,114 @@ class UserManagementDialog:
 
         main_layout.addLayout(button_layout)
 
-        dialog.exec_()
+        fields = {
+            'username': username_entry,
+            'fullname': fullname_entry,
+            'email': email_entry,
+            'role': role_combo,
+            'password': password_entry,
+            'confirm': confirm_entry,
+            'notes': notes_text,
+            'save': save_btn,
+        }
+        return dialog, fields
+
+    def _save_new_user(self):
+        """Validate the Add User form and create the user"""
+        dialog = self._add_dialog
+        fields = self._add_fields
+        save_btn = fields['save']
+
+        username = fields['username'].text().strip()
+        fullname = fields['fullname'].text().strip()
+        email = fields['email'].text().strip()
+        role = fields['role'].currentText()
+        password = fields['password'].text()
+        confirm = fields['confirm'].text()
+        notes = fields['notes'].toPlainText().strip()
+
+        # Validation
+        if not username or not fullname or not password:
+            QMessageBox.critical(dialog, "Error", "Username, full name, and password are required")
+            return
+
+        if password != confirm:
+            QMessageBox.critical(dialog, "Error", "Passwords do not match")
+            return
+
+        if len(password) < 4:
+            QMessageBox.critical(dialog, "Error", "Password must be at least 4 characters")
+            return
+
+        def create_user(cursor, password_hash):
+            # Create user - an existing username (UNIQUE) inserts nothing, so
+            # no separate existence check is needed
+            cursor.execute("""
+                INSERT INTO users
+                (username, password_hash, full_name, email, role, created_by, notes)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (username) DO NOTHING
+                RETURNING id
+            """, (username, password_hash, fullname, email, role, self.current_user, notes))
+            if cursor.fetchone() is None:
+                return False
+
+            # Log the action
+            AuditLogger.log(cursor, self.current_user, 'INSERT', 'users', username,
+                        notes=f"Created new {role} user: {fullname}")
+            return True
+
+        def user_created(created):
+            save_btn.setEnabled(True)
+            if not created:
+                QMessageBox.critical(dialog, "Error", "Username already exists")
+                return
+            QMessageBox.information(dialog, "Success", f"User '{username}' created successfully")
+            dialog.accept()
+            self.load_users()
+
+        def create_failed(error):
+            save_btn.setEnabled(True)
+            QMessageBox.critical(dialog, "Error", f"Failed to create user: {error}")
+
+        save_btn.setEnabled(False)
+        # OPTIMIZED: the password is hashed on the worker before it takes a connection
+        self.run_in_background(create_user, user_created, create_failed,
+                               prepare=lambda: UserManager.hash_password(password))
 
     def edit_user(self):
         """Edit selected user"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        selected = self.selected_user()
+        if not selected:
             QMessageBox.warning(self.dialog, "Warning", "Please select a user to edit")
             return
 
-        user_id = selected_items[0].text(0)
+        # OPTIMIZED: the list query already loaded everything the form shows
+        user_id, username, full_name, role, active, _, _, email, notes = selected
 
-        # Fetch user details
-        try:
-            with db_pool.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT username, full_name, email, role, is_active, notes
-                    FROM users
-                    WHERE id = %s
-                """, (user_id,))
-                user = cursor.fetchone()
-
-                if not user:
-                    QMessageBox.critical(self.dialog, "Error", "User not found")
-                    return
+        # OPTIMIZED: the dialog is built on first use and refilled for each later one
+        if self._edit_dialog is None:
+            self._edit_dialog, self._edit_fields = self._build_edit_dialog()
 
-        except Exception as e:
-            QMessageBox.critical(self.dialog, "Error", f"Failed to load user: {e}")
-            return
+        fields = self._edit_fields
+        self._edit_target = (user_id, username)
+        fields['username'].setText(username)
+        fields['fullname'].setText(full_name)
+        fields['email'].setText(email or '')
+        fields['role'].setCurrentText(role)
+        fields['active'].setChecked(active == 'Yes')
+        fields['password'].clear()
+        fields['notes'].setPlainText(notes or '')
+
+        self._edit_dialog.exec_()
 
-        # Edit dialog
+    def _build_edit_dialog(self):
+        """
+        Build the Edit User dialog
+
+        Returns:
+            tuple: (dialog, dict of its input widgets by name)
+        """
         dialog = QDialog(self.dialog)
         dialog.setWindowTitle("Edit User")
         dialog.setMinimumSize(400, 400)
@@ -295,21 +541,19 @@ class UserManagementDialog:
 
         # Username (read-only)
         form_layout.addWidget(QLabel("Username:"), 0, 0, Qt.AlignLeft)
-        username_label = QLabel(user['username'])
-        username_font = QFont('Arial', 10)
-        username_font.setBold(True)
-        username_label.setFont(username_font)
+        username_label = QLabel()
+        username_label.setFont(_font(10, bold=True))
         form_layout.addWidget(username_label, 0, 1, Qt.AlignLeft)
 
         # Full Name
         form_layout.addWidget(QLabel("Full Name:"), 1, 0, Qt.AlignLeft)
-        fullname_entry = QLineEdit(user['full_name'])
+        fullname_entry = QLineEdit()
         fullname_entry.setMinimumWidth(250)
         form_layout.addWidget(fullname_entry, 1, 1)
 
         # Email
         form_layout.addWidget(QLabel("Email:"), 2, 0, Qt.AlignLeft)
-        email_entry = QLineEdit(user['email'] or '')
+        email_entry = QLineEdit()
         email_entry.setMinimumWidth(250)
         form_layout.addWidget(email_entry, 2, 1)
 
@@ -317,14 +561,12 @@ class UserManagementDialog:
         form_layout.addWidget(QLabel("Role:"), 3, 0, Qt.AlignLeft)
         role_combo = QComboBox()
         role_combo.addItems(['Manager', 'Technician'])
-        role_combo.setCurrentText(user['role'])
         role_combo.setMinimumWidth(250)
         form_layout.addWidget(role_combo, 3, 1)
 
         # Active
         form_layout.addWidget(QLabel("Active:"), 4, 0, Qt.AlignLeft)
         active_checkbox = QCheckBox()
-        active_checkbox.setChecked(user['is_active'])
         form_layout.addWidget(active_checkbox, 4, 1, Qt.AlignLeft)
 
         # Reset Password
@@ -335,14 +577,12 @@ class UserManagementDialog:
         form_layout.addWidget(password_entry, 5, 1)
 
         hint_label = QLabel("(leave blank to keep current)")
-        hint_font = QFont('Arial', 8)
-        hint_label.setFont(hint_font)
+        hint_label.setFont(_font(8))
         form_layout.addWidget(hint_label, 6, 1, Qt.AlignLeft)
 
         # Notes
         form_layout.addWidget(QLabel("Notes:"), 7, 0, Qt.AlignTop | Qt.AlignLeft)
         notes_text = QTextEdit()
-        notes_text.setPlainText(user['notes'] or '')
         notes_text.setMinimumHeight(60)
         notes_text.setMaximumHeight(80)
         form_layout.addWidget(notes_text, 7, 1)
@@ -350,55 +590,10 @@ class UserManagementDialog:
         main_layout.addLayout(form_layout)
         main_layout.addStretch()
 
-        def save_changes():
-            try:
-                with db_pool.get_cursor() as cursor:
-                    # Update user
-                    updates = []
-                    params = []
-
-                    updates.append("full_name = %s")
-                    params.append(fullname_entry.text().strip())
-
-                    updates.append("email = %s")
-                    params.append(email_entry.text().strip())
-
-                    updates.append("role = %s")
-                    params.append(role_combo.currentText())
-
-                    updates.append("is_active = %s")
-                    params.append(active_checkbox.isChecked())
-
-                    updates.append("notes = %s")
-                    params.append(notes_text.toPlainText().strip())
-
-                    # Update password if provided
-                    new_password = password_entry.text()
-                    if new_password:
-                        updates.append("password_hash = %s")
-                        params.append(UserManager.hash_password(new_password))
-
-                    updates.append("updated_date = CURRENT_TIMESTAMP")
-                    params.append(user_id)
-
-                    query = f"UPDATE users SET {', '.join(updates)} WHERE id = %s"
-                    cursor.execute(query, params)
-
-                    # Log the action
-                    AuditLogger.log(cursor, self.current_user, 'UPDATE', 'users', str(user_id),
-                                notes=f"Updated user: {user['username']}")
-
-                QMessageBox.information(dialog, "Success", "User updated successfully")
-                dialog.accept()
-                self.load_users()
-
-            except Exception as e:
-                QMessageBox.critical(dialog, "Error", f"Failed to update user: {e}")
-
         # Buttons
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save")
-        save_btn.clicked.connect(save_changes)
+        save_btn.clicked.connect(self._save_user_changes)
         button_layout.addWidget(save_btn)
 
         button_layout.addStretch()
@@ -409,18 +604,74 @@ class UserManagementDialog:
 
         main_layout.addLayout(button_layout)
 
-        dialog.exec_()
+        fields = {
+            'save': save_btn,
+            'username': username_label,
+            'fullname': fullname_entry,
+            'email': email_entry,
+            'role': role_combo,
+            'active': active_checkbox,
+            'password': password_entry,
+            'notes': notes_text,
+        }
+        return dialog, fields
+
+    def _save_user_changes(self):
+        """Save the Edit User form for the user it was opened for"""
+        dialog = self._edit_dialog
+        fields = self._edit_fields
+        save_btn = fields['save']
+        user_id, username = self._edit_target
+
+        params = (
+            fields['fullname'].text().strip(),
+            fields['email'].text().strip(),
+            fields['role'].currentText(),
+            fields['active'].isChecked(),
+            fields['notes'].toPlainText().strip(),
+        )
+        new_password = fields['password'].text()
+
+        def hash_new_password():
+            return UserManager.hash_password(new_password) if new_password else None
+
+        def update_user(cursor, password_hash):
+            # Update user, and the password if one was entered
+            if password_hash:
+                cursor.execute(_UPDATE_USER_PASSWORD_SQL, params + (password_hash, user_id))
+            else:
+                cursor.execute(_UPDATE_USER_SQL, params + (user_id,))
+
+            # Log the action
+            AuditLogger.log(cursor, self.current_user, 'UPDATE', 'users', str(user_id),
+                        notes=f"Updated user: {username}")
+
+        def user_updated(_):
+            save_btn.setEnabled(True)
+            QMessageBox.information(dialog, "Success", "User updated successfully")
+            dialog.accept()
+            self.load_users()
+
+        def update_failed(error):
+            save_btn.setEnabled(True)
+            QMessageBox.critical(dialog, "Error", f"Failed to update user: {error}")
+
+        save_btn.setEnabled(False)
+        # OPTIMIZED: hashing and the UPDATE run on a worker; the hash is computed
+        # before a pooled connection is taken
+        self.run_in_background(update_user, user_updated, update_failed,
+                               prepare=hash_new_password)
 
     def delete_user(self):
         """Delete selected user"""
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        selected = self.selected_user()
+        if not selected:
             QMessageBox.warning(self.dialog, "Warning", "Please select a user to delete")
             return
 
-        user_id = selected_items[0].text(0)
-        username = selected_items[0].text(1)
-        role = selected_items[0].text(3)
+        user_id = selected[0]
+        username = selected[1]
+        role = selected[3]
 
         # Confirm deletion
         msg = QMessageBox(self.dialog)
@@ -448,31 +699,61 @@ class UserManagementDialog:
             QMessageBox.critical(self.dialog, "Error", "You cannot delete your own account")
             return
 
-        try:
-            with db_pool.get_cursor() as cursor:
-                # Log the deletion before deleting the user
-                AuditLogger.log(cursor, self.current_user, 'DELETE', 'users', str(user_id),
-                            notes=f"Deleted user: {username} ({role})")
-
-                # Delete all sessions for this user first (to avoid foreign key constraint)
-                cursor.execute("DELETE FROM user_sessions WHERE user_id = %s", (user_id,))
-
-                # Now delete the user
-                cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
-
-                # Check if deletion was successful
-                if cursor.rowcount == 0:
-                    QMessageBox.critical(self.dialog, "Error", "User not found or already deleted")
-                    return
+        def remove_user(cursor):
+            # OPTIMIZED: sessions and user in one statement. The user_sessions
+            # foreign key is checked at the end of the statement, after both deletes
+            cursor.execute("""
+                WITH del_sessions AS (
+                    DELETE FROM user_sessions WHERE user_id = %(user_id)s RETURNING id
+                ),
+                del_user AS (
+                    DELETE FROM users WHERE id = %(user_id)s RETURNING id
+                )
+                SELECT (SELECT id FROM del_user) AS user_id,
+                       ARRAY(SELECT id FROM del_sessions) AS session_ids
+            """, {'user_id': user_id})
+            deleted = cursor.fetchone()
+            if deleted['user_id'] is None:
+                return 0
+
+            # Audit the user and each ended session with one multi-row INSERT
+            entries = [(self.current_user, 'DELETE', 'users', str(deleted['user_id']),
+                        None, None, f"Deleted user: {username} ({role})")]
+            entries.extend(
+                (self.current_user, 'DELETE', 'user_sessions', str(session_id),
+                 None, None, f"Ended session of deleted user: {username}")
+                for session_id in deleted['session_ids']
+            )
+            AuditLogger.log_many(cursor, entries)
+            return 1
+
+        def user_removed(deleted):
+            # Check if deletion was successful
+            if deleted == 0:
+                QMessageBox.critical(self.dialog, "Error", "User not found or already deleted")
+                return
 
             QMessageBox.information(self.dialog, "Success", f"User '{username}' has been deleted successfully")
             self.load_users()
 
-        except Exception as e:
-            QMessageBox.critical(self.dialog, "Error", f"Failed to delete user: {e}")
+        def remove_failed(error):
+            QMessageBox.critical(self.dialog, "Error", f"Failed to delete user: {error}")
+
+        self.run_in_background(remove_user, user_removed, remove_failed)
 
     def view_sessions(self):
-        """View active user sessions"""
+        """View active user sessions, refreshed while the dialog is open"""
+        # OPTIMIZED: the dialog is built once and kept; reopening it only refreshes
+        # the rows that changed
+        if self._sessions_dialog is None:
+            self._build_sessions_dialog()
+
+        self._refresh_sessions()
+        self._sessions_timer.start(self.SESSIONS_REFRESH_MS)
+        self._sessions_dialog.exec_()
+
+    def _build_sessions_dialog(self):
+        """Build the Active User Sessions dialog and its refresh timer"""
         dialog = QDialog(self.dialog)
         dialog.setWindowTitle("Active User Sessions")
         dialog.setMinimumSize(800, 400)
@@ -484,9 +765,7 @@ class UserManagementDialog:
 
         # Header
         title_label = QLabel("Active User Sessions")
-        title_font = QFont('Arial', 12)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(_font(12, bold=True))
         main_layout.addWidget(title_label)
 
         # Session list
@@ -495,36 +774,79 @@ class UserManagementDialog:
         tree.setHeaderLabels(['Session ID', 'User', 'Full Name', 'Role', 'Login Time', 'Last Activity'])
 
         # Set all columns to same width
+        _make_flat_list(tree)
         for i in range(6):
             tree.setColumnWidth(i, 130)
 
-        # Enable sorting
         tree.setSortingEnabled(True)
-
         main_layout.addWidget(tree)
 
-        # Load sessions
-        try:
-            with db_pool.get_cursor() as cursor:
-                sessions = UserManager.get_active_sessions(cursor)
-
-                for session in sessions:
-                    item = QTreeWidgetItem([
-                        str(session['id']),
-                        session['username'],
-                        session['full_name'],
-                        session['role'],
-                        str(session['login_time']),
-                        str(session['last_activity'])
-                    ])
-                    tree.addTopLevelItem(item)
-
-        except Exception as e:
-            QMessageBox.critical(dialog, "Error", f"Failed to load sessions: {e}")
-
         # Close button
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(dialog.close)
         main_layout.addWidget(close_btn)
 
-        dialog.exec_()
+        # Refresh only while the dialog is showing
+        timer = QTimer(dialog)
+        timer.timeout.connect(self._refresh_sessions)
+        dialog.finished.connect(timer.stop)
+
+        self._sessions_dialog = dialog
+        self._sessions_tree = tree
+        self._sessions_timer = timer
+        self._session_items = {}
+
+    def _refresh_sessions(self):
+        """Query the active sessions on a worker and apply them to the sessions list"""
+        if self._sessions_loading:
+            # The previous refresh has not come back yet
+            return
+        self._sessions_loading = True
+
+        def sessions_loaded(sessions):
+            self._sessions_loading = False
+            self._apply_sessions(sessions)
+
+        def load_failed(error):
+            self._sessions_loading = False
+            self._sessions_timer.stop()
+            QMessageBox.critical(self._sessions_dialog, "Error", f"Failed to load sessions: {error}")
+
+        self.run_in_background(UserManager.get_active_sessions, sessions_loaded, load_failed)
+
+    def _apply_sessions(self, sessions):
+        """Update the sessions list in place: add new sessions, drop ended ones, refresh activity"""
+        tree = self._sessions_tree
+        items = self._session_items
+        current = {session['id']: session for session in sessions}
+
+        sorting = tree.isSortingEnabled()
+        tree.setUpdatesEnabled(False)
+        tree.setSortingEnabled(False)
+        try:
+            for session_id in [session_id for session_id in items if session_id not in current]:
+                item = items.pop(session_id)
+                tree.takeTopLevelItem(tree.indexOfTopLevelItem(item))
+
+            new_items = []
+            for session_id, session in current.items():
+                item = items.get(session_id)
+                if item is None:
+                    item = items[session_id] = QTreeWidgetItem([
+                        session['id'],
+                        session['username'],
+                        session['full_name'],
+                        session['role'],
+                        session['login_time'],
+                        session['last_activity']
+                    ])
+                    new_items.append(item)
+                elif item.text(5) != session['last_activity']:
+                    item.setText(5, session['last_activity'])
+
+            # OPTIMIZED: new sessions go in with one call
+            tree.addTopLevelItems(new_items)
+        finally:
+            # Re-enabling sorting sorts the list once
+            tree.setSortingEnabled(sorting)
+            tree.setUpdatesEnabled(True)